@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from aiogram import Bot
+from dishka import AsyncContainer
+
+from core.database.uow import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatMeta:
+    title: str | None
+    invite_link: str | None
+    fetched_at: float
+
+
+class ChatMetaCache:
+    """Название и пригласительная ссылка целевых каналов в памяти.
+
+    Прогревается при старте, устаревает через ttl и обновляется по событиям
+    бота (my_chat_member, смена названия канала).
+    """
+
+    def __init__(self, container: AsyncContainer, bot: Bot, ttl: float = 3600.0):
+        self._container = container
+        self._bot = bot
+        self._ttl = ttl
+        self._meta: dict[int, ChatMeta] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    async def warm(self) -> None:
+        """Одна выборка каналов из базы и по одному get_chat на канал."""
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            channels = await uow.channels.get_many()
+
+        invite_links = {channel.id: channel.invite_link for channel in channels}
+        titles = await asyncio.gather(
+            *(self._fetch_title(channel_id) for channel_id in invite_links),
+            return_exceptions=True,
+        )
+
+        now = time.monotonic()
+        for (channel_id, invite_link), title in zip(invite_links.items(), titles):
+            if isinstance(title, BaseException):
+                logger.warning(f"Не удалось получить данные канала {channel_id}: {title}")
+                continue
+            self._meta[channel_id] = ChatMeta(title, invite_link, now)
+
+        logger.info(f"Кеш каналов прогрет: {len(self._meta)} из {len(invite_links)}")
+
+    async def get(self, channel_id: int) -> ChatMeta:
+        meta = self._meta.get(channel_id)
+        if meta is not None and meta.invite_link and not self._expired(meta):
+            return meta
+
+        async with self._locks.setdefault(channel_id, asyncio.Lock()):
+            # пока ждали замок, данные мог обновить параллельный отправитель
+            meta = self._meta.get(channel_id)
+            if meta is not None and meta.invite_link and not self._expired(meta):
+                return meta
+
+            if meta is None or self._expired(meta):
+                title, fetched_at = await self._fetch_title(channel_id), time.monotonic()
+            else:
+                title, fetched_at = meta.title, meta.fetched_at
+
+            invite_link = meta.invite_link if meta else None
+            if not invite_link:
+                invite_link = await self._load_invite_link(channel_id)
+
+            meta = ChatMeta(title, invite_link, fetched_at)
+            self._meta[channel_id] = meta
+            return meta
+
+    def update_title(self, channel_id: int, title: str | None) -> None:
+        meta = self._meta.get(channel_id)
+        if meta is not None:
+            meta.title = title
+
+    def invalidate(self, channel_id: int) -> None:
+        """Забывает канал полностью: ссылку тоже перечитаем из базы."""
+        self._meta.pop(channel_id, None)
+
+    def _expired(self, meta: ChatMeta) -> bool:
+        return time.monotonic() - meta.fetched_at > self._ttl
+
+    async def _fetch_title(self, channel_id: int) -> str | None:
+        chat = await self._bot.get_chat(channel_id)
+        return chat.title
+
+    async def _load_invite_link(self, channel_id: int) -> str:
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            channel = await uow.channels.get_one(channel_id)
+
+            if channel and channel.invite_link:
+                return channel.invite_link
+
+            invite_link = (
+                await self._bot.create_chat_invite_link(channel_id)
+            ).invite_link
+
+            await uow.channels.update(channel_id, invite_link=invite_link)
+            await uow.commit()
+
+            return invite_link
@@ -1,16 +1,19 @@
 import logging
 
-from aiogram import Bot, Dispatcher
+from aiogram import Bot, Dispatcher, F
 from aiogram.filters import CommandStart
-from aiogram.types import Message
+from aiogram.types import ChatMemberUpdated, Message
 from dishka import AsyncContainer
 
+from core.bot.chat_meta import ChatMetaCache
+
 
 logger = logging.getLogger(__name__)
 
 
 async def run_bot(container: AsyncContainer) -> None:
     bot = await container.get(Bot)
+    chat_meta = await container.get(ChatMetaCache)
     dp = Dispatcher()
 
     logger.info("Бот инициализирован, настраиваю обработчики...")
@@ -20,6 +23,20 @@ async def run_bot(container: AsyncContainer) -> None:
         logger.info(f"Получена команда /start от пользователя {message.from_user.id}")
         await message.answer("Статус - активен.")
 
+    @dp.my_chat_member()
+    async def my_chat_member_handler(event: ChatMemberUpdated) -> None:
+        # права бота в канале изменились — данные канала перечитаем при отправке
+        logger.info(
+            f"Статус бота в чате {event.chat.id} изменён: "
+            f"{event.old_chat_member.status} -> {event.new_chat_member.status}"
+        )
+        chat_meta.invalidate(event.chat.id)
+
+    @dp.channel_post(F.new_chat_title)
+    async def channel_title_handler(message: Message) -> None:
+        logger.info(f"Канал {message.chat.id} переименован: {message.new_chat_title}")
+        chat_meta.update_title(message.chat.id, message.new_chat_title)
+
     await bot.delete_webhook(drop_pending_updates=True)
 
     me = await bot.me()
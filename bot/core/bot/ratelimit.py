@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from core.config.settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# методы, которые публикуют сообщение в чат и попадают под лимит на чат
+SENDING_METHODS = frozenset({
+    "SendMessage",
+    "SendPhoto",
+    "SendVideo",
+    "SendAnimation",
+    "SendDocument",
+    "SendAudio",
+    "SendVoice",
+    "SendMediaGroup",
+    "CopyMessage",
+    "ForwardMessage",
+})
+
+
+class TokenBucket:
+    """Классический token bucket: rate токенов в секунду, не больше burst в запасе."""
+
+    def __init__(self, rate: float, burst: float):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # ожидающие обслуживаются по очереди, пока держат замок
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+@dataclass
+class _ChatSlot:
+    next_at: float = 0.0
+    paused_until: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class TelegramRateLimiter:
+    """Лимиты Bot API: общий на бота и минимальный интервал публикаций в один чат.
+
+    Flood wait (RetryAfter) ставит на паузу только свой чат; запросы без
+    chat_id ставят на паузу общий поток.
+    """
+
+    def __init__(self, global_rate: float = 25.0, chat_interval: float = 3.0):
+        self._global = TokenBucket(global_rate, burst=global_rate)
+        self._chat_interval = chat_interval
+        self._chats: dict[int | str, _ChatSlot] = {}
+        self._paused_until = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TelegramRateLimiter":
+        return cls(settings.TELEGRAM_GLOBAL_RATE, settings.TELEGRAM_CHAT_INTERVAL)
+
+    async def acquire(self, chat_id: int | str | None, sending: bool) -> None:
+        if chat_id is not None:
+            slot = self._chats.setdefault(chat_id, _ChatSlot())
+            async with slot.lock:
+                wait_until = max(slot.paused_until, slot.next_at if sending else 0.0)
+                await _sleep_until(wait_until)
+                if sending:
+                    slot.next_at = time.monotonic() + self._chat_interval
+
+        await _sleep_until(self._paused_until)
+        await self._global.acquire()
+
+    def pause(self, chat_id: int | str | None, seconds: float) -> None:
+        until = time.monotonic() + seconds
+        if chat_id is None:
+            self._paused_until = max(self._paused_until, until)
+            return
+
+        slot = self._chats.setdefault(chat_id, _ChatSlot())
+        slot.paused_until = max(slot.paused_until, until)
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """Пропускает каждый запрос бота через TelegramRateLimiter и переживает flood wait."""
+
+    def __init__(self, limiter: TelegramRateLimiter, retry_attempts: int = 3):
+        self._limiter = limiter
+        self._retry_attempts = retry_attempts
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        sending = type(method).__name__ in SENDING_METHODS
+
+        attempt = 0
+        while True:
+            await self._limiter.acquire(chat_id, sending)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                attempt += 1
+                self._limiter.pause(chat_id, e.retry_after)
+                if attempt > self._retry_attempts:
+                    raise
+                logger.warning(
+                    f"Flood wait {e.retry_after} сек для {chat_id or 'бота'} "
+                    f"({type(method).__name__}), попытка {attempt}/{self._retry_attempts}"
+                )
+
+
+async def _sleep_until(deadline: float) -> None:
+    delay = deadline - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)
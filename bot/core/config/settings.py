@@ -9,3 +9,33 @@ class Settings(BaseSettings):
 
     ENABLE_BOT: bool
     ENABLE_SCHEDULER: bool
+
+    # Запросы к API скраппера: доноров в одном батче, параллельных батчей, таймаут батча.
+    # Доноры неудавшегося батча запрашиваются по одному, каждый со своим таймаутом
+    SCRAPPER_API_BATCH_SIZE:    int = 50
+    SCRAPPER_API_CONCURRENCY:   int = 4
+    SCRAPPER_API_TIMEOUT:       float = 30.0  # in seconds
+    SCRAPPER_API_DONOR_TIMEOUT: float = 10.0  # in seconds
+
+    # Рассылка: одновременно обслуживаемых каналов и лимиты Bot API
+    DISTRIBUTION_CONCURRENCY: int = 20
+    TELEGRAM_GLOBAL_RATE:     float = 25.0  # запросов в секунду на бота
+    TELEGRAM_CHAT_INTERVAL:   float = 3.0  # in seconds, между публикациями в один чат
+    TELEGRAM_RETRY_ATTEMPTS:  int = 3
+
+    # Стоп-слова рекламы (см. AdClassifier), JSON-список; совпадают с началом слова
+    AD_KEYWORDS: list[str] = ["реклама", "erid", "промокод"]
+
+    # Почти-дубликаты: допустимое расстояние Хэмминга между SimHash
+    # (до 7 находится гарантированно) и сколько дней помнить опубликованное
+    DEDUP_MAX_DISTANCE: int = 6
+    DEDUP_WINDOW_DAYS:  int = 7
+
+    # Хранилище медиа, общее со скраппером; без него медиа грузятся по ссылке
+    MEDIA_STORE_PATH: str | None = None
+
+    # Сколько держать в памяти название и ссылку целевого канала
+    CHAT_META_TTL: float = 3600.0  # in seconds
+
+    # Число долгоживущих каналов публикации событий в RabbitMQ
+    RABBITMQ_CHANNEL_POOL_SIZE: int = 4
@@ -0,0 +1,72 @@
+import importlib
+import logging
+import pkgutil
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from . import versions
+
+
+logger = logging.getLogger(__name__)
+
+
+# ключ advisory-блокировки: пока одна реплика мигрирует, остальные ждут
+LOCK_KEY = 7_301_002
+
+
+@dataclass(frozen=True)
+class Revision:
+    revision: int
+    description: str
+    upgrade: list[str]
+
+
+def load_revisions() -> list[Revision]:
+    """Ревизии из пакета versions, по возрастанию номера."""
+    revisions = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        revisions.append(Revision(
+            revision=module.revision,
+            description=(module.__doc__ or module_info.name).strip().splitlines()[0],
+            upgrade=module.upgrade,
+        ))
+
+    revisions.sort(key=lambda r: r.revision)
+    numbers = [r.revision for r in revisions]
+    if numbers != list(range(1, len(numbers) + 1)):
+        raise RuntimeError(f"Номера ревизий должны идти подряд с 1, получено: {numbers}")
+
+    return revisions
+
+
+async def run_migrations(engine: AsyncEngine) -> None:
+    """Применяет недостающие ревизии схемы в одной транзакции."""
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOCK_KEY})
+        await conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "revision INTEGER PRIMARY KEY, "
+            "description VARCHAR NOT NULL, "
+            "applied_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'))"
+        ))
+
+        result = await conn.execute(text("SELECT revision FROM schema_version"))
+        applied = set(result.scalars().all())
+
+        pending = [r for r in load_revisions() if r.revision not in applied]
+        for revision in pending:
+            logger.info(f"Миграция {revision.revision:04d}: {revision.description}")
+            for statement in revision.upgrade:
+                await conn.execute(text(statement))
+            await conn.execute(
+                text("INSERT INTO schema_version (revision, description) VALUES (:revision, :description)"),
+                {"revision": revision.revision, "description": revision.description},
+            )
+
+    if pending:
+        logger.info(f"Схема базы данных обновлена до ревизии {pending[-1].revision}")
+    else:
+        logger.info("Схема базы данных актуальна")
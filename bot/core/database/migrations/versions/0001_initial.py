@@ -0,0 +1,24 @@
+"""Исходная схема: channel, donor.
+
+IF NOT EXISTS — чтобы принять базы, созданные ещё через create_all.
+"""
+
+revision = 1
+
+upgrade = [
+    """
+    CREATE TABLE IF NOT EXISTS channel (
+        id BIGINT NOT NULL,
+        invite_link VARCHAR,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS donor (
+        username VARCHAR NOT NULL,
+        channel_id BIGINT NOT NULL,
+        PRIMARY KEY (username, channel_id),
+        FOREIGN KEY (channel_id) REFERENCES channel (id) ON DELETE CASCADE
+    )
+    """,
+]
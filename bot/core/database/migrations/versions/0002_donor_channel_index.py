@@ -0,0 +1,11 @@
+"""Индекс доноров по целевому каналу.
+
+Первичный ключ (username, channel_id) не помогает выборке
+donors.get_many(channel_id=...), которая идёт на каждый прогон рассылки.
+"""
+
+revision = 2
+
+upgrade = [
+    "CREATE INDEX IF NOT EXISTS ix_donor_channel_id ON donor (channel_id)",
+]
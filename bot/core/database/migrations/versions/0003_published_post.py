@@ -0,0 +1,29 @@
+"""Опубликованные посты и LSH-полосы их SimHash для поиска почти-дубликатов.
+
+Первичный ключ (band, published_post_id) служит индексом поиска по полосам,
+published_at — для выборки окна и чистки старых записей.
+"""
+
+revision = 3
+
+upgrade = [
+    """
+    CREATE TABLE IF NOT EXISTS published_post (
+        id BIGSERIAL PRIMARY KEY,
+        channel_id BIGINT NOT NULL REFERENCES channel (id) ON DELETE CASCADE,
+        post_id INTEGER NOT NULL,
+        channel_username VARCHAR NOT NULL,
+        simhash BIGINT NOT NULL,
+        published_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_published_post_published_at ON published_post (published_at)",
+    """
+    CREATE TABLE IF NOT EXISTS published_post_band (
+        band INTEGER NOT NULL,
+        published_post_id BIGINT NOT NULL REFERENCES published_post (id) ON DELETE CASCADE,
+        PRIMARY KEY (band, published_post_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_published_post_band_post ON published_post_band (published_post_id)",
+]
@@ -0,0 +1,17 @@
+"""Кеш file_id Telegram для медиа по URL источника и хешу содержимого."""
+
+revision = 4
+
+upgrade = [
+    """
+    CREATE TABLE IF NOT EXISTS media_cache (
+        source_url VARCHAR NOT NULL,
+        content_hash VARCHAR,
+        media_type VARCHAR NOT NULL,
+        file_id VARCHAR NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+        PRIMARY KEY (source_url)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_media_cache_content_hash ON media_cache (content_hash)",
+]
@@ -1,2 +1,4 @@
 from .channel import Channel
 from .donor import Donor
+from .published_post import PublishedPost, PublishedPostBand
+from .media_cache import MediaCache
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class MediaCache(Base):
+    """file_id, который Telegram вернул после первой загрузки медиа по URL."""
+
+    __tablename__ = "media_cache"
+
+    source_url: Mapped[str] = mapped_column(String, primary_key=True)
+    # хеш содержимого из имени файла CDN: один файл лежит на разных static-хостах
+    content_hash: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
+    media_type: Mapped[str] = mapped_column(String)
+    file_id: Mapped[str] = mapped_column(String)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
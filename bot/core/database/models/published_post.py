@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from sqlalchemy import BigInteger, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PublishedPost(Base):
+    """Опубликованный пост и его SimHash — база для поиска почти-дубликатов."""
+
+    __tablename__ = "published_post"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    channel_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("channel.id", ondelete="CASCADE"),
+    )
+    post_id: Mapped[int] = mapped_column(Integer)
+    channel_username: Mapped[str] = mapped_column(String)
+    simhash: Mapped[int] = mapped_column(BigInteger)
+    published_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
+
+
+class PublishedPostBand(Base):
+    """LSH-полоса подписи: номер полосы и её биты, упакованные в одно число."""
+
+    __tablename__ = "published_post_band"
+
+    band: Mapped[int] = mapped_column(Integer, primary_key=True)
+    published_post_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("published_post.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
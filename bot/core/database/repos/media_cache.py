@@ -0,0 +1,44 @@
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.models import MediaCache
+
+
+class MediaCacheRepository:
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_file_id(self, source_url: str, content_hash: str | None, media_type: str) -> str | None:
+        """file_id по точному URL, а если его нет — по тому же содержимому с другого хоста."""
+        condition = MediaCache.source_url == source_url
+        if content_hash:
+            condition = or_(condition, MediaCache.content_hash == content_hash)
+
+        result = await self._session.execute(
+            select(MediaCache.file_id)
+            .filter(condition, MediaCache.media_type == media_type)
+            .order_by((MediaCache.source_url == source_url).desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def upsert(self, source_url: str, content_hash: str | None, media_type: str, file_id: str) -> None:
+        await self._session.execute(
+            insert(MediaCache)
+            .values(
+                source_url=source_url,
+                content_hash=content_hash,
+                media_type=media_type,
+                file_id=file_id,
+            )
+            .on_conflict_do_update(
+                index_elements=[MediaCache.source_url],
+                set_={"content_hash": content_hash, "media_type": media_type, "file_id": file_id},
+            )
+        )
+
+    async def delete_file_id(self, file_id: str) -> None:
+        await self._session.execute(
+            delete(MediaCache).filter(MediaCache.file_id == file_id)
+        )
@@ -0,0 +1,43 @@
+import datetime as dt
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.models import PublishedPost, PublishedPostBand
+
+
+class PublishedPostRepository:
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def add(self, bands: list[int], **kwargs) -> PublishedPost:
+        published = PublishedPost(**kwargs)
+        self._session.add(published)
+        await self._session.flush()
+
+        await self._session.execute(
+            insert(PublishedPostBand),
+            [{"band": band, "published_post_id": published.id} for band in bands],
+        )
+        return published
+
+    async def get_candidates(self, bands: list[int], since: dt.datetime) -> list[PublishedPost]:
+        """Опубликованные после since посты, у которых совпала хотя бы одна полоса."""
+        matched = (
+            select(PublishedPostBand.published_post_id)
+            .filter(PublishedPostBand.band.in_(bands))
+        )
+        result = await self._session.execute(
+            select(PublishedPost)
+            .filter(PublishedPost.id.in_(matched), PublishedPost.published_at >= since)
+        )
+        return list(result.scalars().all())
+
+    async def delete_older_than(self, moment: dt.datetime) -> int:
+        result = await self._session.execute(
+            delete(PublishedPost).filter(PublishedPost.published_at < moment)
+        )
+        return result.rowcount
+
+    async def delete(self, id: int) -> None:
+        await self._session.execute(delete(PublishedPost).filter(PublishedPost.id == id))
@@ -2,6 +2,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from .repos.channel import ChannelRepository
 from .repos.donor import DonorRepository
+from .repos.published_post import PublishedPostRepository
+from .repos.media_cache import MediaCacheRepository
 
 
 class UnitOfWork:
@@ -10,6 +12,8 @@ class UnitOfWork:
 
         self.channels = ChannelRepository(session)
         self.donors = DonorRepository(session)
+        self.published = PublishedPostRepository(session)
+        self.media_cache = MediaCacheRepository(session)
 
     async def commit(self) -> None:
         await self._session.commit()
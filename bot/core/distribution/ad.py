@@ -1,4 +1,7 @@
 import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Sequence
 
 
 URL_REGEX = re.compile(
@@ -12,14 +15,113 @@ URL_REGEX = re.compile(
 USERNAME_REGEX = re.compile(r'@\w{1,32}\b')
 HASHTAG_REGEX = re.compile(r'#\w{1,64}\b')
 
+# разделитель текстов в пачке: ни одно правило не может его пересечь,
+# а для \b он ведёт себя как граница строки
+_BATCH_SEPARATOR = "\n"
+
+
+@dataclass(frozen=True)
+class AdVerdict:
+    rule: str   # url, username, hashtag или keyword
+    match: str
+
+
+def _keywords_trie(keywords: Iterable[str]) -> dict:
+    trie: dict = {}
+    for word in keywords:
+        word = word.strip().lower()
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return trie
+
+
+def _trie_pattern(node: dict) -> str:
+    """Регулярка-дерево по общим префиксам (замена Aho-Corasick на re).
+
+    Альтернативы с общим началом сливаются, поэтому движок не перебирает
+    слова по одному, а идёт по дереву символ за символом.
+    """
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # слово может закончиться здесь, но длинная фраза жадно предпочтительнее
+        body = "(?:" + body + ")?"
+    return body
+
+
+class AdClassifier:
+    """Все правила рекламы в одной скомпилированной регулярке.
+
+    Текст просматривается один раз, а сработавшее правило берётся из имени
+    группы. Опережающая проверка первого символа отсекает позиции, с которых
+    не начинается ни одно правило (почти весь кириллический текст), до
+    разбора альтернатив. Пачка текстов склеивается и проходится одним поиском.
+
+    Стоп-слова (совпадают с началом слова без учёта регистра) задаются
+    настройкой AD_KEYWORDS; без них остаются правила ссылок, упоминаний
+    и хештегов.
+    """
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        trie = _keywords_trie(keywords)
+        first_chars = "".join(re.escape(char) for char in sorted(trie))
+
+        url_pattern = URL_REGEX.pattern.removeprefix(r"(?i)\b")
+        word_rules = [f"(?P<url>{url_pattern})"]
+        if trie:
+            word_rules.append(f"(?P<keyword>{_trie_pattern(trie)})")
+
+        self._pattern = re.compile(
+            rf"(?=[@#a-z0-9\-{first_chars}])"
+            rf"(?:(?P<username>{USERNAME_REGEX.pattern})"
+            rf"|(?P<hashtag>{HASHTAG_REGEX.pattern})"
+            rf"|\b(?:{'|'.join(word_rules)}))",
+            re.IGNORECASE,
+        )
+
+    def classify(self, text: str | None) -> AdVerdict | None:
+        if not text:
+            return None
+
+        found = self._pattern.search(text)
+        if found is None:
+            return None
+        return AdVerdict(found.lastgroup, found.group())
+
+    def classify_many(self, texts: Sequence[str | None]) -> list[AdVerdict | None]:
+        """Классифицирует пачку текстов за один проход по склеенной строке."""
+        verdicts: list[AdVerdict | None] = [None] * len(texts)
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text or "") + len(_BATCH_SEPARATOR)
+
+        joined = _BATCH_SEPARATOR.join(text or "" for text in texts)
+        search = self._pattern.search
+        pos = 0
+
+        while (found := search(joined, pos)) is not None:
+            index = bisect_right(starts, found.start()) - 1
+            verdicts[index] = AdVerdict(found.lastgroup, found.group())
+
+            # остаток текста уже не важен, переходим к следующему
+            if index + 1 == len(starts):
+                break
+            pos = starts[index + 1]
+
+        return verdicts
+
+
+_default_classifier = AdClassifier()
+
 
 def is_advertisement(text: str) -> bool:
-    if not text:
-        return False
-
-    conditions = [
-        URL_REGEX.search(text),
-        USERNAME_REGEX.search(text),
-        HASHTAG_REGEX.search(text)
-    ]
-    return any(conditions)
+    return _default_classifier.classify(text) is not None
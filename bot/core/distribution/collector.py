@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import aiohttp
@@ -9,22 +10,163 @@ from core.schemas.post import PostSchema
 logger = logging.getLogger(__name__)
 
 
-async def collect_posts_for_channel(
-    scrapper_api_url: str,
+POSTS_PER_DONOR = 20
+
+class PostCollector:
+    """Сбор постов доноров через API скраппера для всех целевых каналов.
+
+    Хранит ETag и посты последнего ответа по каждому донору, чтобы скраппер
+    отвечал not_modified без тела. Доноры, которых больше нет ни у одного
+    канала, при полном сборе удаляются из кеша.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        scrapper_api_url: str,
+        chunk_size: int = 50,
+        concurrency: int = 4,
+        timeout: float = 30.0,
+        donor_timeout: float = 10.0,
+    ):
+        self._session = session
+        self._scrapper_api_url = scrapper_api_url
+        self._chunk_size = chunk_size
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._donor_timeout = donor_timeout
+        self._etags: dict[str, tuple[str, list[PostSchema]]] = {}
+
+    async def collect(self, donors_by_channel: dict[int, list[str]]) -> dict[int, list[PostSchema]]:
+        """Посты для всех целевых каналов.
+
+        Уникальные доноры делятся на пачки по chunk_size, пачки запрашиваются
+        параллельно (не больше concurrency одновременно). Если пачка упала
+        или не уложилась в таймаут, её доноры запрашиваются по одному:
+        проблемный донор не лишает постов соседей по пачке.
+        """
+        result = await self._collect(donors_by_channel)
+
+        used = {username for donors in donors_by_channel.values() for username in donors}
+        for username in self._etags.keys() - used:
+            del self._etags[username]
+
+        return result
+
+    async def collect_for_channel(self, donor_usernames: list[str]) -> list[PostSchema]:
+        """Посты одного канала; кеш остальных доноров не трогается."""
+        result = await self._collect({0: donor_usernames})
+        return result[0]
+
+    async def _collect(self, donors_by_channel: dict[int, list[str]]) -> dict[int, list[PostSchema]]:
+        all_donors = list(dict.fromkeys(
+            username
+            for donor_usernames in donors_by_channel.values()
+            for username in donor_usernames
+        ))
+        chunks = [
+            all_donors[i:i + self._chunk_size]
+            for i in range(0, len(all_donors), self._chunk_size)
+        ]
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def fetch_donor(username: str) -> dict[str, list[PostSchema]]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self.fetch_latest_posts_batch([username]), self._donor_timeout
+                    )
+                except Exception as e:
+                    logger.error(f"Ошибка при получении постов от @{username}: {type(e).__name__}: {e}")
+                    return {}
+
+        async def fetch_chunk(chunk: list[str]) -> dict[str, list[PostSchema]]:
+            if len(chunk) == 1:
+                return await fetch_donor(chunk[0])
+
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self.fetch_latest_posts_batch(chunk), self._timeout)
+                except Exception as e:
+                    logger.warning(
+                        f"Ошибка при получении постов доноров {chunk[0]}…{chunk[-1]} "
+                        f"({len(chunk)} шт.): {type(e).__name__}: {e}; запрашиваю их по одному"
+                    )
+
+            # семафор уже отпущен — запросы по одному делят его с другими пачками
+            fetched: dict[str, list[PostSchema]] = {}
+            for posts in await asyncio.gather(*(fetch_donor(username) for username in chunk)):
+                fetched.update(posts)
+            return fetched
+
+        posts_by_donor: dict[str, list[PostSchema]] = {}
+        for fetched in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+            posts_by_donor.update(fetched)
+
+        return {
+            channel_id: _merge_donor_posts(posts_by_donor, donor_usernames)
+            for channel_id, donor_usernames in donors_by_channel.items()
+        }
+
+    async def fetch_latest_posts_batch(self, donor_channels: list[str]) -> dict[str, list[PostSchema]]:
+        if not donor_channels:
+            return {}
+
+        etags = {
+            username: self._etags[username][0]
+            for username in donor_channels
+            if username in self._etags
+        }
+
+        async with self._session.post(
+            f"{self._scrapper_api_url}/posts/batch",
+            json={
+                "channels": donor_channels,
+                "limit": POSTS_PER_DONOR,
+                "order": "desc",
+                "etags": etags,
+            },
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+        if not isinstance(data, dict):
+            raise ValueError("Expected a mapping of channel to posts from API")
+
+        posts_by_donor = {}
+        for username, entry in data.items():
+            cached = self._etags.get(username)
+            if entry.get("not_modified") and cached:
+                posts_by_donor[username] = cached[1]
+                continue
+
+            try:
+                posts = [PostSchema.model_validate(item) for item in entry.get("posts", [])]
+            except ValidationError as e:
+                logger.error(f"Некорректные данные постов от @{username}: {e}")
+                continue
+
+            posts_by_donor[username] = posts
+            if entry.get("etag"):
+                self._etags[username] = (entry["etag"], posts)
+            else:
+                self._etags.pop(username, None)
+
+        return posts_by_donor
+
+
+def _merge_donor_posts(
+    posts_by_donor: dict[str, list[PostSchema]],
     donor_usernames: list[str],
 ) -> list[PostSchema]:
     posts = []
 
     for username in donor_usernames:
-        try:
-            fetched = await fetch_latest_posts(scrapper_api_url, username)
-        except Exception as e:
-            logger.error(f"Ошибка при получении постов от @{username}: {e}")
-            continue
-
+        fetched = posts_by_donor.get(username)
         if fetched:
             logger.info(f"@{username}: получено {len(fetched)} постов")
-            posts.extend(fetched)
+            # один донор может быть у нескольких каналов, а рассылка правит текст постов
+            posts.extend(post.model_copy(deep=True) for post in fetched)
 
     posts = sorted(
         posts,
@@ -33,31 +175,3 @@ async def collect_posts_for_channel(
     )
 
     return posts
-
-
-async def fetch_latest_posts(
-    scrapper_api_url: str,
-    donor_channel: str,
-) -> list[PostSchema]:
-    async with aiohttp.ClientSession() as session:
-        response = await session.get(
-            f"{scrapper_api_url}/posts",
-            params={
-                "channel": donor_channel,
-                "limit": 20,
-                "order": "desc",
-            },
-            timeout=aiohttp.ClientTimeout(total=10)
-        )
-        response.raise_for_status()
-        data = await response.json()
-
-        if not isinstance(data, list):
-            raise ValueError("Expected a list of posts from API")
-
-        try:
-            posts = [PostSchema.model_validate(item) for item in data]
-            return posts
-
-        except ValidationError as e:
-            raise ValueError(f"Invalid post data structure: {e}") from e
@@ -9,6 +9,22 @@ URL_REGEX = re.compile(
     re.IGNORECASE
 )
 
+# ссылка, html-ссылка, упоминание или хештег одной регуляркой; опережающая
+# проверка первого символа пропускает кириллицу без разбора альтернатив
+SOURCE_LINK_REGEX = re.compile(
+    r'(?=[<@#a-z0-9\-])'
+    r'(?:<a\s[^>]*href\s*='
+    r'|@\w{1,32}\b'
+    r'|#\w{1,64}\b'
+    r'|\b' + URL_REGEX.pattern.removeprefix(r'(?i)\b') + r')',
+    re.IGNORECASE
+)
+
+TAG_REGEX = re.compile(r'<(/?)(b|i|u|s)\b[^>]*?>', re.IGNORECASE)
+
+# разрывы строк, которые splitlines понимает помимо \n
+LINE_BREAKS_REGEX = re.compile('[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
 POST_FOOTER = "\n\n<a href=\"{invite_link}\"><b>{channel_name} — новости</b></a>"
 
 
@@ -16,76 +32,72 @@ def have_source_link(text: str) -> bool:
     if not text:
         return False
 
-    if URL_REGEX.search(text):
-        return True
-
-    if re.search(r'<a\s[^>]*href\s*=', text, re.IGNORECASE):
-        return True
-
-    if re.search(r'@\w{1,32}\b', text):
-        return True
-
-    if re.search(r'#\w{1,64}\b', text):
-        return True
-
-    return False
+    return SOURCE_LINK_REGEX.search(text) is not None
 
 
 def delete_bottom_links(text: str) -> str:
     if not text:
         return ""
 
-    lines = text.splitlines()
-
-    i = len(lines) - 1
-    while i >= 0:
-        stripped = lines[i].strip()
-        if not stripped:
-            i -= 1
-        elif stripped and have_source_link(stripped):
+    if LINE_BREAKS_REGEX.search(text):
+        # редкий случай: \r\n и прочие разрывы, склеиваем строки через \n
+        lines = text.splitlines()
+        i = len(lines) - 1
+        while i >= 0 and (not lines[i].strip() or SOURCE_LINK_REGEX.search(lines[i])):
             i -= 1
-        else:
-            break
-
-    clean_lines = lines[:i + 1]
-
-    result = '\n'.join(clean_lines).rstrip()
-    result = fix_unclosed_tags(result)
+        result = '\n'.join(lines[:i + 1]).rstrip()
+    else:
+        # один проход с конца по срезам исходной строки, без списка строк
+        end = len(text)
+        while end > 0:
+            start = text.rfind('\n', 0, end) + 1
+            line = text[start:end]
+            if line.strip() and not SOURCE_LINK_REGEX.search(line):
+                break
+            end = start - 1 if start else 0
+        result = text[:end].rstrip()
 
-    return result
+    return fix_unclosed_tags(result)
 
 
 def fix_unclosed_tags(text: str) -> str:
-    pattern = re.compile(r'<(/?)(b|i|u|s)\b[^>]*?>', re.IGNORECASE)
+    if '<' not in text:
+        return text
+
     stack = []
-    for m in pattern.finditer(text):
-        is_close = m.group(1) == '/'
-        tag = m.group(2).lower()
-        if not is_close:
+    for close, tag in TAG_REGEX.findall(text):
+        tag = tag.lower()
+        if not close:
             stack.append(tag)
         else:
-            for i in range(len(stack)-1, -1, -1):
+            for i in range(len(stack) - 1, -1, -1):
                 if stack[i] == tag:
-                    stack.pop(i)
+                    del stack[i]
                     break
 
-    for tag in reversed(stack):
-        text += f'</{tag}>'
-    return text
+    if not stack:
+        return text
+    return text + ''.join(f'</{tag}>' for tag in reversed(stack))
 
 
 def add_channel_footer(text: str, invite_link: str, channel_name: str) -> str:
-    if not text.rstrip():
+    text = text.rstrip()
+    if not text:
         return ""
 
-    return text.rstrip() + POST_FOOTER.format(
+    return text + POST_FOOTER.format(
         invite_link=invite_link,
         channel_name=channel_name
     )
 
 
 def prepare_text(text: str, invite_link: str, channel_name: str) -> str:
+    # delete_bottom_links уже отдаёт текст без хвостовых пробелов
     text = delete_bottom_links(text)
-    text = add_channel_footer(text, invite_link, channel_name)
+    if not text:
+        return ""
 
-    return text
+    return text + POST_FOOTER.format(
+        invite_link=invite_link,
+        channel_name=channel_name
+    )
@@ -0,0 +1,116 @@
+import asyncio
+import datetime as dt
+import logging
+
+from dishka import AsyncContainer
+
+from core.database.models import PublishedPost
+from core.database.uow import UnitOfWork
+from core.schemas.post import PostSchema
+
+
+logger = logging.getLogger(__name__)
+
+
+# 64-битная подпись режется на 8 полос по 8 бит: подписи на расстоянии
+# до 7 бит обязательно совпадают хотя бы в одной полосе
+BANDS = 8
+BAND_BITS = 64 // BANDS
+_BAND_MASK = (1 << BAND_BITS) - 1
+_MASK = (1 << 64) - 1
+
+
+def band_keys(simhash: int) -> list[int]:
+    """Номер полосы и её биты, упакованные в одно число для индекса."""
+    value = simhash & _MASK
+    return [
+        index << BAND_BITS | (value >> index * BAND_BITS) & _BAND_MASK
+        for index in range(BANDS)
+    ]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return ((a ^ b) & _MASK).bit_count()
+
+
+class DuplicateFilter:
+    """Поиск почти-дубликатов среди опубликованного за последние window_days.
+
+    SimHash считает скраппер при сохранении поста; здесь кандидаты
+    отбираются по совпадению LSH-полосы и проверяются расстоянием Хэмминга.
+    Подпись резервируется до отправки (claim), чтобы параллельные рассылки
+    в разные каналы не опубликовали две копии одного поста; при неудачной
+    отправке резерв снимается (release).
+    """
+
+    def __init__(self, container: AsyncContainer, max_distance: int = 6, window_days: int = 7):
+        self._container = container
+        self._max_distance = max_distance
+        self._window = dt.timedelta(days=window_days)
+        # рассылка идёт из одного процесса бота — замка в памяти достаточно
+        self._claim_lock = asyncio.Lock()
+
+    async def find_duplicate(self, post: PostSchema) -> PublishedPost | None:
+        if post.simhash is None:
+            return None
+
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            candidates = await uow.published.get_candidates(
+                band_keys(post.simhash), dt.datetime.utcnow() - self._window
+            )
+
+        return min(
+            (c for c in candidates if hamming_distance(c.simhash, post.simhash) <= self._max_distance),
+            key=lambda c: hamming_distance(c.simhash, post.simhash),
+            default=None,
+        )
+
+    async def claim(self, channel_id: int, post: PostSchema) -> tuple[PublishedPost | None, int | None]:
+        """Проверка и резерв подписи одним шагом.
+
+        Возвращает (дубликат, None), если пост уже опубликован, иначе
+        (None, id резерва); у постов без подписи резерва нет — (None, None).
+        """
+        if post.simhash is None:
+            return None, None
+
+        async with self._claim_lock:
+            duplicate = await self.find_duplicate(post)
+            if duplicate is not None:
+                return duplicate, None
+
+            async with self._container() as req:
+                uow = await req.get(UnitOfWork)
+                published = await uow.published.add(
+                    band_keys(post.simhash),
+                    channel_id=channel_id,
+                    post_id=post.id,
+                    channel_username=post.channel_username,
+                    simhash=post.simhash,
+                )
+                await uow.commit()
+
+        return None, published.id
+
+    async def release(self, claim_id: int | None) -> None:
+        """Снимает резерв неотправленного поста; ошибка только логируется."""
+        if claim_id is None:
+            return
+
+        try:
+            async with self._container() as req:
+                uow = await req.get(UnitOfWork)
+                await uow.published.delete(claim_id)
+                await uow.commit()
+        except Exception as e:
+            logger.warning(f"Не удалось снять резерв {claim_id} для поиска дубликатов: {e}")
+
+    async def prune(self) -> None:
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            deleted = await uow.published.delete_older_than(dt.datetime.utcnow() - self._window)
+            await uow.commit()
+
+        if deleted:
+            logger.info(f"Удалено устаревших записей об опубликованных постах: {deleted}")
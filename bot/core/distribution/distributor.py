@@ -11,8 +11,10 @@ from core.database.uow import UnitOfWork
 from core.messaging.rabbitmq import RabbitMQPublisher
 from core.distribution.content import delete_bottom_links
 
-from .collector import collect_posts_for_channel
-from .ad import is_advertisement
+from .collector import PostCollector
+from .ad import AdClassifier
+from .dedup import DuplicateFilter
+from .local_media import is_media_usable
 from .sender import send_post_to_channel
 
 
@@ -23,8 +25,12 @@ async def distribute_posts_globally(container: AsyncContainer) -> None:
     bot = await container.get(Bot)
     publisher = await container.get(RabbitMQPublisher)
     settings = await container.get(Settings)
+    collector = await container.get(PostCollector)
+    duplicates = await container.get(DuplicateFilter)
 
-    result = {}
+    await duplicates.prune()
+
+    donors_by_channel = {}
 
     async with container() as req:
         uow = await req.get(UnitOfWork)
@@ -32,26 +38,31 @@ async def distribute_posts_globally(container: AsyncContainer) -> None:
 
         for channel in channels:
             donors = await uow.donors.get_many(channel_id=channel.id)
-            donor_usernames = [d.username for d in donors]
-            result[channel.id] = await collect_posts_for_channel(
-                settings.SCRAPPER_API_URL, donor_usernames
-            )
-
-    total = len(result)
-    successful = 0
-    failed = 0
+            donors_by_channel[channel.id] = [d.username for d in donors]
 
-    for index, (channel_id, posts) in enumerate(result.items(), start=1):
-        logger.info(f"[{index}/{total}] Рассылка в канал {channel_id}...")
+    result = await collector.collect(donors_by_channel)
 
-        sent = await distribute_post_to_channel(
-            container, bot, publisher, channel_id, posts
-        )
-        if sent:
-            successful += 1
-            await asyncio.sleep(40)
-        else:
-            failed += 1
+    total = len(result)
+    # темп задаёт лимитер Bot API у бота, семафор лишь ограничивает число задач
+    semaphore = asyncio.Semaphore(settings.DISTRIBUTION_CONCURRENCY)
+
+    async def distribute(index: int, channel_id: int, posts: list[PostSchema]) -> bool | None:
+        async with semaphore:
+            logger.info(f"[{index}/{total}] Рассылка в канал {channel_id}...")
+            try:
+                return await distribute_post_to_channel(
+                    container, bot, publisher, channel_id, posts
+                )
+            except Exception as e:
+                logger.error(f"Ошибка рассылки в канал {channel_id}: {e}", exc_info=True)
+                return None
+
+    results = await asyncio.gather(*(
+        distribute(index, channel_id, posts)
+        for index, (channel_id, posts) in enumerate(result.items(), start=1)
+    ))
+    successful = sum(1 for sent in results if sent)
+    failed = total - successful
 
     logger.info(
         f"Рассылка завершена: {successful} успешно, {failed} с ошибкой "
@@ -66,76 +77,131 @@ async def distribute_post_to_channel(
     channel_id: int,
     posts: list[PostSchema],
 ) -> bool | None:
+    classifier = await container.get(AdClassifier)
+    duplicates = await container.get(DuplicateFilter)
     retry_on_error_counter = 0
+    # отметки копим и публикуем одной пачкой при выходе
+    marks: list[dict] = []
+
+    # медиа, которое скраппер не смог скачать или которое больше лимита, не отправится
+    usable = [post for post in posts if not post.medias or is_media_usable(post.medias[0])]
+    if len(usable) < len(posts):
+        logger.info(f"Для канала {channel_id} пропущено постов с недоступным медиа: {len(posts) - len(usable)}")
+    posts = usable
 
     for post in posts:
         post.text = delete_bottom_links(post.text)
+    verdicts = classifier.classify_many([post.text for post in posts])
 
-        if not post.text and not post.medias:
-            continue
-
-        if post.medias:
-            if post.text and len(post.text) > 1024:
+    try:
+        for post, verdict in zip(posts, verdicts):
+            if not post.text and not post.medias:
                 continue
 
-        if is_advertisement(post.text):
-            payload = {
-                "type": "mark_post",
-                "mark": "ad",
-                "post_id": post.id,
-                "channel_username": post.channel_username,
-            }
-            await publisher.publish_event(payload)
-
-            logger.info(
-                f"Пост {post.id} из канала @{post.channel_username} "
-                f"помечен как реклама и не будет отправлен в {channel_id}."
-            )
+            if post.medias:
+                if post.text and len(post.text) > 1024:
+                    continue
 
-            continue
+            if verdict is not None:
+                marks.append(_mark_payload(post, "ad"))
 
-        try:
-            await send_post_to_channel(container, bot, channel_id, post)
+                logger.info(
+                    f"Пост {post.id} из канала @{post.channel_username} "
+                    f"помечен как реклама ({verdict.rule}: {verdict.match!r}) "
+                    f"и не будет отправлен в {channel_id}."
+                )
 
-        except TelegramBadRequest as e:
-            logger.warning(
-                f"Ошибка TelegramBadRequest для канала {channel_id}: {e}. "
-                f"Пост: {post}"
-            )
+                continue
 
-        except TelegramForbiddenError as e:
-            logger.error(
-                f"Ошибка TelegramForbiddenError для канала {channel_id}: {e}. "
-                "У бота недостаточно прав для отправки сообщений в канал."
-            )
+            # подпись резервируется до отправки: параллельная рассылка
+            # в другой канал увидит её и пропустит копию
+            duplicate, claim = await duplicates.claim(channel_id, post)
+            if duplicate is not None:
+                marks.append(_mark_payload(post, "duplicate"))
+
+                logger.info(
+                    f"Пост {post.id} из канала @{post.channel_username} — почти-дубликат "
+                    f"@{duplicate.channel_username}/{duplicate.post_id}, "
+                    f"уже опубликованного в {duplicate.channel_id}; пропускаю."
+                )
 
-        except Exception as e:
-            logger.error(
-                f"Ошибка при отправке поста {post.id} (@{post.channel_username}) "
-                f"в канал {channel_id}: {e}",
-                exc_info=True,
-            )
-            retry_on_error_counter += 1
-            if retry_on_error_counter < 3:
                 continue
 
+            try:
+                await _send_claimed(container, bot, duplicates, claim, channel_id, post)
+
+            except TelegramBadRequest as e:
+                logger.warning(
+                    f"Ошибка TelegramBadRequest для канала {channel_id}: {e}. "
+                    f"Пост: {post}"
+                )
+
+            except TelegramForbiddenError as e:
+                logger.error(
+                    f"Ошибка TelegramForbiddenError для канала {channel_id}: {e}. "
+                    "У бота недостаточно прав для отправки сообщений в канал."
+                )
+
+            except Exception as e:
+                logger.error(
+                    f"Ошибка при отправке поста {post.id} (@{post.channel_username}) "
+                    f"в канал {channel_id}: {e}",
+                    exc_info=True,
+                )
+                retry_on_error_counter += 1
+                if retry_on_error_counter < 3:
+                    continue
+
+            else:
+                logger.info(
+                    f"Пост успешно отправлен в канал {channel_id}:\n"
+                    f"https://tgstat.ru/channel/@{post.channel_username}/{post.id}"
+                )
+
+                marks.append(_mark_payload(post, "used"))
+                return True
+
         else:
-            logger.info(
-                f"Пост успешно отправлен в канал {channel_id}:\n"
-                f"https://tgstat.ru/channel/@{post.channel_username}/{post.id}"
+            logger.error(
+                f"В канале {channel_id} не осталось ни одного подходящего поста для публикации. "
+                f"Возможные причины: весь контент — реклама или он уже был опубликован."
             )
+    finally:
+        await _publish_marks(publisher, channel_id, marks)
 
-            payload = {
-                "type": "mark_post",
-                "mark": "used",
-                "post_id": post.id,
-                "channel_username": post.channel_username,
-            }
-            await publisher.publish_event(payload)
-            return True
 
-    else:
+async def _send_claimed(
+    container: AsyncContainer,
+    bot: Bot,
+    duplicates: DuplicateFilter,
+    claim: int | None,
+    channel_id: int,
+    post: PostSchema,
+) -> None:
+    """Отправка поста; если она не удалась, резерв подписи снимается."""
+    try:
+        await send_post_to_channel(container, bot, channel_id, post)
+    except Exception:
+        await duplicates.release(claim)
+        raise
+
+
+async def _publish_marks(publisher: RabbitMQPublisher, channel_id: int, marks: list[dict]) -> None:
+    """Ошибка публикации отметок не должна подменять исключение рассылки."""
+    try:
+        await publisher.publish_many(marks)
+    except Exception as e:
         logger.error(
-            f"В канале {channel_id} не осталось ни одного подходящего поста для публикации. "
-            f"Возможные причины: весь контент — реклама или он уже был опубликован."
+            f"Не удалось опубликовать отметки постов для канала {channel_id} "
+            f"({len(marks)} шт.): {e}",
+            exc_info=True,
         )
+
+
+def _mark_payload(post: PostSchema, mark: str) -> dict:
+    return {
+        "type": "mark_post",
+        "mark": mark,
+        "post_id": post.id,
+        "channel_username": post.channel_username,
+    }
@@ -0,0 +1,28 @@
+import mimetypes
+from pathlib import Path
+
+from aiogram.types import FSInputFile
+
+from core.schemas.media import MediaSchema
+
+
+# такие медиа скраппер уже проверил: отправка заведомо не пройдёт
+UNUSABLE_STATUSES = frozenset({"too_large", "unavailable"})
+
+
+def is_media_usable(media: MediaSchema) -> bool:
+    return media.status not in UNUSABLE_STATUSES
+
+
+def local_media_file(store_path: str | None, media: MediaSchema) -> FSInputFile | None:
+    """Файл из общего со скраппером хранилища (<root>/<ab>/<sha256>), если он на месте."""
+    if not store_path or media.status != "ready" or not media.content_hash:
+        return None
+
+    path = Path(store_path) / media.content_hash[:2] / media.content_hash
+    if not path.is_file():
+        # файл уже вытеснен — отправим по ссылке
+        return None
+
+    extension = mimetypes.guess_extension(media.mime_type or "") or ""
+    return FSInputFile(path, filename=f"{media.content_hash[:16]}{extension}")
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import Message
+from dishka import AsyncContainer
+
+from core.database.uow import UnitOfWork
+from core.enums import MediaType
+from core.schemas.media import MediaSchema
+
+
+logger = logging.getLogger(__name__)
+
+
+# https://static53.tgcnt.ru/posts/_0/9c/9c4a80fcb93e8dc7aa9d2289df633e06.MOV
+CONTENT_HASH_REGEX = re.compile(r"/([0-9a-f]{32,64})\.\w+$", re.IGNORECASE)
+
+# ответы Bot API на устаревший, чужой или не того типа file_id
+FILE_ID_ERRORS = (
+    "wrong file identifier",
+    "wrong remote file identifier",
+    "wrong file_id",
+    "file_reference",
+    "type of file mismatch",
+    "can't use file of type",
+)
+
+
+def content_hash_from_url(url: str) -> str | None:
+    """Хеш содержимого из имени файла CDN, если он там есть."""
+    found = CONTENT_HASH_REGEX.search(url.split("?", 1)[0])
+    return found.group(1).lower() if found else None
+
+
+def is_file_id_error(error: TelegramBadRequest) -> bool:
+    """Telegram отверг сам file_id — медиа можно загрузить заново по ссылке."""
+    message = error.message.lower()
+    return any(text in message for text in FILE_ID_ERRORS)
+
+
+def sent_file_id(message: Message, media_type: str) -> str | None:
+    """file_id загруженного файла из ответа на send_photo / send_video."""
+    if media_type == MediaType.IMAGE:
+        return message.photo[-1].file_id if message.photo else None
+
+    # короткие ролики без звука Telegram может сохранить как анимацию
+    for attachment in (message.video, message.animation, message.document):
+        if attachment is not None:
+            return attachment.file_id
+    return None
+
+
+@dataclass
+class _KeyLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+class MediaFileCache:
+    """file_id медиа, уже загруженных в Telegram: в памяти и в таблице media_cache.
+
+    Первую отправку медиа делает один отправитель под замком, остальные
+    ждут его и берут готовый file_id вместо повторной загрузки по URL.
+    """
+
+    def __init__(self, container: AsyncContainer):
+        self._container = container
+        self._file_ids: dict[str, str] = {}
+        self._locks: dict[str, _KeyLock] = {}
+
+    @staticmethod
+    def _key(media: MediaSchema) -> str:
+        return f"{media.type}:{content_hash_from_url(media.url) or media.url}"
+
+    @asynccontextmanager
+    async def lock(self, media: MediaSchema) -> AsyncIterator[None]:
+        key = self._key(media)
+        if key in self._file_ids:
+            yield
+            return
+
+        key_lock = self._locks.setdefault(key, _KeyLock())
+        key_lock.users += 1
+        try:
+            async with key_lock.lock:
+                yield
+        finally:
+            # замок никому больше не нужен — удаляем, в том числе после ошибки
+            key_lock.users -= 1
+            if not key_lock.users:
+                self._locks.pop(key, None)
+
+    async def get(self, media: MediaSchema) -> str | None:
+        key = self._key(media)
+        file_id = self._file_ids.get(key)
+        if file_id is not None:
+            return file_id
+
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            file_id = await uow.media_cache.get_file_id(
+                media.url, content_hash_from_url(media.url), media.type
+            )
+
+        if file_id is not None:
+            self._file_ids[key] = file_id
+        return file_id
+
+    async def store(self, media: MediaSchema, file_id: str) -> None:
+        self._file_ids[self._key(media)] = file_id
+
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            await uow.media_cache.upsert(
+                media.url, content_hash_from_url(media.url), media.type, file_id
+            )
+            await uow.commit()
+
+    async def forget(self, media: MediaSchema, file_id: str) -> None:
+        """Telegram отверг file_id — забываем его, медиа загрузится по URL заново."""
+        self._file_ids.pop(self._key(media), None)
+
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            await uow.media_cache.delete_file_id(file_id)
+            await uow.commit()
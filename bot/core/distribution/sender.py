@@ -1,12 +1,17 @@
 import logging
 
 from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InputFile, Message
 from dishka import AsyncContainer
 
+from core.config.settings import Settings
 from core.enums import MediaType
 from core.schemas.post import PostSchema
-from core.database.uow import UnitOfWork
+from core.bot.chat_meta import ChatMetaCache
 from .content import prepare_text
+from .media_cache import MediaFileCache, is_file_id_error, sent_file_id
+from .local_media import local_media_file
 
 
 logger = logging.getLogger(__name__)
@@ -20,12 +25,10 @@ async def send_post_to_channel(
 ) -> None:
     logger.info(f"Отправляю сообщение в канал {channel_id} (@{post.channel_username})/{post.id}")
 
-    chat = await bot.get_chat(channel_id)
+    chat_meta = await container.get(ChatMetaCache)
+    meta = await chat_meta.get(channel_id)
 
-    channel_name = chat.title
-    invite_link = await get_channel_invite_link(container, channel_id, bot)
-
-    text = prepare_text(post.text, invite_link, channel_name)
+    text = prepare_text(post.text, meta.invite_link, meta.title)
 
     if not post.medias:
         await bot.send_message(
@@ -36,46 +39,60 @@ async def send_post_to_channel(
         return
 
     media = post.medias[0]
-    url = media.url
+    media_cache = await container.get(MediaFileCache)
+
+    async with media_cache.lock(media):
+        file_id = await media_cache.get(media)
+        if file_id is not None:
+            try:
+                await _send_media(bot, channel_id, media.type, file_id, text)
+                logger.info("Сообщение отправлено (file_id из кеша).")
+                return
+            except TelegramBadRequest as e:
+                # ошибка не про файл (например, в подписи) — повтор по ссылке не поможет
+                if not is_file_id_error(e):
+                    raise
+                logger.warning(f"file_id для {media.url} не принят ({e}), загружаю по ссылке")
+                await media_cache.forget(media, file_id)
+
+        # первая загрузка: из локального хранилища, если файл там, иначе по ссылке
+        settings = await container.get(Settings)
+        source = local_media_file(settings.MEDIA_STORE_PATH, media) or media.url
+        message = await _send_media(bot, channel_id, media.type, source, text)
+
+        file_id = sent_file_id(message, media.type)
+        if file_id is not None:
+            try:
+                await media_cache.store(media, file_id)
+            except Exception as e:
+                # пост уже отправлен, ошибка кеша не должна приводить к повтору
+                logger.warning(f"Не удалось сохранить file_id для {media.url}: {e}")
+
+    logger.info("Сообщение отправлено.")
 
-    match media.type:
+
+async def _send_media(
+    bot: Bot,
+    channel_id: int,
+    media_type: str,
+    source: str | InputFile,
+    caption: str,
+) -> Message:
+    """source — файл с диска, URL или file_id уже загруженного файла."""
+    match media_type:
         case MediaType.IMAGE:
-            await bot.send_photo(
+            return await bot.send_photo(
                 chat_id=channel_id,
-                photo=url,
-                caption=text,
+                photo=source,
+                caption=caption,
             )
 
         case MediaType.VIDEO:
-            await bot.send_video(
+            return await bot.send_video(
                 chat_id=channel_id,
-                video=url,
-                caption=text
+                video=source,
+                caption=caption
             )
         case _:
-            logger.error(f"Неизвестный тип медиа: {media.type} для канала {channel_id}")
-            raise ValueError(f"Unsupported media type: {media.type}")
-
-    logger.info("Сообщение отправлено.")
-
-
-async def get_channel_invite_link(
-    container: AsyncContainer,
-    channel_id: int,
-    bot: Bot,
-) -> str:
-    async with container() as req:
-        uow = await req.get(UnitOfWork)
-        channel = await uow.channels.get_one(channel_id)
-
-        if channel and channel.invite_link:
-            return channel.invite_link
-
-        invite_link = (
-            await bot.create_chat_invite_link(channel_id)
-        ).invite_link
-
-        await uow.channels.update(channel_id, invite_link=invite_link)
-        await uow.commit()
-
-        return invite_link
+            logger.error(f"Неизвестный тип медиа: {media_type} для канала {channel_id}")
+            raise ValueError(f"Unsupported media type: {media_type}")
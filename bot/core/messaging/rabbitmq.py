@@ -1,17 +1,33 @@
 import asyncio
 import json
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 import aio_pika
+from aio_pika.abc import AbstractChannel
 
 
 logger = logging.getLogger(__name__)
 
 
 class RabbitMQPublisher:
-    def __init__(self, url: str):
+    """Публикация событий через пул долгоживущих каналов с подтверждениями.
+
+    Каналы открываются с publisher confirms: publish возвращается, когда
+    брокер принял сообщение. Соединение robust — после обрыва aio-pika сам
+    переподключается и восстанавливает каналы, закрытые каналы в пуле
+    заменяются новыми.
+    """
+
+    def __init__(self, url: str, pool_size: int = 4):
         self._url = url
         self._connection = None
+        self._pool_size = pool_size
+        self._channels: asyncio.Queue[AbstractChannel] = asyncio.Queue()
+        # все открытые каналы, включая выданные из пула прямо сейчас
+        self._open_channels: set[AbstractChannel] = set()
+        self._opened = 0
 
     async def connect(self) -> None:
         for i in range(20):
@@ -25,18 +41,68 @@ class RabbitMQPublisher:
         raise RuntimeError("Не удалось подключиться к RabbitMQ")
 
     async def publish_event(self, payload: dict, routing_key: str = "events_queue") -> None:
+        await self.publish_many([payload], routing_key)
+
+    async def publish_many(self, payloads: list[dict], routing_key: str = "events_queue") -> None:
+        """Публикует события в одном канале, дожидаясь всех подтверждений разом."""
+        if not payloads:
+            return
+
+        async with self._channel() as channel:
+            await asyncio.gather(*(
+                channel.default_exchange.publish(_message(payload), routing_key=routing_key)
+                for payload in payloads
+            ))
+
+    @asynccontextmanager
+    async def _channel(self) -> AsyncIterator[AbstractChannel]:
         if not self._connection or self._connection.is_closed:
             raise RuntimeError("RabbitMQ connection is not initialized or closed")
 
-        channel = await self._connection.channel()
+        channel = await self._acquire()
         try:
-            await channel.default_exchange.publish(
-                aio_pika.Message(body=json.dumps(payload).encode()),
-                routing_key=routing_key,
-            )
+            yield channel
         finally:
-            await channel.close()
+            self._channels.put_nowait(channel)
+
+    async def _acquire(self) -> AbstractChannel:
+        while True:
+            if self._channels.empty() and self._opened < self._pool_size:
+                self._opened += 1
+                try:
+                    channel = await self._connection.channel(publisher_confirms=True)  # type: ignore[union-attr]
+                except Exception:
+                    self._opened -= 1
+                    raise
+                self._open_channels.add(channel)
+                return channel
+
+            channel = await self._channels.get()
+            if not channel.is_closed:
+                return channel
+
+            # канал закрыт брокером — освобождаем место под новый
+            self._open_channels.discard(channel)
+            self._opened -= 1
 
     async def close(self) -> None:
+        while not self._channels.empty():
+            self._channels.get_nowait()
+
+        # закрываем и каналы, которые сейчас заняты публикацией
+        channels, self._open_channels = self._open_channels, set()
+        for channel in channels:
+            if not channel.is_closed:
+                await channel.close()
+        self._opened = 0
+
         if self._connection and not self._connection.is_closed:
             await self._connection.close()
+
+
+def _message(payload: dict) -> aio_pika.Message:
+    return aio_pika.Message(
+        body=json.dumps(payload).encode(),
+        content_type="application/json",
+        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+    )
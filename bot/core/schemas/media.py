@@ -1,7 +1,12 @@
 from pydantic import BaseModel
-from typing import Literal
+from typing import Literal, Optional
 
 
 class MediaSchema(BaseModel):
     type: Literal["image", "video"]
     url: str
+    # локальная копия в хранилище медиа скраппера
+    status: Optional[Literal["ready", "too_large", "unavailable"]] = None
+    content_hash: Optional[str] = None
+    size: Optional[int] = None
+    mime_type: Optional[str] = None
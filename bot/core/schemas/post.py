@@ -9,7 +9,8 @@ from .media import MediaSchema
 class PostSchema(BaseModel):
     id: int
     channel_username: str
-    mark: Optional[Literal["used", "ad"]] = None
+    mark: Optional[Literal["used", "ad", "duplicate"]] = None
     text: Optional[str]
     created_at: dt.datetime
+    simhash: Optional[int] = None
     medias: List[MediaSchema] = []
@@ -8,9 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 
 from core.runner import AppRunner
 from core.config.settings import Settings
-from core.database.models.base import Base
-import core.database.models  # noqa: F401 — регистрация моделей в Base.metadata
+from core.database.migrations import run_migrations
 from core.distribution.scheduler import DistributionScheduler
+from core.bot.chat_meta import ChatMetaCache
 from core.bot.handlers import run_bot
 
 from main_factory import get_all_dishka_providers
@@ -25,25 +25,25 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def init_database(engine: AsyncEngine) -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Таблицы базы данных созданы")
-
-
 async def main():
     runner = AppRunner()
 
     dishka = make_async_container(*get_all_dishka_providers())
     settings = await dishka.get(Settings)
 
-    # Создаём таблицы при старте
+    # Применяем миграции схемы при старте
     engine = await dishka.get(AsyncEngine)
-    await init_database(engine)
+    await run_migrations(engine)
 
     coroutines: List[Coroutine] = []
 
     if settings.ENABLE_SCHEDULER:
+        chat_meta = await dishka.get(ChatMetaCache)
+        try:
+            await chat_meta.warm()
+        except Exception as e:
+            logger.warning(f"Кеш каналов не прогрет: {e}")
+
         scheduler = DistributionScheduler(dishka)
         scheduler.start()
 
@@ -1,5 +1,6 @@
 from typing import List, AsyncIterable
 
+import aiohttp
 from dishka import (
     Provider,
     Scope,
@@ -21,6 +22,12 @@ from aiogram.client.default import DefaultBotProperties
 from core.config.settings import Settings
 from core.database.uow import UnitOfWork
 from core.messaging.rabbitmq import RabbitMQPublisher
+from core.bot.ratelimit import RateLimitMiddleware, TelegramRateLimiter
+from core.bot.chat_meta import ChatMetaCache
+from core.distribution.ad import AdClassifier
+from core.distribution.collector import PostCollector
+from core.distribution.dedup import DuplicateFilter
+from core.distribution.media_cache import MediaFileCache
 
 
 class ConfigProvider(Provider):
@@ -76,10 +83,20 @@ class BotProvider(Provider):
 
     @provide
     def get_bot(self, settings: Settings) -> Bot:
-        return Bot(
+        bot = Bot(
             token=settings.BOT_TOKEN,
             default=DefaultBotProperties(parse_mode=ParseMode.HTML)
         )
+        # все запросы бота идут через общий лимитер Bot API
+        bot.session.middleware(RateLimitMiddleware(
+            TelegramRateLimiter.from_settings(settings),
+            settings.TELEGRAM_RETRY_ATTEMPTS,
+        ))
+        return bot
+
+    @provide
+    def get_chat_meta_cache(self, container: AsyncContainer, bot: Bot, settings: Settings) -> ChatMetaCache:
+        return ChatMetaCache(container, bot, settings.CHAT_META_TTL)
 
 
 class RabbitMQProvider(Provider):
@@ -87,12 +104,51 @@ class RabbitMQProvider(Provider):
 
     @provide
     async def get_publisher(self, settings: Settings) -> AsyncIterable[RabbitMQPublisher]:
-        publisher = RabbitMQPublisher(settings.RABBITMQ_URL)
+        publisher = RabbitMQPublisher(settings.RABBITMQ_URL, settings.RABBITMQ_CHANNEL_POOL_SIZE)
         await publisher.connect()
         yield publisher
         await publisher.close()
 
 
+class HttpClientProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    async def get_http_session(self, settings: Settings) -> AsyncIterable[aiohttp.ClientSession]:
+        """Общая сессия с keep-alive для запросов к API скраппера."""
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=settings.SCRAPPER_API_CONCURRENCY, keepalive_timeout=60),
+        ) as session:
+            yield session
+
+    @provide
+    def get_post_collector(self, session: aiohttp.ClientSession, settings: Settings) -> PostCollector:
+        return PostCollector(
+            session,
+            settings.SCRAPPER_API_URL,
+            chunk_size=settings.SCRAPPER_API_BATCH_SIZE,
+            concurrency=settings.SCRAPPER_API_CONCURRENCY,
+            timeout=settings.SCRAPPER_API_TIMEOUT,
+            donor_timeout=settings.SCRAPPER_API_DONOR_TIMEOUT,
+        )
+
+
+class DistributionProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_ad_classifier(self, settings: Settings) -> AdClassifier:
+        return AdClassifier(settings.AD_KEYWORDS)
+
+    @provide
+    def get_duplicate_filter(self, container: AsyncContainer, settings: Settings) -> DuplicateFilter:
+        return DuplicateFilter(container, settings.DEDUP_MAX_DISTANCE, settings.DEDUP_WINDOW_DAYS)
+
+    @provide
+    def get_media_file_cache(self, container: AsyncContainer) -> MediaFileCache:
+        return MediaFileCache(container)
+
+
 def get_all_dishka_providers() -> List[Provider]:
     return [
         ConfigProvider(),
@@ -101,4 +157,6 @@ def get_all_dishka_providers() -> List[Provider]:
         UOWProvider(),
         BotProvider(),
         RabbitMQProvider(),
+        HttpClientProvider(),
+        DistributionProvider(),
     ]
@@ -0,0 +1,141 @@
+"""
+Тесты классификатора рекламы и микробенчмарк на корпусе реальных постов.
+
+Использование:
+    # Тесты
+    python -m pytest -q test_ad.py
+
+    # Бенчмарк: старые три регулярки против AdClassifier
+    python test_ad.py --repeat 200
+"""
+
+import re
+import json
+import time
+import argparse
+from pathlib import Path
+
+import pytest
+
+from core.config.settings import Settings
+from core.distribution.ad import (
+    AdClassifier,
+    HASHTAG_REGEX,
+    URL_REGEX,
+    USERNAME_REGEX,
+)
+
+
+CORPUS_PATH = Path(__file__).parent / "test_ad_corpus.json"
+CORPUS: list[str] = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+
+# стоп-слова из настроек по умолчанию (AD_KEYWORDS)
+KEYWORDS: list[str] = Settings.model_fields["AD_KEYWORDS"].default
+
+
+def legacy_is_advertisement(text: str) -> bool:
+    """Прежняя реализация: три отдельных прохода по тексту."""
+    if not text:
+        return False
+
+    conditions = [
+        URL_REGEX.search(text),
+        USERNAME_REGEX.search(text),
+        HASHTAG_REGEX.search(text)
+    ]
+    return any(conditions)
+
+
+@pytest.fixture(scope="module")
+def legacy_rules() -> AdClassifier:
+    return AdClassifier()
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_matches_legacy_rules(legacy_rules: AdClassifier, text: str):
+    """Без стоп-слов решение совпадает со старыми тремя регулярками."""
+    assert (legacy_rules.classify(text) is not None) == legacy_is_advertisement(text)
+
+
+def test_classify_many_matches_classify():
+    """Пачка даёт те же вердикты, что и тексты по одному."""
+    classifier = AdClassifier(KEYWORDS)
+    texts = CORPUS + ["", None, "просто текст", "@", "#", "www."]
+
+    assert classifier.classify_many(texts) == [classifier.classify(t) for t in texts]
+
+
+@pytest.mark.parametrize(
+    ("text", "rule", "match"),
+    [
+        ("Подробнее на https://example.com/a?b=1 сегодня", "url", "https://example.com/a?b=1"),
+        ("Пишите @shop_style в личку", "username", "@shop_style"),
+        ("Концерт в 19:00 #ДеньГорода", "hashtag", "#ДеньГорода"),
+        ("РЕКЛАМА. Ставки на спорт", "keyword", "РЕКЛАМА"),
+        ("Скидка по промокоду ЗИМА", "keyword", "промокод"),
+        ("Первым сработало #тег, потом @user", "hashtag", "#тег"),
+    ],
+)
+def test_reports_fired_rule(text: str, rule: str, match: str):
+    verdict = AdClassifier(KEYWORDS).classify(text)
+
+    assert verdict is not None
+    assert (verdict.rule, verdict.match) == (rule, match)
+
+
+def test_keywords_match_word_start_only():
+    classifier = AdClassifier(keywords=["erid", "на правах рекламы", "на правах"])
+
+    assert classifier.classify("Материал на правах рекламы").match == "на правах рекламы"
+    assert classifier.classify("Опубликовано на правах автора").match == "на правах"
+    assert classifier.classify("Код: erid2VtzqvX").rule == "keyword"
+    assert classifier.classify("Маркировка ERID: 2VtzqvX").match == "ERID"
+    # та же последовательность внутри латинского слова — не стоп-слово
+    assert classifier.classify("Песня Kerida вышла в новом альбоме") is None
+    assert classifier.classify("Read the Sperid changelog") is None
+
+
+def test_empty_texts():
+    classifier = AdClassifier(KEYWORDS)
+
+    assert classifier.classify("") is None
+    assert classifier.classify_many([]) == []
+    assert classifier.classify_many([None, ""]) == [None, None]
+
+
+def benchmark(repeat: int) -> None:
+    texts = CORPUS * repeat
+    classifier = AdClassifier(KEYWORDS)
+    legacy_rules = AdClassifier()
+
+    # так выглядели бы стоп-слова отдельными проходами поверх старых регулярок
+    keyword_regexes = [re.compile(rf"\b{re.escape(word)}", re.IGNORECASE) for word in KEYWORDS]
+
+    def legacy_with_keywords() -> list[bool]:
+        return [
+            legacy_is_advertisement(t) or any(regex.search(t) for regex in keyword_regexes)
+            for t in texts
+        ]
+
+    def measure(name: str, func) -> float:
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        print(f"{name:<32} {elapsed * 1000:8.1f} мс  {len(texts) / elapsed:10.0f} постов/с")
+        return elapsed
+
+    print(f"Корпус: {len(CORPUS)} постов x {repeat} = {len(texts)}")
+    base = measure("3 регулярки по одному", lambda: [legacy_is_advertisement(t) for t in texts])
+    measure("AdClassifier.classify", lambda: [legacy_rules.classify(t) for t in texts])
+    batch = measure("AdClassifier.classify_many", lambda: legacy_rules.classify_many(texts))
+    base_keywords = measure("3 регулярки + стоп-слова", legacy_with_keywords)
+    batch_keywords = measure("classify_many + стоп-слова", lambda: classifier.classify_many(texts))
+    print(f"Ускорение без стоп-слов: x{base / batch:.1f}, со стоп-словами: x{base_keywords / batch_keywords:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк классификатора рекламы")
+    parser.add_argument("--repeat", type=int, default=200, help="Сколько раз повторить корпус")
+    args = parser.parse_args()
+
+    benchmark(args.repeat)
@@ -27,8 +27,7 @@ from aiogram.exceptions import (
 )
 
 from core.config.settings import Settings
-from core.database.models.base import Base
-import core.database.models  # noqa: F401
+from core.database.migrations import run_migrations
 from core.database.uow import UnitOfWork
 from main_factory import get_all_dishka_providers
 
@@ -102,8 +101,7 @@ async def check_all_channels() -> list[ChannelAccessResult]:
 
     try:
         engine = await dishka.get(AsyncEngine)
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        await run_migrations(engine)
 
         bot = await dishka.get(Bot)
         me = await bot.me()
@@ -0,0 +1,117 @@
+"""
+Тесты сбора постов доноров через API скраппера (POST /posts/batch).
+
+Запуск:
+    pytest test_collector.py -v
+"""
+
+import asyncio
+import datetime as dt
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.distribution.collector import PostCollector
+
+
+class FakeScrapperApi:
+    """POST /posts/batch: по одному посту на донора, ETag — имя донора.
+
+    Пачка с донором broken падает с 500, пачка с донором slow зависает.
+    """
+
+    def __init__(self):
+        self.requests: list[dict] = []
+
+    async def posts_batch(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append(body)
+        if "broken" in body["channels"]:
+            raise web.HTTPInternalServerError()
+        if "slow" in body["channels"]:
+            await asyncio.sleep(5)
+
+        response = {}
+        for username in body["channels"]:
+            etag = f'"{username}"'
+            if body["etags"].get(username) == etag:
+                response[username] = {"etag": etag, "not_modified": True, "posts": []}
+                continue
+            response[username] = {
+                "etag": etag,
+                "not_modified": False,
+                "posts": [{
+                    "id": 1,
+                    "channel_username": username,
+                    "text": f"пост {username}",
+                    "created_at": dt.datetime(2026, 1, 1).isoformat(),
+                    "medias": [],
+                }],
+            }
+        return web.json_response(response)
+
+
+@pytest.fixture
+async def api():
+    fake = FakeScrapperApi()
+    app = web.Application()
+    app.router.add_post("/posts/batch", fake.posts_batch)
+    server = TestServer(app)
+    await server.start_server()
+    fake.url = str(server.make_url("")).rstrip("/")
+    yield fake
+    await server.close()
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+async def test_not_modified_donors_reuse_cached_posts(api, session):
+    collector = PostCollector(session, api.url, chunk_size=2)
+    donors = {1: ["a", "b"], 2: ["b", "c"]}
+
+    first = await collector.collect(donors)
+    second = await collector.collect(donors)
+
+    assert [p.channel_username for p in second[2]] == [p.channel_username for p in first[2]]
+    assert sorted(u for r in api.requests[-2:] for u in r["etags"]) == ["a", "b", "c"]
+
+
+async def test_unused_donors_evicted(api, session):
+    collector = PostCollector(session, api.url)
+
+    await collector.collect({1: ["a", "b"], 2: ["c"]})
+    await collector.collect({1: ["a"]})
+    assert collector._etags.keys() == {"a"}
+
+    # сбор для одного канала (ручной запуск) чужие записи не трогает
+    await collector.collect({1: ["a"], 2: ["c"]})
+    await collector.collect_for_channel(["b"])
+    assert collector._etags.keys() == {"a", "b", "c"}
+
+
+async def test_collectors_do_not_share_state(api, session):
+    first = PostCollector(session, api.url)
+    await first.collect({1: ["a"]})
+
+    await PostCollector(session, api.url).collect({1: ["a"]})
+
+    assert api.requests[-1]["etags"] == {}
+
+
+@pytest.mark.parametrize("bad", ["broken", "slow"])
+async def test_bad_donor_does_not_drop_its_chunk(api, session, bad):
+    """Упавшая пачка перезапрашивается по донору: теряется только проблемный."""
+    collector = PostCollector(session, api.url, chunk_size=3, timeout=0.3, donor_timeout=0.3)
+
+    result = await collector.collect({1: ["a", bad, "c"], 2: ["d"]})
+
+    assert sorted(p.channel_username for p in result[1]) == ["a", "c"]
+    assert [p.channel_username for p in result[2]] == ["d"]
+    single = [r["channels"][0] for r in api.requests if len(r["channels"]) == 1]
+    assert sorted(single) == sorted(["a", bad, "c", "d"])
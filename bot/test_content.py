@@ -0,0 +1,210 @@
+"""
+Паритет очистки текста с прежней реализацией и бенчмарк.
+
+Использование:
+    # Тесты
+    python -m pytest -q test_content.py
+
+    # Бенчмарк: прежние функции против новых
+    python test_content.py --repeat 200
+"""
+
+import re
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+import pytest
+
+from core.distribution.content import (
+    URL_REGEX,
+    POST_FOOTER,
+    delete_bottom_links,
+    fix_unclosed_tags,
+    have_source_link,
+    prepare_text,
+)
+
+
+CORPUS_PATH = Path(__file__).parent / "test_ad_corpus.json"
+CORPUS: list[str] = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+
+
+# --- прежняя реализация, эталон для паритета ---
+
+def legacy_have_source_link(text: str) -> bool:
+    if not text:
+        return False
+
+    if URL_REGEX.search(text):
+        return True
+
+    if re.search(r'<a\s[^>]*href\s*=', text, re.IGNORECASE):
+        return True
+
+    if re.search(r'@\w{1,32}\b', text):
+        return True
+
+    if re.search(r'#\w{1,64}\b', text):
+        return True
+
+    return False
+
+
+def legacy_delete_bottom_links(text: str) -> str:
+    if not text:
+        return ""
+
+    lines = text.splitlines()
+
+    i = len(lines) - 1
+    while i >= 0:
+        stripped = lines[i].strip()
+        if not stripped:
+            i -= 1
+        elif stripped and legacy_have_source_link(stripped):
+            i -= 1
+        else:
+            break
+
+    clean_lines = lines[:i + 1]
+
+    result = '\n'.join(clean_lines).rstrip()
+    result = legacy_fix_unclosed_tags(result)
+
+    return result
+
+
+def legacy_fix_unclosed_tags(text: str) -> str:
+    pattern = re.compile(r'<(/?)(b|i|u|s)\b[^>]*?>', re.IGNORECASE)
+    stack = []
+    for m in pattern.finditer(text):
+        is_close = m.group(1) == '/'
+        tag = m.group(2).lower()
+        if not is_close:
+            stack.append(tag)
+        else:
+            for i in range(len(stack)-1, -1, -1):
+                if stack[i] == tag:
+                    stack.pop(i)
+                    break
+
+    for tag in reversed(stack):
+        text += f'</{tag}>'
+    return text
+
+
+def legacy_prepare_text(text: str, invite_link: str, channel_name: str) -> str:
+    text = legacy_delete_bottom_links(text)
+    if not text.rstrip():
+        return ""
+
+    return text.rstrip() + POST_FOOTER.format(
+        invite_link=invite_link,
+        channel_name=channel_name
+    )
+
+
+# --- входные данные ---
+
+EDGE_CASES = [
+    "",
+    "\n\n  \n",
+    "Текст без ссылок",
+    "Текст\n\nhttps://example.com",
+    "Текст\n@channel\n#тег\n\n",
+    "<b>Заголовок\n\nТекст <i>курсив\n<a href=\"https://t.me/x\">Подписаться</a>",
+    "<B>жирный</b> <U>подчёркнутый\n<a   HREF = 'x'>ссылка</A>",
+    "<b><i>вложенные</b></i> <s>зачёркнутый</s> <br> <bold>",
+    "</b>лишний закрывающий <i>",
+    "Строка\r\nещё строка\r\n@user\r\n",
+    "Строка вторая @user",
+    "Строка\x0cформа\x0b\x1c\x1d\x1e\x85конец",
+    "Строка\rтолько CR\r#тег",
+    "Неразрывный пробел\n  \n@user",
+    "Текст\n  www.site.ru/path  \n\t",
+    "Email: mail@example.com — это ссылка",
+    "Цена 1.5 млн руб.",
+    "Первая строка\n-дефис.ru\nвторая",
+    "@" * 40 + "\nтекст",
+    "#" + "а" * 70,
+    "текст\n" + "x" * 40,
+    "только ссылки\nhttps://a.ru\nhttps://b.ru",
+    "https://a.ru\n\n@b\n#c",
+]
+
+ALPHABET = [
+    "Новости", "города", " ", " ", "\n", "\n\n", "\r\n", " ", "<b>", "</b>",
+    "<i>", "</I>", "<u>", "</u>", "<s>", "<a href=\"https://t.me/x\">", "</a>",
+    "@user", "#тег", "site.ru", "https://ya.cc/t/abc?erid=1", "www.x.com",
+    "1.5", "—", "\t", " ", "<", ">", "Реклама", "e-mail@x.ru",
+]
+
+
+def random_texts(count: int, seed: int = 20260129) -> list[str]:
+    rnd = random.Random(seed)
+    return ["".join(rnd.choices(ALPHABET, k=rnd.randint(0, 30))) for _ in range(count)]
+
+
+TEXTS = CORPUS + EDGE_CASES + random_texts(2000)
+
+
+def test_delete_bottom_links_parity():
+    for text in TEXTS:
+        assert delete_bottom_links(text) == legacy_delete_bottom_links(text), repr(text)
+
+
+def test_prepare_text_parity():
+    for text in TEXTS:
+        expected = legacy_prepare_text(text, "https://t.me/+invite", "Канал")
+        assert prepare_text(text, "https://t.me/+invite", "Канал") == expected, repr(text)
+
+
+def test_have_source_link_parity():
+    for text in TEXTS:
+        for line in text.splitlines() or [text]:
+            assert have_source_link(line) == legacy_have_source_link(line), repr(line)
+
+
+def test_fix_unclosed_tags_parity():
+    for text in TEXTS:
+        assert fix_unclosed_tags(text) == legacy_fix_unclosed_tags(text), repr(text)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("<b>Заголовок\nТекст\n@channel", "<b>Заголовок\nТекст</b>"),
+        ("Текст\r\nещё\r\n#тег\r\n", "Текст\nещё"),
+        ("https://a.ru\n\n@b", ""),
+    ],
+)
+def test_delete_bottom_links_examples(text: str, expected: str):
+    assert delete_bottom_links(text) == expected
+
+
+def benchmark(repeat: int) -> None:
+    texts = (CORPUS + EDGE_CASES) * repeat
+
+    def measure(name: str, func) -> float:
+        started = time.perf_counter()
+        for text in texts:
+            func(text, "https://t.me/+invite", "Канал")
+        elapsed = time.perf_counter() - started
+        print(f"{name:<24} {elapsed * 1000:8.1f} мс  {len(texts) / elapsed:10.0f} постов/с")
+        return elapsed
+
+    print(f"Тексты: {len(CORPUS) + len(EDGE_CASES)} x {repeat} = {len(texts)}")
+    base = measure("прежний prepare_text", legacy_prepare_text)
+    new = measure("новый prepare_text", prepare_text)
+    print(f"Ускорение: x{base / new:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк очистки текста постов")
+    parser.add_argument("--repeat", type=int, default=200, help="Сколько раз повторить корпус")
+    args = parser.parse_args()
+
+    benchmark(args.repeat)
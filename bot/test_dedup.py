@@ -0,0 +1,146 @@
+"""
+Тесты поиска почти-дубликатов: LSH-полосы SimHash и резерв подписи.
+
+Запуск:
+    pytest test_dedup.py -v
+"""
+
+import asyncio
+import datetime as dt
+import random
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from core.distribution.dedup import BANDS, DuplicateFilter, band_keys, hamming_distance
+from core.schemas.post import PostSchema
+
+
+def to_signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def flip_bits(value: int, bits: list[int]) -> int:
+    for bit in bits:
+        value ^= 1 << bit
+    return to_signed(value & (1 << 64) - 1)
+
+
+def test_hamming_distance_signed_values():
+    assert hamming_distance(0, 0) == 0
+    assert hamming_distance(0, -1) == 64
+    assert hamming_distance(-1, to_signed(1 << 63 | 1)) == 62
+    assert hamming_distance(5, 6) == 2
+
+
+def test_band_keys_distinct_per_band():
+    """Одинаковые биты в разных полосах дают разные ключи."""
+    keys = band_keys(0)
+
+    assert len(keys) == BANDS
+    assert len(set(keys)) == BANDS
+    assert band_keys(-1) == band_keys((1 << 64) - 1)
+
+
+def test_band_keys_share_band_within_seven_bits():
+    """Подписи на расстоянии до 7 бит совпадают хотя бы в одной полосе."""
+    rng = random.Random(42)
+    for _ in range(2000):
+        base = to_signed(rng.getrandbits(64))
+        distance = rng.randint(0, BANDS - 1)
+        near = flip_bits(base, rng.sample(range(64), distance))
+
+        assert hamming_distance(base, near) == distance
+        assert set(band_keys(base)) & set(band_keys(near))
+
+
+def test_band_keys_can_miss_at_eight_bits():
+    """По одному биту в каждой полосе — общих полос нет, это граница гарантии."""
+    near = flip_bits(0, [band * 8 for band in range(BANDS)])
+
+    assert hamming_distance(0, near) == BANDS
+    assert not set(band_keys(0)) & set(band_keys(near))
+
+
+class FakePublishedRepository:
+    def __init__(self):
+        self.rows: dict[int, SimpleNamespace] = {}
+
+    async def get_candidates(self, bands: list[int], since: dt.datetime) -> list:
+        # уступаем цикл, как настоящий запрос к базе
+        await asyncio.sleep(0)
+        return [row for row in self.rows.values() if set(row.bands) & set(bands)]
+
+    async def add(self, bands: list[int], **kwargs):
+        await asyncio.sleep(0)
+        row = SimpleNamespace(id=len(self.rows) + 1, bands=bands, **kwargs)
+        self.rows[row.id] = row
+        return row
+
+    async def delete(self, id: int) -> None:
+        self.rows.pop(id, None)
+
+
+class FakeContainer:
+    def __init__(self):
+        self.published = FakePublishedRepository()
+
+    @asynccontextmanager
+    async def __call__(self):
+        async def commit():
+            pass
+
+        uow = SimpleNamespace(published=self.published, commit=commit)
+
+        async def get(_):
+            return uow
+
+        yield SimpleNamespace(get=get)
+
+
+def make_post(post_id: int, simhash: int | None) -> PostSchema:
+    return PostSchema(
+        id=post_id,
+        channel_username="donor",
+        text="текст",
+        created_at=dt.datetime(2026, 1, 1),
+        simhash=simhash,
+    )
+
+
+async def test_concurrent_claims_publish_one_copy():
+    """Параллельные рассылки одного поста в разные каналы: резерв получает одна."""
+    container = FakeContainer()
+    duplicates = DuplicateFilter(container, max_distance=6)
+    posts = [make_post(i, flip_bits(0x1234_5678_9ABC_DEF0, [i])) for i in range(5)]
+
+    results = await asyncio.gather(*(
+        duplicates.claim(channel_id, post)
+        for channel_id, post in enumerate(posts)
+    ))
+
+    claims = [claim for duplicate, claim in results if claim is not None]
+    assert len(claims) == 1
+    assert sum(duplicate is not None for duplicate, _ in results) == 4
+
+
+async def test_release_allows_next_claim():
+    container = FakeContainer()
+    duplicates = DuplicateFilter(container, max_distance=6)
+    post = make_post(1, 0x0F0F_0F0F_0F0F_0F0F)
+
+    _, claim = await duplicates.claim(1, post)
+    duplicate, _ = await duplicates.claim(2, post)
+    assert duplicate is not None
+
+    await duplicates.release(claim)
+    duplicate, claim = await duplicates.claim(2, post)
+    assert duplicate is None and claim is not None
+
+
+@pytest.mark.parametrize("channel_id", [1, 2])
+async def test_post_without_simhash_not_claimed(channel_id):
+    duplicates = DuplicateFilter(FakeContainer())
+
+    assert await duplicates.claim(channel_id, make_post(1, None)) == (None, None)
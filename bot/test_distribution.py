@@ -21,16 +21,14 @@ from dishka import make_async_container
 from sqlalchemy.ext.asyncio import AsyncEngine
 from aiogram import Bot
 
-from core.config.settings import Settings
-from core.database.models.base import Base
-import core.database.models  # noqa: F401
+from core.database.migrations import run_migrations
 from core.database.uow import UnitOfWork
 from core.messaging.rabbitmq import RabbitMQPublisher
 from core.distribution.distributor import (
     distribute_posts_globally,
     distribute_post_to_channel,
 )
-from core.distribution.collector import collect_posts_for_channel
+from core.distribution.collector import PostCollector
 
 from main_factory import get_all_dishka_providers
 
@@ -44,11 +42,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def init_database(engine: AsyncEngine) -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-
 async def run_global(container) -> None:
     """Запуск рассылки по всем каналам из БД (один раз)."""
     logger.info("Запускаю глобальную рассылку по всем каналам...")
@@ -60,7 +53,6 @@ async def run_for_channel(container, channel_id: int, loop: bool, interval: int)
     """Запуск рассылки в конкретный канал."""
     bot = await container.get(Bot)
     publisher = await container.get(RabbitMQPublisher)
-    settings = await container.get(Settings)
 
     me = await bot.get_me()
     logger.info(f"Бот: @{me.username}")
@@ -83,9 +75,8 @@ async def run_for_channel(container, channel_id: int, loop: bool, interval: int)
             "Собираю посты..."
         )
 
-        posts = await collect_posts_for_channel(
-            settings.SCRAPPER_API_URL, donor_usernames
-        )
+        collector = await container.get(PostCollector)
+        posts = await collector.collect_for_channel(donor_usernames)
         logger.info(f"Собрано {len(posts)} постов.")
 
         await distribute_post_to_channel(
@@ -126,7 +117,7 @@ async def main() -> None:
     dishka = make_async_container(*get_all_dishka_providers())
 
     engine = await dishka.get(AsyncEngine)
-    await init_database(engine)
+    await run_migrations(engine)
 
     try:
         if args.channel is None:
@@ -0,0 +1,81 @@
+"""
+Тесты кеша file_id: замок первой загрузки и разбор ошибок Telegram.
+
+Запуск:
+    pytest test_media_cache.py -v
+"""
+
+import asyncio
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+
+from core.distribution.media_cache import MediaFileCache, is_file_id_error
+from core.schemas.media import MediaSchema
+
+
+MEDIA = MediaSchema(
+    type="video",
+    url="https://static5.tgcnt.ru/posts/_0/9c/9c4a80fcb93e8dc7aa9d2289df633e06.mp4",
+)
+
+
+class InMemoryCache(MediaFileCache):
+    """Кеш без базы: file_id только в памяти."""
+
+    async def get(self, media):
+        return self._file_ids.get(self._key(media))
+
+    async def store(self, media, file_id):
+        self._file_ids[self._key(media)] = file_id
+
+
+async def test_concurrent_first_upload_happens_once():
+    cache = InMemoryCache(None)
+    uploads = 0
+
+    async def send():
+        nonlocal uploads
+        async with cache.lock(MEDIA):
+            if await cache.get(MEDIA) is None:
+                uploads += 1
+                await asyncio.sleep(0.01)
+                await cache.store(MEDIA, "FID")
+
+    await asyncio.gather(*(send() for _ in range(10)))
+
+    assert uploads == 1
+    assert cache._locks == {}
+
+
+async def test_lock_released_after_failed_upload():
+    """Неудачная загрузка не оставляет замок: следующая попытка берёт его заново."""
+    cache = InMemoryCache(None)
+
+    async def failing_send():
+        async with cache.lock(MEDIA):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upload failed")
+
+    results = await asyncio.gather(*(failing_send() for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache._locks == {}
+
+
+@pytest.mark.parametrize(
+    ("message", "expected"),
+    [
+        ("Bad Request: wrong file identifier/HTTP URL specified", True),
+        ("Bad Request: wrong remote file identifier specified: Wrong padding in the string", True),
+        ("Bad Request: wrong file_id or the file is temporarily unavailable", True),
+        ("Bad Request: FILE_REFERENCE_EXPIRED", True),
+        ("Bad Request: type of file mismatch", True),
+        ("Bad Request: can't use file of type Video as Photo", True),
+        ("Bad Request: message caption is too long", False),
+        ("Bad Request: can't parse entities: unsupported start tag \"file\"", False),
+        ("Bad Request: failed to get HTTP URL content", False),
+    ],
+)
+def test_is_file_id_error(message, expected):
+    assert is_file_id_error(TelegramBadRequest(method=None, message=message)) is expected
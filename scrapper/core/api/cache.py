@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from core.config.settings import Settings
+
+
+@dataclass(frozen=True)
+class CachedPosts:
+    """Готовый JSON-массив постов одного канала и заголовки ответа."""
+    body: bytes
+    etag: str | None
+    next_cursor: str | None
+    stored_at: float
+
+
+class ResponseCache:
+    """LRU-кеш ответов /posts, ключ — канал и все параметры запроса.
+
+    Канал сбрасывается целиком при сохранении новых постов и смене отметки.
+    TTL страхует от пропущенной инвалидации, если API и воркер запущены в
+    разных процессах. Поколение канала защищает от гонки: ответ, прочитанный
+    из базы до инвалидации, в кеш уже не попадёт.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[tuple, CachedPosts] = OrderedDict()
+        self._keys_by_channel: dict[str, set[tuple]] = {}
+        self._generations: dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResponseCache":
+        return cls(settings.API_CACHE_SIZE, settings.API_CACHE_TTL)
+
+    @staticmethod
+    def key(channel: str, *params) -> tuple:
+        return (channel, *params)
+
+    def generation(self, channel: str) -> int:
+        return self._generations.get(channel, 0)
+
+    def get(self, key: tuple) -> CachedPosts | None:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.stored_at > self._ttl:
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        key: tuple,
+        generation: int,
+        body: bytes,
+        etag: str | None = None,
+        next_cursor: str | None = None,
+    ) -> None:
+        """Сохраняет ответ, если канал не сбрасывался с момента generation."""
+        channel = key[0]
+        if self.generation(channel) != generation:
+            return
+
+        self._entries[key] = CachedPosts(body, etag, next_cursor, time.monotonic())
+        self._entries.move_to_end(key)
+        self._keys_by_channel.setdefault(channel, set()).add(key)
+
+        while len(self._entries) > self._max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, channel: str) -> None:
+        self._generations[channel] = self.generation(channel) + 1
+        for key in self._keys_by_channel.pop(channel, set()):
+            self._entries.pop(key, None)
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: tuple) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_channel.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_channel[key[0]]
@@ -1,11 +1,18 @@
-from typing import List, Literal, Optional
+import base64
+import hashlib
+from typing import AsyncIterator, Dict, List, Literal, Optional
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 
+from core.api.cache import CachedPosts, ResponseCache
+from core.database.repos.post import PostRepository
 from core.database.uow import UnitOfWork
-from core.schemas.post import PostSchema
+from core.schemas.post import ChannelPostsSchema, PostSchema, PostsBatchRequest
 
 router = APIRouter(route_class=DishkaRoute)
 
@@ -13,17 +20,228 @@ router = APIRouter(route_class=DishkaRoute)
 @router.get("/posts", tags=["posts"], response_model=List[PostSchema])
 async def get_posts(
     uow: FromDishka[UnitOfWork],
+    cache: FromDishka[ResponseCache],
     channel: str,
     limit: int = 100,
     order: Literal["asc", "desc"] = "desc",
-    marked: Optional[Literal["used", "ad"]] = None,
+    marked: Optional[Literal["used", "ad", "duplicate"]] = None,
     days_ago: Optional[int] = None,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
 ):
+    """Посты канала.
+
+    Следующая страница — с курсором из заголовка X-Next-Cursor. Если ETag
+    не изменился с прошлого запроса (If-None-Match), отдаём 304 без тела.
+    """
+    after = decode_cursor(cursor) if cursor else None
+
+    # окно days_ago сдвигается со временем, поэтому такие ответы
+    # не версионируем и не кешируем
+    cacheable = days_ago is None
+    key = cache.key(channel, limit, order, marked, cursor)
+    generation = cache.generation(channel)
+
+    etag = None
+    if cacheable:
+        cached = cache.get(key)
+        if cached is not None:
+            if cached.etag is not None and if_none_match == cached.etag:
+                return Response(status_code=304, headers={"ETag": cached.etag})
+            return _posts_response(cached)
+
+        version = await uow.channels.get_version(channel)
+        if version is not None:
+            etag = make_etag(version, limit, order, marked, cursor)
+            if if_none_match == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+
     posts = await uow.posts.get_many_with_params(
         channel_username=channel,
         limit=limit,
         order=order,
         marked=marked,
         created_after=datetime.utcnow() - timedelta(days=days_ago) if days_ago else None,
+        after=after,
     )
-    return posts
+
+    next_cursor = None
+    if limit and len(posts) == limit:
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+
+    body = _dump_posts(posts)
+    if cacheable:
+        cache.put(key, generation, body, etag, next_cursor)
+
+    return _posts_response(CachedPosts(body, etag, next_cursor, 0.0))
+
+
+@router.post("/posts/batch", tags=["posts"], response_model=Dict[str, ChannelPostsSchema])
+async def get_posts_batch(
+    uow: FromDishka[UnitOfWork],
+    cache: FromDishka[ResponseCache],
+    request: PostsBatchRequest,
+):
+    """Последние посты сразу нескольких каналов, сгруппированные по каналу.
+
+    ETag каждого канала совпадает с ETag первой страницы GET /posts с теми же
+    параметрами; каналы с неизменившимся ETag возвращаются без постов.
+    Готовые списки постов берутся из того же кеша, что и у GET /posts.
+    """
+    channels = list(dict.fromkeys(request.channels))
+    cacheable = request.days_ago is None
+
+    entries: dict[str, CachedPosts] = {}
+    generations: dict[str, int] = {}
+    if cacheable:
+        for username in channels:
+            cached = cache.get(cache.key(username, request.limit, request.order, request.marked, None))
+            if cached is not None:
+                entries[username] = cached
+            else:
+                generations[username] = cache.generation(username)
+
+    missing = [username for username in channels if username not in entries]
+
+    etags: dict[str, str] = {}
+    if cacheable and missing:
+        versions = await uow.channels.get_versions(missing)
+        for username, version in versions.items():
+            etags[username] = make_etag(version, request.limit, request.order, request.marked, None)
+
+    to_fetch = [
+        username for username in missing
+        if not (username in etags and request.etags.get(username) == etags[username])
+    ]
+    posts_by_channel = await uow.posts.get_latest_for_channels(
+        to_fetch,
+        limit=request.limit,
+        order=request.order,
+        marked=request.marked,
+        created_after=(
+            datetime.utcnow() - timedelta(days=request.days_ago) if request.days_ago else None
+        ),
+    )
+
+    for username, posts in posts_by_channel.items():
+        body = _dump_posts(posts)
+        etag = etags.get(username)
+        entries[username] = CachedPosts(body, etag, None, 0.0)
+        if cacheable:
+            key = cache.key(username, request.limit, request.order, request.marked, None)
+            cache.put(key, generations[username], body, etag, None)
+
+    parts = []
+    for username in channels:
+        entry = entries.get(username)
+        etag = entry.etag if entry else etags.get(username)
+        not_modified = etag is not None and request.etags.get(username) == etag
+        posts_body = b"[]" if not_modified or entry is None else entry.body
+        parts.append(
+            orjson.dumps(username)
+            + b':{"etag":' + orjson.dumps(etag)
+            + b',"not_modified":' + (b"true" if not_modified else b"false")
+            + b',"posts":' + posts_body + b"}"
+        )
+
+    return Response(content=b"{" + b",".join(parts) + b"}", media_type="application/json")
+
+
+@router.get("/posts/stream", tags=["posts"])
+async def stream_posts(
+    session_factory: FromDishka[async_sessionmaker[AsyncSession]],
+    channel: str,
+    limit: Optional[int] = None,
+    order: Literal["asc", "desc"] = "desc",
+    marked: Optional[Literal["used", "ad", "duplicate"]] = None,
+    days_ago: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    """Те же посты, что и GET /posts, но построчно в NDJSON (по посту на строку).
+
+    Строки читаются серверным курсором и сразу пишутся в ответ, поэтому
+    память не растёт с размером выборки; limit по умолчанию не ограничен.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    created_after = datetime.utcnow() - timedelta(days=days_ago) if days_ago else None
+
+    async def lines() -> AsyncIterator[bytes]:
+        # своя сессия: сессия запроса закрывается раньше, чем отдаётся тело ответа
+        async with session_factory() as session:
+            chunks = PostRepository(session).stream_rows(
+                channel_username=channel,
+                limit=limit,
+                order=order,
+                marked=marked,
+                created_after=created_after,
+                after=after,
+            )
+            async for rows in chunks:
+                yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/stats", tags=["service"])
+async def get_stats(cache: FromDishka[ResponseCache]):
+    return {"response_cache": cache.stats()}
+
+
+def _dump_posts(posts) -> bytes:
+    """JSON-массив постов сразу в байты, минуя валидацию PostSchema.
+
+    Формат обязан совпадать с PostSchema — это проверяет
+    tests/test_posts_serialization.py.
+    """
+    return orjson.dumps([
+        {
+            "id": post.id,
+            "channel_username": post.channel_username,
+            "mark": post.mark,
+            "text": post.text,
+            "created_at": post.created_at,
+            "simhash": post.simhash,
+            "medias": [_media_dict(media) for media in post.medias],
+        }
+        for post in posts
+    ])
+
+
+def _media_dict(media) -> dict:
+    return {
+        "type": media.type.value,
+        "url": media.url,
+        "status": media.status,
+        "content_hash": media.content_hash,
+        "size": media.size,
+        "mime_type": media.mime_type,
+    }
+
+
+def _posts_response(entry: CachedPosts) -> Response:
+    headers = {}
+    if entry.etag is not None:
+        headers["ETag"] = entry.etag
+    if entry.next_cursor is not None:
+        headers["X-Next-Cursor"] = entry.next_cursor
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def make_etag(version: tuple[int, int], *params) -> str:
+    last_post_id, mark_version = version
+    params_hash = hashlib.blake2s(repr(params).encode(), digest_size=6).hexdigest()
+    return f'W/"{last_post_id}.{mark_version}.{params_hash}"'
+
+
+def encode_cursor(created_at: datetime, post_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{post_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, post_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(post_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
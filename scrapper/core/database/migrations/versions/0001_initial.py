@@ -0,0 +1,46 @@
+"""Исходная схема: channel, post, media.
+
+IF NOT EXISTS — чтобы принять базы, созданные ещё через create_all.
+"""
+
+revision = 1
+
+upgrade = [
+    """
+    DO $$ BEGIN
+        CREATE TYPE mediatypeenum AS ENUM ('VIDEO', 'IMAGE');
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS channel (
+        username VARCHAR NOT NULL,
+        last_update_check TIMESTAMP WITHOUT TIME ZONE,
+        last_post_id INTEGER,
+        PRIMARY KEY (username)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS post (
+        id INTEGER NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        channel_username VARCHAR NOT NULL,
+        mark VARCHAR,
+        text VARCHAR,
+        PRIMARY KEY (id, channel_username),
+        FOREIGN KEY (channel_username) REFERENCES channel (username) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS media (
+        id SERIAL NOT NULL,
+        post_id INTEGER NOT NULL,
+        post_channel_username VARCHAR NOT NULL,
+        type mediatypeenum NOT NULL,
+        url VARCHAR NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (post_id, post_channel_username)
+            REFERENCES post (id, channel_username) ON DELETE CASCADE
+    )
+    """,
+]
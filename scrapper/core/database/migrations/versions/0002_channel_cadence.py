@@ -0,0 +1,9 @@
+"""Колонки адаптивной частоты проверок и версии отметок канала."""
+
+revision = 2
+
+upgrade = [
+    "ALTER TABLE channel ADD COLUMN IF NOT EXISTS next_check_at TIMESTAMP WITHOUT TIME ZONE",
+    "ALTER TABLE channel ADD COLUMN IF NOT EXISTS posts_per_day DOUBLE PRECISION",
+    "ALTER TABLE channel ADD COLUMN IF NOT EXISTS mark_version INTEGER NOT NULL DEFAULT 0",
+]
@@ -0,0 +1,22 @@
+"""Индексы под горячие запросы к post, media и channel.
+
+- /posts и /posts/batch: фильтр по channel_username и mark, сортировка
+  (created_at, id) — индекс заменяет прежний ix_post_channel_created_id;
+- get_last_post: последний id внутри канала;
+- selectinload(Post.medias): поиск медиа по внешнему ключу;
+- get_next_channel_to_check: сортировка по next_check_at, last_update_check.
+"""
+
+revision = 3
+
+upgrade = [
+    "DROP INDEX IF EXISTS ix_post_channel_created_id",
+    """
+    CREATE INDEX IF NOT EXISTS ix_post_channel_mark_created
+    ON post (channel_username, mark, created_at DESC, id DESC)
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_post_channel_id ON post (channel_username, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_media_post ON media (post_id, post_channel_username)",
+    "CREATE INDEX IF NOT EXISTS ix_channel_next_check ON channel (next_check_at NULLS FIRST, last_update_check NULLS FIRST)",
+    "CREATE INDEX IF NOT EXISTS ix_channel_last_update_check ON channel (last_update_check)",
+]
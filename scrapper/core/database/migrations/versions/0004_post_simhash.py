@@ -0,0 +1,11 @@
+"""SimHash текста поста: считается один раз при сохранении.
+
+Бот сравнивает подписи кандидатов с уже опубликованными и пропускает
+почти-дубликаты из разных доноров.
+"""
+
+revision = 4
+
+upgrade = [
+    "ALTER TABLE post ADD COLUMN IF NOT EXISTS simhash BIGINT",
+]
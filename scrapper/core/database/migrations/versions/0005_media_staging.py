@@ -0,0 +1,16 @@
+"""Локальная копия медиа: статус, хеш содержимого, размер и MIME-тип.
+
+Частичный индекс — очередь ещё не загруженных медиа для MediaStager.
+"""
+
+revision = 5
+
+upgrade = [
+    "ALTER TABLE media ADD COLUMN IF NOT EXISTS status VARCHAR",
+    "ALTER TABLE media ADD COLUMN IF NOT EXISTS content_hash VARCHAR",
+    "ALTER TABLE media ADD COLUMN IF NOT EXISTS size BIGINT",
+    "ALTER TABLE media ADD COLUMN IF NOT EXISTS mime_type VARCHAR",
+    "ALTER TABLE media ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE media ADD COLUMN IF NOT EXISTS staged_at TIMESTAMP WITHOUT TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_media_pending ON media (id DESC) WHERE status IS NULL",
+]
@@ -3,7 +3,7 @@ from typing import Optional, TYPE_CHECKING
 
 import datetime as dt
 
-from sqlalchemy import Integer, String, DateTime
+from sqlalchemy import Integer, String, DateTime, Float
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -19,6 +19,10 @@ class Channel(Base):
     username: Mapped[str] = mapped_column(String, primary_key=True)
     last_update_check: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=None)
     last_post_id: Mapped[Optional[int]] = mapped_column(Integer, default=None)
+    next_check_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=None)
+    posts_per_day: Mapped[Optional[float]] = mapped_column(Float, default=None)
+    # растёт при каждой смене отметки поста; вместе с last_post_id даёт ETag для /posts
+    mark_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     posts: Mapped[list["Post"]] = relationship(
         "Post",
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import Integer, String, Enum, ForeignKeyConstraint
+import datetime as dt
+
+from sqlalchemy import BigInteger, Integer, String, DateTime, Enum, ForeignKeyConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -21,6 +23,14 @@ class Media(Base):
     type: Mapped[MediaTypeEnum] = mapped_column(Enum(MediaTypeEnum))
     url: Mapped[str] = mapped_column(String)
 
+    # локальная копия: None — ещё не загружена, ready, too_large, unavailable
+    status: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    mime_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    staged_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
+
     post: Mapped["Post"] = relationship(back_populates="medias")
 
     __table_args__ = (
@@ -3,7 +3,7 @@ from typing import Optional, TYPE_CHECKING
 
 import datetime as dt
 
-from sqlalchemy import Integer, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -25,6 +25,8 @@ class Post(Base):
     )
     mark: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     text: Mapped[Optional[str]] = mapped_column(String, default=None)
+    # SimHash нормализованного текста для поиска почти-дубликатов
+    simhash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
 
     channel: Mapped["Channel"] = relationship(back_populates="posts")
     medias: Mapped[list["Media"]] = relationship(
@@ -1,4 +1,6 @@
-from sqlalchemy import select
+import datetime as dt
+
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.models import Channel, Post
@@ -21,14 +23,30 @@ class ChannelRepository:
         result = await self._session.execute(select(Channel))
         return list(result.scalars().all())
 
-    async def get_next_channel_to_check(self) -> Channel | None:
+    async def get_next_channel_to_check(self, now: dt.datetime) -> Channel | None:
+        """Следующий канал, срок проверки которого наступил. Строка блокируется
+        до конца транзакции, параллельные воркеры её пропускают; транзакцию
+        захвата нужно завершить сразу, отложив next_check_at (см. ScrapperWorker)."""
         result = await self._session.execute(
             select(Channel)
-            .order_by(Channel.last_update_check.asc().nulls_first())
+            .filter(or_(Channel.next_check_at.is_(None), Channel.next_check_at <= now))
+            .order_by(
+                Channel.next_check_at.asc().nulls_first(),
+                Channel.last_update_check.asc().nulls_first(),
+            )
             .limit(1)
+            .with_for_update(skip_locked=True)
         )
         return result.scalar_one_or_none()
 
+    async def count_posts_since(self, username: str, since: dt.datetime) -> int:
+        result = await self._session.execute(
+            select(func.count())
+            .select_from(Post)
+            .filter(Post.channel_username == username, Post.created_at >= since)
+        )
+        return result.scalar_one()
+
     async def get_last_post(self, username: str) -> Post | None:
         result = await self._session.execute(
             select(Post)
@@ -38,6 +56,37 @@ class ChannelRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_version(self, username: str) -> tuple[int, int] | None:
+        """(last_post_id, mark_version) канала — без загрузки постов."""
+        result = await self._session.execute(
+            select(Channel.last_post_id, Channel.mark_version)
+            .filter_by(username=username)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return row.last_post_id or 0, row.mark_version or 0
+
+    async def get_versions(self, usernames: list[str]) -> dict[str, tuple[int, int]]:
+        result = await self._session.execute(
+            select(Channel.username, Channel.last_post_id, Channel.mark_version)
+            .filter(Channel.username.in_(usernames))
+        )
+        return {
+            row.username: (row.last_post_id or 0, row.mark_version or 0)
+            for row in result
+        }
+
+    async def bump_mark_version(self, username: str) -> None:
+        await self.bump_mark_versions([username])
+
+    async def bump_mark_versions(self, usernames: list[str]) -> None:
+        await self._session.execute(
+            update(Channel)
+            .filter(Channel.username.in_(usernames))
+            .values(mark_version=func.coalesce(Channel.mark_version, 0) + 1)
+        )
+
     async def update(self, username: str, **kwargs) -> None:
         channel = await self._session.get(Channel, username)
         if channel:
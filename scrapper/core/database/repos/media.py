@@ -1,7 +1,9 @@
-from sqlalchemy import select
+import datetime as dt
+
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database.models import Media
+from core.database.models import Media, Post
 
 
 class MediaRepository:
@@ -14,6 +16,44 @@ class MediaRepository:
         await self._session.flush()
         return media
 
+    async def add_many(self, rows: list[dict]) -> None:
+        """Вставляет все медиа одним многострочным INSERT."""
+        if not rows:
+            return
+
+        await self._session.execute(insert(Media).values(rows))
+
+    async def get_pending(self, limit: int, max_attempts: int) -> list[Media]:
+        """Ещё не загруженные медиа, свежие первыми."""
+        result = await self._session.execute(
+            select(Media)
+            .filter(Media.status.is_(None), Media.attempts < max_attempts)
+            .order_by(Media.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_awaiting_hashes(self, created_after: dt.datetime) -> list[str]:
+        """Хеши загруженных файлов у постов, которые бот ещё не разобрал."""
+        result = await self._session.execute(
+            select(Media.content_hash)
+            .join(Media.post)
+            .filter(
+                Media.status == "ready",
+                Post.mark.is_(None),
+                Post.created_at >= created_after,
+            )
+            .distinct()
+        )
+        return list(result.scalars().all())
+
+    async def update_many(self, rows: list[dict]) -> None:
+        """UPDATE по первичному ключу пачкой; у всех строк одинаковый набор ключей."""
+        if not rows:
+            return
+
+        await self._session.execute(update(Media), rows)
+
     async def get_one(self, id: int) -> Media | None:
         return await self._session.get(Media, id)
 
@@ -1,10 +1,12 @@
 from datetime import datetime
+from typing import AsyncIterator
 
-from sqlalchemy import select
+from sqlalchemy import Integer, String, and_, column, func, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database.models import Post
+from core.database.models import Media, Post
 
 
 class PostRepository:
@@ -19,6 +21,22 @@ class PostRepository:
             await self._session.flush()
         return post
 
+    async def add_many(self, rows: list[dict]) -> set[tuple[int, str]]:
+        """Вставляет посты одним INSERT ... ON CONFLICT DO NOTHING.
+
+        Возвращает ключи (id, channel_username) реально вставленных постов.
+        """
+        if not rows:
+            return set()
+
+        result = await self._session.execute(
+            insert(Post)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Post.id, Post.channel_username])
+            .returning(Post.id, Post.channel_username)
+        )
+        return {(row.id, row.channel_username) for row in result}
+
     async def get_one(self, id: int, channel_username: str) -> Post | None:
         return await self._session.get(Post, (id, channel_username))
 
@@ -35,31 +53,146 @@ class PostRepository:
         order: str = "desc",
         marked: str | None = None,
         created_after: datetime | None = None,
+        after: tuple[datetime, int] | None = None,
     ) -> list[Post]:
-        query = (
-            select(Post)
-            .options(selectinload(Post.medias))
-            .filter_by(channel_username=channel_username)
+        """after — курсор (created_at, id) последнего поста предыдущей страницы."""
+        query = _filter_posts(
+            select(Post).options(selectinload(Post.medias)),
+            channel_username, order, marked, created_after, after,
+        )
+
+        if limit:
+            query = query.limit(limit)
+
+        result = await self._session.execute(query)
+        return list(result.scalars().all())
+
+    async def stream_rows(
+        self,
+        channel_username: str,
+        limit: int | None = None,
+        order: str = "desc",
+        marked: str | None = None,
+        created_after: datetime | None = None,
+        after: tuple[datetime, int] | None = None,
+        chunk_size: int = 500,
+    ) -> AsyncIterator[list[dict]]:
+        """Посты словарями, пачками по chunk_size через серверный курсор.
+
+        ORM-объекты не создаются; медиа подгружаются одним запросом на пачку.
+        """
+        query = _filter_posts(
+            select(Post.id, Post.channel_username, Post.mark, Post.text, Post.created_at, Post.simhash),
+            channel_username, order, marked, created_after, after,
+        )
+
+        if limit:
+            query = query.limit(limit)
+
+        result = await self._session.stream(query.execution_options(yield_per=chunk_size))
+        async for partition in result.mappings().partitions():
+            rows = [dict(row, medias=[]) for row in partition]
+            by_id = {row["id"]: row for row in rows}
+
+            medias = await self._session.execute(
+                select(
+                    Media.post_id, Media.type, Media.url,
+                    Media.status, Media.content_hash, Media.size, Media.mime_type,
+                )
+                .filter(
+                    Media.post_channel_username == channel_username,
+                    Media.post_id.in_(by_id),
+                )
+                .order_by(Media.id)
+            )
+            for media in medias:
+                by_id[media.post_id]["medias"].append({
+                    "type": media.type.value,
+                    "url": media.url,
+                    "status": media.status,
+                    "content_hash": media.content_hash,
+                    "size": media.size,
+                    "mime_type": media.mime_type,
+                })
+
+            yield rows
+
+    async def get_latest_for_channels(
+        self,
+        channel_usernames: list[str],
+        limit: int,
+        order: str = "desc",
+        marked: str | None = None,
+        created_after: datetime | None = None,
+    ) -> dict[str, list[Post]]:
+        """Первые limit постов каждого канала одним запросом (ROW_NUMBER по каналу)."""
+        if not channel_usernames:
+            return {}
+
+        if order == "desc":
+            ordering = (Post.created_at.desc(), Post.id.desc())
+        else:
+            ordering = (Post.created_at.asc(), Post.id.asc())
+
+        ranked = (
+            select(
+                Post.id,
+                Post.channel_username,
+                func.row_number()
+                .over(partition_by=Post.channel_username, order_by=ordering)
+                .label("rn"),
+            )
+            .filter(Post.channel_username.in_(channel_usernames))
         )
 
         if marked is not None:
-            query = query.filter(Post.mark == marked)
+            ranked = ranked.filter(Post.mark == marked)
         else:
-            query = query.filter(Post.mark.is_(None))
+            ranked = ranked.filter(Post.mark.is_(None))
 
         if created_after is not None:
-            query = query.filter(Post.created_at >= created_after)
+            ranked = ranked.filter(Post.created_at >= created_after)
 
-        if order == "desc":
-            query = query.order_by(Post.created_at.desc())
-        else:
-            query = query.order_by(Post.created_at.asc())
+        ranked = ranked.subquery()
 
-        if limit:
-            query = query.limit(limit)
+        result = await self._session.execute(
+            select(Post)
+            .options(selectinload(Post.medias))
+            .join(ranked, and_(
+                Post.id == ranked.c.id,
+                Post.channel_username == ranked.c.channel_username,
+            ))
+            .filter(ranked.c.rn <= limit)
+            .order_by(Post.channel_username, ranked.c.rn)
+        )
 
-        result = await self._session.execute(query)
-        return list(result.scalars().all())
+        posts_by_channel: dict[str, list[Post]] = {username: [] for username in channel_usernames}
+        for post in result.scalars().all():
+            posts_by_channel[post.channel_username].append(post)
+        return posts_by_channel
+
+    async def mark_many(self, marks: list[tuple[int, str, str]]) -> int:
+        """Ставит отметки (id, channel_username, mark) одним UPDATE ... FROM (VALUES ...)."""
+        if not marks:
+            return 0
+
+        marks_values = values(
+            column("id", Integer),
+            column("channel_username", String),
+            column("mark", String),
+            name="marks",
+        ).data(marks)
+
+        result = await self._session.execute(
+            update(Post)
+            .where(
+                Post.id == marks_values.c.id,
+                Post.channel_username == marks_values.c.channel_username,
+            )
+            .values(mark=marks_values.c.mark)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     async def update(self, id: int, channel_username: str, **kwargs) -> None:
         post = await self._session.get(Post, (id, channel_username))
@@ -71,3 +204,23 @@ class PostRepository:
         post = await self._session.get(Post, (id, channel_username))
         if post:
             await self._session.delete(post)
+
+
+def _filter_posts(query, channel_username, order, marked, created_after, after):
+    query = query.filter(Post.channel_username == channel_username)
+
+    if marked is not None:
+        query = query.filter(Post.mark == marked)
+    else:
+        query = query.filter(Post.mark.is_(None))
+
+    if created_after is not None:
+        query = query.filter(Post.created_at >= created_after)
+
+    key = tuple_(Post.created_at, Post.id)
+    if after is not None:
+        query = query.filter(key < after if order == "desc" else key > after)
+
+    if order == "desc":
+        return query.order_by(Post.created_at.desc(), Post.id.desc())
+    return query.order_by(Post.created_at.asc(), Post.id.asc())
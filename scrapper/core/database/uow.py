@@ -1,3 +1,5 @@
+from typing import Callable
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .repos.channel import ChannelRepository
@@ -13,8 +15,18 @@ class UnitOfWork:
         self.posts = PostRepository(session)
         self.media = MediaRepository(session)
 
+        self._on_commit: list[Callable[[], None]] = []
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Вызовет callback после успешного commit (при rollback — забудет)."""
+        self._on_commit.append(callback)
+
     async def commit(self) -> None:
         await self._session.commit()
+        callbacks, self._on_commit = self._on_commit, []
+        for callback in callbacks:
+            callback()
 
     async def rollback(self) -> None:
+        self._on_commit.clear()
         await self._session.rollback()
@@ -1,10 +1,12 @@
 import logging
 import asyncio
 import json
+import time
 
 from aio_pika import connect_robust, IncomingMessage
 from dishka import AsyncContainer
 
+from core.api.cache import ResponseCache
 from core.config.settings import Settings
 from core.database.uow import UnitOfWork
 
@@ -13,19 +15,42 @@ logger = logging.getLogger(__name__)
 
 
 class EventConsumer:
-    def __init__(self, settings: Settings, container: AsyncContainer):
+    """Консюмер событий бота.
+
+    Сообщения копятся до EVENTS_BATCH_SIZE штук или EVENTS_BATCH_TIMEOUT
+    секунд и применяются одной транзакцией. Если пачка не применилась,
+    сообщения повторяются по одному: битое отбрасывается, остальные
+    подтверждаются или возвращаются в очередь.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        container: AsyncContainer,
+        response_cache: ResponseCache | None = None,
+    ):
         self._url = settings.RABBITMQ_URL
         self._container = container
+        self._response_cache = response_cache
+        self._prefetch = settings.EVENTS_PREFETCH
+        self._batch_size = settings.EVENTS_BATCH_SIZE
+        self._batch_timeout = settings.EVENTS_BATCH_TIMEOUT
+        self._messages: asyncio.Queue[IncomingMessage] = asyncio.Queue()
 
     async def run(self):
         connection = await self._connect()
 
         async with connection:
             channel = await connection.channel()
+            # брокер держит у нас не больше prefetch неподтверждённых сообщений
+            await channel.set_qos(prefetch_count=self._prefetch)
             queue = await channel.declare_queue("events_queue", durable=True)
             await queue.consume(self._on_message, no_ack=False)
-            logger.info("Консюмер запущен")
-            await asyncio.Future()
+            logger.info(
+                f"Консюмер запущен (prefetch={self._prefetch}, пачка до {self._batch_size} "
+                f"сообщений / {self._batch_timeout * 1000:.0f} мс)"
+            )
+            await self._process_batches()
 
     async def _connect(self):
         for i in range(20):
@@ -37,22 +62,94 @@ class EventConsumer:
         raise RuntimeError("Не удалось подключиться к RabbitMQ")
 
     async def _on_message(self, message: IncomingMessage):
-        async with message.process():
+        await self._messages.put(message)
+
+    async def _process_batches(self):
+        while True:
+            batch = await self._collect_batch()
+            try:
+                await self._handle_batch(batch)
+            except Exception as e:
+                logger.error(f"Ошибка обработки пачки из {len(batch)} событий: {e}", exc_info=True)
+
+    async def _collect_batch(self) -> list[IncomingMessage]:
+        batch = [await self._messages.get()]
+        deadline = time.monotonic() + self._batch_timeout
+
+        while len(batch) < self._batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._messages.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _handle_batch(self, batch: list[IncomingMessage]):
+        marks: list[tuple[IncomingMessage, tuple[int, str, str]]] = []
+
+        for message in batch:
             try:
                 payload = json.loads(message.body)
-                logger.info(f"Событие: {payload}")
-                await self._handle(payload)
+            except ValueError:
+                logger.error(f"Событие не JSON, отбрасываем: {message.body[:200]!r}")
+                await message.reject(requeue=False)
+                continue
+
+            if payload.get("type") != "mark_post":
+                logger.warning(f"Неизвестное событие, пропускаем: {payload}")
+                await message.ack()
+                continue
+
+            try:
+                mark = (int(payload["post_id"]), str(payload["channel_username"]), str(payload["mark"]))
+            except (KeyError, TypeError, ValueError):
+                logger.error(f"Некорректное событие mark_post, отбрасываем: {payload}")
+                await message.reject(requeue=False)
+                continue
+
+            marks.append((message, mark))
+
+        if not marks:
+            return
+
+        try:
+            await self._apply_marks([mark for _, mark in marks])
+        except Exception as e:
+            logger.warning(
+                f"Пачка из {len(marks)} отметок не применилась ({e}), повторяем по одной"
+            )
+            await self._apply_one_by_one(marks)
+            return
+
+        for message, _ in marks:
+            await message.ack()
+        logger.info(f"Применено отметок: {len(marks)}")
+
+    async def _apply_one_by_one(self, marks: list[tuple[IncomingMessage, tuple[int, str, str]]]):
+        for message, mark in marks:
+            try:
+                await self._apply_marks([mark])
             except Exception as e:
-                logger.error(f"Ошибка обработки: {e}", exc_info=True)
-                raise
-
-    async def _handle(self, payload: dict):
-        if payload.get("type") == "mark_post":
-            async with self._container() as req:
-                uow = await req.get(UnitOfWork)
-                await uow.posts.update(
-                    payload["post_id"],
-                    payload["channel_username"],
-                    mark=payload["mark"],
-                )
-                await uow.commit()
+                # повторно доставленное и снова упавшее сообщение считаем битым
+                logger.error(f"Отметка {mark} не применилась: {e}", exc_info=True)
+                await message.reject(requeue=not message.redelivered)
+            else:
+                await message.ack()
+
+    async def _apply_marks(self, marks: list[tuple[int, str, str]]):
+        # при повторе события для одного поста побеждает последнее
+        latest = {(post_id, username): mark for post_id, username, mark in marks}
+        channels = sorted({username for _, username in latest})
+
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            await uow.posts.mark_many([(post_id, username, mark) for (post_id, username), mark in latest.items()])
+            await uow.channels.bump_mark_versions(channels)
+            await uow.commit()
+
+        if self._response_cache:
+            for username in channels:
+                self._response_cache.invalidate(username)
@@ -13,6 +13,14 @@ class RobotSuspicion(ScrappingError):
     pass
 
 
+class BrowserFallbackRequired(ScrappingError):
+    """Raised when plain HTTP fetch can't get the page and a browser is needed."""
+
+    def __init__(self, reason: str, throttled: bool = False):
+        super().__init__(reason)
+        self.throttled = throttled  # tgstat ответил 429
+
+
 class ParsingError(ScrappingError):
     """Raised when HTML parsing fails."""
     pass
@@ -43,6 +51,14 @@ class MediaUnavailableException(ScrappingError):
     pass
 
 
+class MediaTooLarge(Exception):
+    """Raised when a media file exceeds the Bot API upload limit."""
+
+    def __init__(self, size: int):
+        super().__init__(f"media size exceeds limit ({size} bytes read)")
+        self.size = size
+
+
 class RobotSuspition(ScrappingError):
     pass
 
@@ -1,5 +1,22 @@
-from pydantic import BaseModel
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, field_validator
 
 class MediaSchema(BaseModel):
     type: str
     url: str
+    # локальная копия в хранилище медиа (см. MediaStager)
+    status: Optional[str] = None
+    content_hash: Optional[str] = None
+    size: Optional[int] = None
+    mime_type: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+    @field_validator("type", mode="before")
+    @classmethod
+    def _enum_value(cls, value):
+        # в ORM тип медиа — MediaTypeEnum, в ответе API — его строковое значение
+        return value.value if isinstance(value, Enum) else value
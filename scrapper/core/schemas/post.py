@@ -1,5 +1,5 @@
 import datetime as dt
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel
 
 from .media import MediaSchema
@@ -11,7 +11,24 @@ class PostSchema(BaseModel):
     mark: Optional[str] = None
     text: Optional[str]
     created_at: dt.datetime
+    simhash: Optional[int] = None
     medias: List[MediaSchema] = []
 
     class Config:
         from_attributes = True  # ВАЖНО!
+
+
+class PostsBatchRequest(BaseModel):
+    channels: List[str]
+    limit: int = 20
+    order: Literal["asc", "desc"] = "desc"
+    marked: Optional[Literal["used", "ad", "duplicate"]] = None
+    days_ago: Optional[int] = None
+    # ETag из прошлого ответа по каждому каналу
+    etags: Dict[str, str] = {}
+
+
+class ChannelPostsSchema(BaseModel):
+    etag: Optional[str] = None
+    not_modified: bool = False
+    posts: List[PostSchema] = []
@@ -1,15 +1,57 @@
-import os
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+from playwright.async_api import (
+    async_playwright,
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    Route,
+)
 from playwright_stealth import Stealth
 
+from .proxies import Egress, ProxyConfig, proxies_from_env
+from .resources import BlockedResources, ResourcePolicy
+
+
+logger = logging.getLogger(__name__)
+
+
+COOKIES_PATH = Path("cookies.json")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36"
+)
+
 
 class PlaywrightManager:
-    def __init__(self):
+    """Браузер с отдельным контекстом на каждый прокси.
+
+    Без списка прокси берёт PROXY_SERVER/PROXY_USERNAME/PROXY_PASSWORD из
+    окружения, пустой список — один контекст без прокси. Куки tgstat
+    у каждого прокси свои (см. cookies_path_for).
+    """
+
+    def __init__(
+        self,
+        proxies: list[ProxyConfig] | None = None,
+        resource_policy: ResourcePolicy | None = None,
+        quarantine_time: float = 900.0,
+        cookies_path: Path = COOKIES_PATH,
+    ):
         self._playwright: Playwright | None = None
         self._browser: Browser | None = None
-        self._context: BrowserContext | None = None
+        self._proxies = proxies_from_env() if proxies is None else proxies
+        self._egresses: list[Egress] = []
+        self._quarantine_time = quarantine_time
+        self._cookies_path = cookies_path
         self._stealth = Stealth()
+        self._resource_policy = resource_policy
+        self._blocked: dict[Page, BlockedResources] = {}
 
     async def __aenter__(self) -> "PlaywrightManager":
         self._playwright = await async_playwright().start()
@@ -34,29 +76,75 @@ class PlaywrightManager:
                 "--disable-component-update",
             ],
         )
-        self._context = await self._browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                    "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
-            # TODO отвязать от ос и привязать к настройкам
-            proxy={
-                "server": os.getenv("PROXY_SERVER"),  # pyright: ignore
-                "username": os.getenv("PROXY_USERNAME"), # pyright: ignore
-                "password": os.getenv("PROXY_PASSWORD"), # pyright: ignore
-            } if os.getenv("PROXY_SERVER") else None,
-        )
-        await self._stealth.apply_stealth_async(self._context)
+        for proxy in self._proxies or [None]:
+            context = await self._new_context(proxy)
+            self._egresses.append(
+                Egress(proxy, context, self._quarantine_time, self._cookies_path)
+            )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._context:
-            await self._context.close()
+        for egress in self._egresses:
+            await egress.context.close()
         if self._browser:
             await self._browser.close()
         if self._playwright:
             await self._playwright.stop()
 
+    async def _new_context(self, proxy: ProxyConfig | None) -> BrowserContext:
+        context = await self._browser.new_context(  # type: ignore[union-attr]
+            user_agent=USER_AGENT,
+            proxy=proxy.as_playwright() if proxy else None,  # type: ignore[arg-type]
+        )
+        await self._stealth.apply_stealth_async(context)
+        if self._resource_policy is not None:
+            await context.route("**/*", self._route)
+        return context
+
     @property
-    def context(self) -> BrowserContext:
-        if self._context is None:
+    def egresses(self) -> list[Egress]:
+        if not self._egresses:
             raise RuntimeError("PlaywrightManager not initialized")
-        return self._context
+        return self._egresses
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Egress]:
+        """Выдаёт наименее загруженный здоровый контекст на время одной загрузки."""
+        egress = self._pick()
+        egress.in_flight += 1
+        try:
+            yield egress
+        finally:
+            egress.in_flight -= 1
+
+    def _pick(self) -> Egress:
+        available = [e for e in self.egresses if not e.quarantined]
+        if available:
+            return min(available, key=lambda e: e.load)
+
+        # все в карантине — берём тот, что освободится раньше
+        egress = min(self.egresses, key=lambda e: e.quarantine_left)
+        logger.warning(
+            f"Все прокси в карантине, используем {egress.identity} "
+            f"(осталось {egress.quarantine_left:.0f} сек)"
+        )
+        return egress
+
+    def pop_blocked(self, page: Page) -> BlockedResources:
+        """Забирает статистику заблокированных запросов страницы."""
+        return self._blocked.pop(page, BlockedResources())
+
+    async def _route(self, route: Route) -> None:
+        request = route.request
+        if self._resource_policy.allows(request):  # type: ignore[union-attr]
+            await route.continue_()
+            return
+
+        try:
+            page = request.frame.page
+        except Exception:
+            page = None
+        if page is not None:
+            self._blocked.setdefault(page, BlockedResources()).add(request.resource_type)
+
+        await route.abort()
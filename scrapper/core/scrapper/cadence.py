@@ -0,0 +1,37 @@
+import datetime as dt
+
+from core.config.settings import Settings
+
+
+class PollingCadence:
+    """Считает, когда проверять канал в следующий раз, по частоте его постов.
+
+    Интервал — ожидаемое время до следующего поста (сутки / постов в сутки),
+    ограниченное снизу и сверху настройками.
+    """
+
+    def __init__(self, settings: Settings):
+        self._min_interval = dt.timedelta(seconds=settings.SCRAPPER_MIN_CHECK_INTERVAL)
+        self._max_interval = dt.timedelta(seconds=settings.SCRAPPER_MAX_CHECK_INTERVAL)
+        self.window = dt.timedelta(days=settings.SCRAPPER_RATE_WINDOW_DAYS)
+
+    def posts_per_day(self, posts_in_window: int) -> float:
+        return posts_in_window / (self.window.total_seconds() / 86400)
+
+    def interval(self, posts_per_day: float) -> dt.timedelta:
+        if posts_per_day <= 0:
+            return self._max_interval
+
+        expected = dt.timedelta(days=1 / posts_per_day)
+        return max(self._min_interval, min(expected, self._max_interval))
+
+    def next_check_at(self, now: dt.datetime, posts_per_day: float) -> dt.datetime:
+        return now + self.interval(posts_per_day)
+
+    def retry_at(self, now: dt.datetime) -> dt.datetime:
+        """Время повторной попытки после ошибки загрузки."""
+        return now + self._min_interval
+
+    def give_up_at(self, now: dt.datetime) -> dt.datetime:
+        """Время следующей проверки для канала, которого нет на tgstat."""
+        return now + self._max_interval
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from pathlib import Path
+
+from playwright.async_api import BrowserContext
+
+
+logger = logging.getLogger(__name__)
+
+
+def cookies_path_for(base: Path, identity: str) -> Path:
+    """Файл кук выхода: cookies.json без прокси, cookies.<прокси>.json с прокси.
+
+    У каждого прокси своя сессия tgstat — куки, полученные с одного IP,
+    с другого могут не приниматься.
+    """
+    if identity == "direct":
+        return base
+    name = re.sub(r"[^\w.-]+", "_", identity).strip("_")
+    return base.with_name(f"{base.stem}.{name}{base.suffix}")
+
+
+class CookieStore:
+    """Куки tgstat в памяти.
+
+    get() и проверки срока работают только с памятью. Файл проверяет reload()
+    раз в начале загрузки и не чаще CHECK_INTERVAL, перечитывается он только
+    при смене mtime; чтение и запись идут в потоке, не блокируя цикл событий.
+    В контекст браузера куки передаются только если изменились с прошлой
+    передачи. Срок действия отслеживается, чтобы обновить куки до истечения,
+    а не после ошибки.
+    """
+
+    REFRESH_MARGIN = 3600.0  # in seconds
+    RETRY_DELAY = 600.0  # in seconds
+    CHECK_INTERVAL = 5.0  # in seconds
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._cookies: list[dict] = []
+        self._mtime: int | None = None
+        self._version = 0
+        self._applied: dict[BrowserContext, int] = {}
+        self._retry_after = 0.0
+        self._next_check = 0.0
+
+    def get(self) -> list[dict]:
+        return self._cookies
+
+    async def reload(self) -> None:
+        """Подхватывает изменения файла (например, куки, обновлённые вручную)."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.CHECK_INTERVAL
+
+        version = self._version
+        loaded = await asyncio.to_thread(self._read_if_changed, self._mtime)
+        # пока файл читался, куки уже сохранили — прочитанное устарело
+        if loaded is None or version != self._version:
+            return
+
+        self._mtime, cookies = loaded
+        if cookies != self._cookies:
+            self._cookies = cookies
+            self._version += 1
+            logger.info(f"Cookies перечитаны из {self._path} ({len(cookies)} шт.)")
+
+    async def save(self, cookies: list[dict]) -> None:
+        mtime = await asyncio.to_thread(self._write, cookies)
+
+        self._cookies = cookies
+        self._mtime = mtime
+        self._version += 1
+        self._retry_after = 0.0
+
+    def expires_at(self) -> float | None:
+        """Когда истекут куки tgstat (unix time); None — сессионные или их нет.
+
+        Берётся самый поздний срок: долгоживущая кука авторизации переживает
+        короткие служебные куки, и пока жива она — жива сессия.
+        """
+        expires = [
+            cookie["expires"]
+            for cookie in self.get()
+            if cookie.get("domain", "").lstrip(".").endswith("tgstat.ru")
+            and cookie.get("expires", -1) > 0
+        ]
+        return max(expires) if expires else None
+
+    def needs_refresh(self) -> bool:
+        if not self.get():
+            return True
+
+        if time.monotonic() < self._retry_after:
+            return False
+
+        expires_at = self.expires_at()
+        return expires_at is not None and expires_at - time.time() < self.REFRESH_MARGIN
+
+    def refresh_failed(self) -> None:
+        """Откладывает следующую попытку обновления, пока старые куки ещё работают."""
+        self._retry_after = time.monotonic() + self.RETRY_DELAY
+
+    async def apply(self, context: BrowserContext) -> None:
+        cookies = self.get()
+        if not cookies or self._applied.get(context) == self._version:
+            return
+
+        await context.add_cookies(cookies)  # type: ignore[arg-type]
+        self._applied[context] = self._version
+
+    def _read_if_changed(self, known_mtime: int | None) -> tuple[int | None, list[dict]] | None:
+        """(mtime, куки) из файла; None — файл не менялся с known_mtime."""
+        try:
+            mtime = self._path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        if mtime == known_mtime:
+            return None
+        if mtime is None:
+            return None, []
+
+        with open(self._path, "r", encoding="utf-8") as f:
+            return mtime, json.load(f)
+
+    def _write(self, cookies: list[dict]) -> int:
+        with open(self._path, "w", encoding="utf-8") as f:
+            json.dump(cookies, f, indent=2, ensure_ascii=False)
+        return self._path.stat().st_mtime_ns
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+
+import aiohttp
+
+from core.config.settings import Settings
+from core.exceptions import BrowserFallbackRequired, ChannelNotFound
+from .browser import USER_AGENT
+from .proxies import ProxyConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+CHALLENGE_MARKERS = (
+    "just a moment",
+    "checking your browser",
+    "challenge-platform",
+    "cf_chl_",
+)
+
+
+class FetchEngineStats:
+    """Счётчики загрузок по движкам (http / browser)."""
+
+    def __init__(self):
+        self._counts: Counter[str] = Counter()
+
+    def record(self, engine: str) -> None:
+        self._counts[engine] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self._counts.values())
+
+    def hit_rate(self, engine: str) -> float:
+        return self._counts[engine] / self.total if self.total else 0.0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(self._counts)
+
+
+class HttpFetcher:
+    """Загрузка страниц tgstat обычным HTTP-клиентом с сохранёнными куками.
+
+    Если страница не отдалась как есть (Cloudflare, 429, нет списка постов),
+    бросает BrowserFallbackRequired — тогда страницу грузит Playwright.
+    После нескольких подряд неудач HTTP-путь на время отключается.
+    """
+
+    MAX_FAILURES_IN_ROW = 5
+    COOLDOWN = 600.0  # in seconds
+
+    def __init__(self, settings: Settings):
+        self._pool_size = settings.SCRAPPER_HTTP_POOL_SIZE
+        self._session: aiohttp.ClientSession | None = None
+        self._failures_in_row = 0
+        self._disabled_until = 0.0
+
+    async def __aenter__(self) -> "HttpFetcher":
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._pool_size, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+            },
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._session:
+            await self._session.close()
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    async def fetch(self, url: str, cookies: list[dict], proxy: ProxyConfig | None = None) -> str:
+        if self._session is None:
+            raise RuntimeError("HttpFetcher not initialized")
+
+        try:
+            html = await self._get(url, cookies, proxy)
+        except BrowserFallbackRequired:
+            self._failures_in_row += 1
+            if self._failures_in_row >= self.MAX_FAILURES_IN_ROW:
+                logger.warning(
+                    f"HTTP-загрузка не удалась {self._failures_in_row} раз подряд, "
+                    f"отключаем её на {self.COOLDOWN:.0f} сек"
+                )
+                self._disabled_until = time.monotonic() + self.COOLDOWN
+                self._failures_in_row = 0
+            raise
+
+        self._failures_in_row = 0
+        return html
+
+    async def _get(self, url: str, cookies: list[dict], proxy: ProxyConfig | None) -> str:
+        headers = {}
+        cookie_header = _cookie_header(cookies)
+        if cookie_header:
+            headers["Cookie"] = cookie_header
+
+        try:
+            async with self._session.get(  # type: ignore[union-attr]
+                url,
+                headers=headers,
+                proxy=proxy.server if proxy else None,
+                proxy_auth=(
+                    aiohttp.BasicAuth(proxy.username, proxy.password or "")
+                    if proxy and proxy.username else None
+                ),
+                allow_redirects=True,
+            ) as response:
+                if response.status == 404:
+                    raise ChannelNotFound()
+                if response.status == 429:
+                    raise BrowserFallbackRequired("HTTP 429", throttled=True)
+
+                html = await response.text(errors="replace")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise BrowserFallbackRequired(f"ошибка сети: {e!r}") from e
+
+        head = html[:4096].lower()
+        if any(marker in head for marker in CHALLENGE_MARKERS):
+            raise BrowserFallbackRequired("Cloudflare challenge")
+        if response.status != 200:
+            raise BrowserFallbackRequired(f"HTTP {response.status}")
+        if "posts-list" not in html:
+            raise BrowserFallbackRequired("нет контейнера posts-list")
+
+        return html
+
+
+def _cookie_header(cookies: list[dict]) -> str:
+    now = time.time()
+    return "; ".join(
+        f"{cookie['name']}={cookie['value']}"
+        for cookie in cookies
+        if cookie.get("domain", "").lstrip(".").endswith("tgstat.ru")
+        and not (0 < cookie.get("expires", -1) < now)
+    )
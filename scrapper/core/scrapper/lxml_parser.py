@@ -0,0 +1,254 @@
+# core/scrapper/lxml_parser.py
+"""Парсер страницы канала на чистом lxml (etree + XPath).
+
+Даёт тот же результат, что и BeautifulSoup-парсер из parser.py, но не
+строит дерево BeautifulSoup: разбирается только хвост документа, начиная
+со списка постов, а HTML текста поста сериализуется так же, как это делает
+BeautifulSoup (formatter="minimal").
+"""
+from typing import List
+
+from lxml import etree
+
+from core.dto import MediaSchema, PostSchema
+from core.enums import MediaTypeEnum
+from core.exceptions import (
+    PostIdNotFoundException,
+    PostsListNotFoundException,
+    VideoUnavailableException,
+    MediaUnavailableException,
+)
+from .parser import clean_post_html, parse_post_date, post_id_from_share_link
+
+
+_POSTS_LIST_CLASS = "posts-list lm-list-container"
+_POSTS_LIST_MARKER = f'<div class="{_POSTS_LIST_CLASS}"'
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_XPATH_POSTS_LIST = etree.XPath(f"//div[normalize-space(@class) = '{_POSTS_LIST_CLASS}']")
+_XPATH_POST_CARDS = etree.XPath(
+    ".//div[normalize-space(@class) = 'card card-body border p-2 px-1 px-sm-3 post-container']"
+)
+_XPATH_TEXT = etree.XPath(f".//*[{_has_class('post-text')}]")
+_XPATH_SHARE = etree.XPath(".//a[contains(@data-src, '/share')]")
+_XPATH_DATE = etree.XPath(f".//*[{_has_class('media-body')} and {_has_class('text-truncate')}]//small")
+_XPATH_UNAVAILABLE = etree.XPath(f".//div[{_has_class('thumbnail-text')}]")
+_XPATH_CAROUSEL = etree.XPath(f".//div[{_has_class('carousel-inner')}]")
+_XPATH_VIDEO = etree.XPath(f".//*[{_has_class('wrapper-video-video')}]//source")
+_XPATH_IMAGE = etree.XPath(f".//img[{_has_class('post-img-img')}]")
+_XPATH_STRING = etree.XPath("string(.)")
+_XPATH_TEXT_NODES = etree.XPath(".//text()")
+
+
+def parse_channel_posts_lxml(
+    html: str,
+    channel_username: str,
+    stop_at_id: int = 0,
+) -> List[PostSchema]:
+    posts_parent_div = _find_posts_list(html)
+    if posts_parent_div is None:
+        raise PostsListNotFoundException()
+
+    post_tags = _XPATH_POST_CARDS(posts_parent_div)
+    if not post_tags:
+        return []
+
+    parsed_posts = []
+    for post_tag in post_tags:
+        try:
+            post_id = _parse_post_id(post_tag)
+            if post_id <= stop_at_id:
+                # закреплённые посты стоят не по порядку, поэтому не break
+                continue
+
+            post = _parse_single_post(post_tag, channel_username, post_id)
+            if post:
+                parsed_posts.append(post)
+        except (VideoUnavailableException, MediaUnavailableException):
+            continue
+        except Exception:
+            continue
+
+    return sorted(parsed_posts, key=lambda p: p.id, reverse=True)
+
+
+def _find_posts_list(html: str) -> etree._Element | None:
+    # разбираем документ только с начала списка постов; если разметка
+    # отличается от ожидаемой — весь документ целиком
+    start = html.find(_POSTS_LIST_MARKER)
+    if start != -1:
+        found = _XPATH_POSTS_LIST(_parse(html[start:]))
+        if found:
+            return found[0]
+
+    found = _XPATH_POSTS_LIST(_parse(html))
+    return found[0] if found else None
+
+
+def _parse(html: str) -> etree._Element:
+    root = etree.fromstring(html, etree.HTMLParser())
+    if root is None:
+        raise PostsListNotFoundException()
+    return root
+
+
+def _parse_single_post(post: etree._Element, channel_username: str, post_id: int) -> PostSchema | None:
+    text = _parse_text(post)
+    if not text:
+        return None
+
+    created_at = _parse_created_at(post)
+    medias = _parse_medias(post)
+
+    return PostSchema(
+        id=post_id,
+        channel_username=channel_username,
+        text=text,
+        created_at=created_at,
+        medias=medias,
+    )
+
+
+def _parse_text(post: etree._Element) -> str:
+    found = _XPATH_TEXT(post)
+    if not found:
+        return ""
+
+    return clean_post_html(_decode_contents(found[0]))
+
+
+def _parse_post_id(post: etree._Element) -> int:
+    found = _XPATH_SHARE(post)
+    if not found or found[0].get("data-src") is None:
+        raise PostIdNotFoundException()
+
+    return post_id_from_share_link(found[0].get("data-src"))
+
+
+def _parse_created_at(post: etree._Element):
+    found = _XPATH_DATE(post)
+    if not found:
+        raise ValueError("не обнаружена дата создания поста")
+
+    return parse_post_date(_XPATH_STRING(found[0]))
+
+
+def _parse_medias(post: etree._Element) -> List[MediaSchema]:
+    # проверки на недоступный контент
+    unavailable = _XPATH_UNAVAILABLE(post)
+    if unavailable:
+        text = "".join(s.strip() for s in _XPATH_TEXT_NODES(unavailable[0]))
+        if "Видео недоступно для предпросмотра" in text:
+            raise VideoUnavailableException()
+
+    if _XPATH_CAROUSEL(post):
+        raise MediaUnavailableException()
+
+    medias = []
+
+    # видео
+    video_el = _XPATH_VIDEO(post)
+    if video_el and video_el[0].get("src"):
+        medias.append(MediaSchema(type=MediaTypeEnum.VIDEO, url=video_el[0].get("src")))
+
+    # картинка
+    img_el = _XPATH_IMAGE(post)
+    if img_el and img_el[0].get("src"):
+        medias.append(MediaSchema(type=MediaTypeEnum.IMAGE, url=img_el[0].get("src")))
+
+    return medias
+
+
+# --- сериализация в точности как BeautifulSoup.decode_contents() ---
+
+# теги без содержимого: BeautifulSoup выводит их как <br/>
+_VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+    "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+})
+
+# многозначные атрибуты: BeautifulSoup разбивает их по пробелам и склеивает через один
+_LIST_ATTRIBUTES = {
+    "*": frozenset({"class", "accesskey", "dropzone"}),
+    "a": frozenset({"rel", "rev"}),
+    "link": frozenset({"rel", "rev"}),
+    "td": frozenset({"headers"}),
+    "th": frozenset({"headers"}),
+    "form": frozenset({"accept-charset"}),
+    "object": frozenset({"archive"}),
+    "area": frozenset({"rel"}),
+    "icon": frozenset({"sizes"}),
+    "iframe": frozenset({"sandbox"}),
+    "output": frozenset({"for"}),
+}
+
+# содержимое этих тегов BeautifulSoup выводит без экранирования
+_RAW_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+
+def _decode_contents(element: etree._Element) -> str:
+    parts: list[str] = []
+    _serialize_children(element, parts)
+    return "".join(parts)
+
+
+def _serialize_children(element: etree._Element, parts: list[str]) -> None:
+    raw = element.tag in _RAW_TEXT_TAGS
+    if element.text:
+        parts.append(element.text if raw else _escape_text(element.text))
+
+    for child in element:
+        _serialize(child, parts)
+        if child.tail:
+            parts.append(child.tail if raw else _escape_text(child.tail))
+
+
+def _serialize(element: etree._Element, parts: list[str]) -> None:
+    tag = element.tag
+    if tag is etree.Comment:
+        parts.append(f"<!--{element.text or ''}-->")
+        return
+    if tag is etree.ProcessingInstruction:
+        parts.append(f"<?{element.target} {element.text or ''}>")
+        return
+    if not isinstance(tag, str):
+        return
+
+    parts.append(f"<{tag}")
+    # BeautifulSoup выводит атрибуты в алфавитном порядке
+    for name, value in sorted(element.attrib.items()):
+        if name in _LIST_ATTRIBUTES["*"] or name in _LIST_ATTRIBUTES.get(tag, ()):
+            value = " ".join(value.split())
+        parts.append(f" {name}={_quote_attribute(_escape_text(value))}")
+
+    if tag in _VOID_TAGS:
+        parts.append("/>")
+        return
+
+    parts.append(">")
+    _serialize_children(element, parts)
+    parts.append(f"</{tag}>")
+
+
+def _escape_text(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _quote_attribute(value: str) -> str:
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', "&quot;") + '"'
@@ -0,0 +1,181 @@
+import asyncio
+import datetime as dt
+import logging
+import time
+from functools import partial
+
+import aiohttp
+from dishka import AsyncContainer
+
+from core.api.cache import ResponseCache
+from core.config.settings import Settings
+from core.database.models import Media
+from core.database.uow import UnitOfWork
+from core.enums import MediaTypeEnum
+from core.exceptions import MediaTooLarge
+from .browser import USER_AGENT
+from .media_store import MediaStore
+
+
+logger = logging.getLogger(__name__)
+
+
+# ответы, после которых файл по этой ссылке уже не появится
+GONE_STATUSES = frozenset({403, 404, 410})
+
+CHUNK_SIZE = 256 * 1024
+EVICT_INTERVAL = 600.0  # in seconds
+
+
+class MediaStager:
+    """Фоновая загрузка медиа новых постов в локальное хранилище.
+
+    Будится после сохранения постов (notify) и раз в interval проверяет
+    очередь сама. Файлы качаются потоком через общий пул соединений
+    с ограничением параллельности; в строку media записываются статус,
+    размер, MIME-тип и хеш содержимого.
+    """
+
+    def __init__(
+        self,
+        container: AsyncContainer,
+        store: MediaStore,
+        settings: Settings,
+        response_cache: ResponseCache | None = None,
+    ):
+        self._container = container
+        self._store = store
+        self._response_cache = response_cache
+        self._concurrency = max(1, settings.MEDIA_STAGE_CONCURRENCY)
+        self._batch_size = settings.MEDIA_STAGE_BATCH_SIZE
+        self._interval = settings.MEDIA_STAGE_INTERVAL
+        self._max_attempts = settings.MEDIA_STAGE_ATTEMPTS
+        self._max_size = {
+            MediaTypeEnum.IMAGE: settings.MEDIA_MAX_IMAGE_SIZE,
+            MediaTypeEnum.VIDEO: settings.MEDIA_MAX_VIDEO_SIZE,
+        }
+        self._wakeup = asyncio.Event()
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        logger.info(f"Загрузчик медиа запущен (параллельно: {self._concurrency})")
+        last_evict = 0.0
+
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._concurrency, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=300, sock_read=60),
+            headers={"User-Agent": USER_AGENT},
+        ) as session:
+            while True:
+                self._wakeup.clear()
+                staged = 0
+                try:
+                    staged = await self._stage_pending(session)
+                    if time.monotonic() - last_evict > EVICT_INTERVAL:
+                        await self._touch_awaiting()
+                        await self._store.evict()
+                        last_evict = time.monotonic()
+                except Exception as e:
+                    logger.error(f"Ошибка загрузчика медиа: {e}", exc_info=True)
+
+                # полная пачка — очередь, скорее всего, не пуста
+                if staged < self._batch_size:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self._interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+    async def _stage_pending(self, session: aiohttp.ClientSession) -> int:
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            pending = await uow.media.get_pending(self._batch_size, self._max_attempts)
+        if not pending:
+            return 0
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def stage(media: Media) -> dict:
+            async with semaphore:
+                return await self._stage_one(session, media)
+
+        rows = await asyncio.gather(*(stage(media) for media in pending))
+        usernames = sorted({media.post_channel_username for media in pending})
+
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            await uow.media.update_many(rows)
+            # статус медиа входит в ответ /posts — сбрасываем ETag и кеш
+            await uow.channels.bump_mark_versions(usernames)
+            if self._response_cache:
+                for username in usernames:
+                    uow.on_commit(partial(self._response_cache.invalidate, username))
+            await uow.commit()
+
+        ready = sum(1 for row in rows if row["status"] == "ready")
+        logger.info(f"Медиа обработано: {len(rows)}, загружено: {ready}")
+        return len(rows)
+
+    async def _touch_awaiting(self) -> None:
+        """Файлы постов, которые бот ещё не разобрал, вытесняются последними."""
+        created_after = dt.datetime.utcnow() - dt.timedelta(seconds=self._store.max_age)
+        async with self._container() as req:
+            uow = await req.get(UnitOfWork)
+            content_hashes = await uow.media.get_awaiting_hashes(created_after)
+
+        await self._store.touch(content_hashes)
+
+    async def _stage_one(self, session: aiohttp.ClientSession, media: Media) -> dict:
+        row = {
+            "id": media.id,
+            "status": None,
+            "content_hash": None,
+            "size": None,
+            "mime_type": None,
+            "attempts": media.attempts + 1,
+            "staged_at": dt.datetime.utcnow(),
+        }
+        try:
+            max_size = self._max_size[media.type]
+            async with session.get(media.url) as response:
+                if response.status in GONE_STATUSES:
+                    row["status"] = "unavailable"
+                    return row
+                if response.status != 200:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info, response.history, status=response.status
+                    )
+
+                row["mime_type"] = response.content_type
+                if response.content_length and response.content_length > max_size:
+                    row.update(status="too_large", size=response.content_length)
+                    return row
+
+                content_hash, size = await self._store.save(
+                    response.content.iter_chunked(CHUNK_SIZE), max_size
+                )
+                row.update(status="ready", content_hash=content_hash, size=size)
+
+        except MediaTooLarge as e:
+            row.update(status="too_large", size=e.size)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._record_failure(row)
+            logger.warning(
+                f"Медиа {media.id} не загружено ({type(e).__name__}: {e}), попытка {row['attempts']}/{self._max_attempts}"
+            )
+        except Exception as e:
+            # ошибка одного файла (диск, битый ответ) не должна терять всю пачку
+            self._record_failure(row)
+            logger.error(
+                f"Ошибка загрузки медиа {media.id}, попытка {row['attempts']}/{self._max_attempts}: {e}",
+                exc_info=True,
+            )
+
+        return row
+
+    def _record_failure(self, row: dict) -> None:
+        """Попытка засчитана; после последней медиа больше не загружается."""
+        row.update(content_hash=None, size=None)
+        if row["attempts"] >= self._max_attempts:
+            row["status"] = "unavailable"
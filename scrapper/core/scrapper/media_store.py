@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator
+
+from core.exceptions import MediaTooLarge
+
+
+logger = logging.getLogger(__name__)
+
+
+class MediaStore:
+    """Файлы медиа на диске по sha256 содержимого: <root>/<ab>/<sha256>.
+
+    Одинаковый файл из разных постов хранится один раз. mtime служит
+    отметкой последнего использования: его обновляют повторное сохранение
+    и touch для файлов, которые ещё ждут отправки ботом. По нему работает
+    вытеснение по возрасту и по LRU при превышении общего объёма.
+    """
+
+    TMP_DIR = "tmp"
+
+    def __init__(self, root: str | Path, max_bytes: int, max_age: float):
+        self._root = Path(root)
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+
+    @property
+    def max_age(self) -> float:
+        return self._max_age
+
+    def path_for(self, content_hash: str) -> Path:
+        return self._root / content_hash[:2] / content_hash
+
+    async def save(self, chunks: AsyncIterator[bytes], max_size: int) -> tuple[str, int]:
+        """Пишет поток во временный файл, считая хеш; возвращает (sha256, размер).
+
+        Превышение max_size прерывает загрузку с MediaTooLarge.
+        """
+        tmp_dir = self._root / self.TMP_DIR
+        await asyncio.to_thread(tmp_dir.mkdir, parents=True, exist_ok=True)
+        tmp_path = tmp_dir / uuid.uuid4().hex
+
+        digest = hashlib.sha256()
+        size = 0
+        file = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    raise MediaTooLarge(size)
+                digest.update(chunk)
+                await asyncio.to_thread(file.write, chunk)
+            await asyncio.to_thread(file.close)
+
+            content_hash = digest.hexdigest()
+            await asyncio.to_thread(self._commit, tmp_path, self.path_for(content_hash))
+            return content_hash, size
+        finally:
+            if not file.closed:
+                await asyncio.to_thread(file.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+
+    @staticmethod
+    def _commit(tmp_path: Path, path: Path) -> None:
+        if path.exists():
+            # такой файл уже есть — только отмечаем использование
+            os.utime(path)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+
+    async def touch(self, content_hashes: list[str]) -> int:
+        return await asyncio.to_thread(self._touch, content_hashes)
+
+    def _touch(self, content_hashes: list[str]) -> int:
+        """Отмечает файлы использованными сейчас; возвращает, сколько нашлось."""
+        touched = 0
+        for content_hash in content_hashes:
+            try:
+                os.utime(self.path_for(content_hash))
+            except FileNotFoundError:
+                continue
+            touched += 1
+        return touched
+
+    async def evict(self) -> tuple[int, int]:
+        return await asyncio.to_thread(self._evict)
+
+    def _evict(self) -> tuple[int, int]:
+        """Удаляет файлы старше max_age, затем самые давние, пока объём больше max_bytes."""
+        if not self._root.exists():
+            return 0, 0
+
+        now = time.time()
+        files: list[tuple[float, int, Path]] = []
+        for directory in self._root.iterdir():
+            if not directory.is_dir():
+                continue
+            # незавершённые загрузки старше часа остались от упавшего процесса
+            max_age = 3600.0 if directory.name == self.TMP_DIR else self._max_age
+            for entry in os.scandir(directory):
+                stat = entry.stat()
+                if now - stat.st_mtime > max_age:
+                    files.append((0.0, stat.st_size, Path(entry.path)))
+                elif directory.name != self.TMP_DIR:
+                    files.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        removed = removed_bytes = 0
+        for mtime, size, path in files:
+            if mtime and total <= self._max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+            removed_bytes += size
+
+        if removed:
+            logger.info(f"Из хранилища медиа удалено {removed} файлов ({removed_bytes // 1024 ** 2} MB)")
+        return removed, removed_bytes
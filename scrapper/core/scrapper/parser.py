@@ -21,7 +21,16 @@ _TGSTAT_LINK_PATTERN = re.compile(
 )
 
 
-def parse_channel_posts(html: str, channel_username: str) -> List[PostSchema]:
+def parse_channel_posts(
+    html: str,
+    channel_username: str,
+    stop_at_id: int = 0,
+) -> List[PostSchema]:
+    """Посты канала новее stop_at_id, от новых к старым.
+
+    Сначала у карточки читается только id из ссылки «Поделиться»; текст, дату
+    и медиа разбираем лишь у карточек новее stop_at_id.
+    """
     soup = BeautifulSoup(html, "lxml")
 
     posts_parent_div = soup.find("div", class_="posts-list lm-list-container")
@@ -38,7 +47,12 @@ def parse_channel_posts(html: str, channel_username: str) -> List[PostSchema]:
     parsed_posts = []
     for post_tag in post_tags:
         try:
-            post = _parse_single_post(post_tag, channel_username)
+            post_id = _parse_post_id(post_tag)
+            if post_id <= stop_at_id:
+                # закреплённые посты стоят не по порядку, поэтому не break
+                continue
+
+            post = _parse_single_post(post_tag, channel_username, post_id)
             if post:
                 parsed_posts.append(post)
         except (VideoUnavailableException, MediaUnavailableException):
@@ -49,12 +63,11 @@ def parse_channel_posts(html: str, channel_username: str) -> List[PostSchema]:
     return sorted(parsed_posts, key=lambda p: p.id, reverse=True)
 
 
-def _parse_single_post(post: Tag, channel_username: str) -> PostSchema | None:
+def _parse_single_post(post: Tag, channel_username: str, post_id: int) -> PostSchema | None:
     text = _parse_text(post)
     if not text:
         return None
 
-    post_id = _parse_post_id(post)
     created_at = _parse_created_at(post)
     medias = _parse_medias(post)
 
@@ -72,10 +85,7 @@ def _parse_text(post: Tag) -> str:
     if not post_text_tag:
         return ""
 
-    html_content = post_text_tag.decode_contents()
-    html_content = html_content.replace("<br/>", "\n")
-
-    return _TGSTAT_LINK_PATTERN.sub(r"\1", html_content)
+    return clean_post_html(post_text_tag.decode_contents())
 
 
 def _parse_post_id(post: Tag) -> int:
@@ -87,7 +97,7 @@ def _parse_post_id(post: Tag) -> int:
     if isinstance(share_link, list):
         share_link = share_link[0]
 
-    return int(share_link.split("/")[3])
+    return post_id_from_share_link(share_link)
 
 
 def _parse_created_at(post: Tag) -> dt.datetime:
@@ -95,13 +105,7 @@ def _parse_created_at(post: Tag) -> dt.datetime:
     if not tag_small:
         raise ValueError("не обнаружена дата создания поста")
 
-    text = tag_small.text.strip()
-
-    try:
-        return dt.datetime.strptime(text, "%d %b %Y, %H:%M")
-    except ValueError:
-        created = dt.datetime.strptime(text, "%d %b, %H:%M")
-        return created.replace(year=dt.datetime.now().year)
+    return parse_post_date(tag_small.text)
 
 
 def _parse_medias(post: Tag) -> List[MediaSchema]:
@@ -126,3 +130,24 @@ def _parse_medias(post: Tag) -> List[MediaSchema]:
         medias.append(MediaSchema(type=MediaTypeEnum.IMAGE, url=img_el["src"]))  # type: ignore
 
     return medias
+
+
+# общие для всех бэкендов парсинга преобразования
+
+def clean_post_html(html_content: str) -> str:
+    html_content = html_content.replace("<br/>", "\n")
+    return _TGSTAT_LINK_PATTERN.sub(r"\1", html_content)
+
+
+def post_id_from_share_link(share_link: str) -> int:
+    return int(share_link.split("/")[3])
+
+
+def parse_post_date(text: str) -> dt.datetime:
+    text = text.strip()
+
+    try:
+        return dt.datetime.strptime(text, "%d %b %Y, %H:%M")
+    except ValueError:
+        created = dt.datetime.strptime(text, "%d %b, %H:%M")
+        return created.replace(year=dt.datetime.now().year)
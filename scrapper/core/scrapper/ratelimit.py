@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import random
+import time
+
+from core.config.settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def jittered_backoff(attempt: int, base: float, cap: float) -> float:
+    """Экспоненциальная задержка с джиттером: половина фиксирована, половина случайна."""
+    delay = min(cap, base * 2 ** max(attempt - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class AdaptiveTokenBucket:
+    """Token bucket, скорость которого подстраивается под реакцию tgstat.
+
+    Успех — скорость растёт на шаг, 429 или challenge — падает вдвое и
+    корзина замирает на время экспоненциальной задержки с джиттером.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        step: float,
+        burst: float,
+        backoff_base: float,
+        backoff_max: float,
+    ):
+        self.name = name
+        self.rate = rate
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._step = step
+        self._burst = burst
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._throttles_in_row = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # под замком ждущие получают токены по очереди
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self) -> None:
+        self._throttles_in_row = 0
+        self.rate = min(self._max_rate, self.rate + self._step)
+
+    def on_throttle(self) -> float:
+        """Снижает скорость и ставит корзину на паузу. Возвращает длину паузы."""
+        self._throttles_in_row += 1
+        self.rate = max(self._min_rate, self.rate / 2)
+
+        delay = jittered_backoff(self._throttles_in_row, self._backoff_base, self._backoff_max)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self._tokens = 0
+        logger.info(
+            f"[{self.name}] tgstat ограничивает запросы: пауза {delay:.0f} сек, "
+            f"скорость {self.rate * 60:.2f} запр/мин"
+        )
+        return delay
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """Общий лимитер исходящих запросов к tgstat — по корзине на egress (прокси)."""
+
+    def __init__(
+        self,
+        rate: float = 0.05,
+        min_rate: float = 0.01,
+        max_rate: float = 0.5,
+        step: float = 0.002,
+        burst: float = 2.0,
+        backoff_base: float = 15.0,
+        backoff_max: float = 600.0,
+    ):
+        self._params = dict(
+            rate=rate,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            step=step,
+            burst=burst,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max,
+        )
+        self._buckets: dict[str, AdaptiveTokenBucket] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RateLimiter":
+        return cls(
+            rate=settings.SCRAPPER_RATE,
+            min_rate=settings.SCRAPPER_RATE_MIN,
+            max_rate=settings.SCRAPPER_RATE_MAX,
+            step=settings.SCRAPPER_RATE_STEP,
+            burst=settings.SCRAPPER_RATE_BURST,
+            backoff_base=settings.SCRAPPER_BACKOFF_BASE,
+            backoff_max=settings.SCRAPPER_BACKOFF_MAX,
+        )
+
+    def bucket(self, identity: str) -> AdaptiveTokenBucket:
+        if identity not in self._buckets:
+            self._buckets[identity] = AdaptiveTokenBucket(identity, **self._params)
+        return self._buckets[identity]
@@ -0,0 +1,60 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from playwright.async_api import Request
+
+
+# Средние размеры ресурсов, которые не скачиваем: точный размер отменённого
+# запроса неизвестен, поэтому экономия считается по оценке.
+ESTIMATED_SIZES = {
+    "image": 60_000,
+    "media": 1_000_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 60_000,
+    "document": 50_000,
+}
+DEFAULT_ESTIMATED_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """Какие запросы страницы пропускать: нужные типы ресурсов с разрешённых хостов.
+
+    Основной документ страницы пропускается всегда, остальное отменяется.
+    """
+
+    allowed_types: frozenset[str]
+    allowed_hosts: tuple[str, ...]
+
+    def allows(self, request: Request) -> bool:
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            return True
+
+        if request.resource_type not in self.allowed_types:
+            return False
+
+        host = urlsplit(request.url).hostname or ""
+        return any(host == allowed or host.endswith(f".{allowed}") for allowed in self.allowed_hosts)
+
+
+@dataclass
+class BlockedResources:
+    """Заблокированные за одну загрузку страницы запросы."""
+
+    counts: Counter[str] = field(default_factory=Counter)
+
+    def add(self, resource_type: str) -> None:
+        self.counts[resource_type] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def estimated_bytes(self) -> int:
+        return sum(
+            ESTIMATED_SIZES.get(resource_type, DEFAULT_ESTIMATED_SIZE) * count
+            for resource_type, count in self.counts.items()
+        )
@@ -1,15 +1,22 @@
-import json
 import logging
 import asyncio
 from pathlib import Path
 
-from playwright.async_api import BrowserContext, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from telethon import TelegramClient, events
 
 from core.scrapper.browser import PlaywrightManager
+from core.scrapper.proxies import Egress
+from core.scrapper.http_fetcher import FetchEngineStats, HttpFetcher
 from core.scrapper.parser import parse_channel_posts
+from core.scrapper.lxml_parser import parse_channel_posts_lxml
+from core.scrapper.simhash import simhash
+from core.scrapper.media_stager import MediaStager
+from core.scrapper.ratelimit import AdaptiveTokenBucket, RateLimiter
+from core.api.cache import ResponseCache
 from core.database.uow import UnitOfWork
 from core.exceptions import (
+    BrowserFallbackRequired,
     ChannelNotFound,
     ScrappingError,
     RobotSuspicion,
@@ -20,15 +27,40 @@ from core.exceptions import (
 logger = logging.getLogger(__name__)
 
 
-COOKIES_PATH = Path("cookies.json")
 TG_SESSION_PATH = Path("tg_acc.session")
 TG_API_ID = 37443963
 TG_API_HASH = "f5092f2f7523d78fb82fbe6ff126bb60"
 
+PARSERS = {
+    "bs4": parse_channel_posts,
+    "lxml": parse_channel_posts_lxml,
+}
+
+
+def channel_url(username: str) -> str:
+    return f"https://tgstat.ru/channel/@{username}"
+
 
 class ScrapperService:
-    def __init__(self, pw_manager: PlaywrightManager):
+    def __init__(
+        self,
+        pw_manager: PlaywrightManager,
+        http_fetcher: HttpFetcher | None = None,
+        rate_limiter: RateLimiter | None = None,
+        parser: str = "lxml",
+        response_cache: ResponseCache | None = None,
+        media_stager: MediaStager | None = None,
+    ):
         self._pw_manager = pw_manager
+        self._response_cache = response_cache
+        self._media_stager = media_stager
+        self._parse = PARSERS[parser]
+        self._http_fetcher = http_fetcher
+        self._rate_limiter = rate_limiter or RateLimiter()
+        self.fetch_stats = FetchEngineStats()
+        # сервис общий для всех слотов воркера, а вход через Telegram один
+        # на аккаунт — куки обновляются по одному выходу за раз
+        self._cookies_lock = asyncio.Lock()
         self._validate_telegram_session()
 
     def _validate_telegram_session(self):
@@ -38,17 +70,17 @@ class ScrapperService:
                 "Run `python scripts/create_tg_session.py` first."
             )
 
-    @property
-    def _context(self) -> BrowserContext:
-        return self._pw_manager.context
-
     async def update_data(self, uow: UnitOfWork, username: str) -> None:
         """Главный метод — загружает и сохраняет новые посты канала."""
         html = await self._fetch_channel_html(username)
 
-        posts = await asyncio.to_thread(parse_channel_posts, html, username)
+        last_post = await uow.channels.get_last_post(username)
+        last_id = last_post.id if last_post else 0
+
+        # парсер полностью разбирает только карточки новее last_id
+        posts = await asyncio.to_thread(self._parse, html, username, last_id)
         if not posts:
-            logger.info(f"[@{username}] Постов на странице не найдено")
+            logger.info(f"[@{username}] Новых постов нет (last_id: {last_id})")
             return
 
         await self._save_new_posts(uow, username, posts)
@@ -56,46 +88,126 @@ class ScrapperService:
     async def _fetch_channel_html(self, username: str) -> str:
         """Загружает HTML страницы канала, при необходимости обновляет куки."""
         for attempt in range(2):
-            cookies = await asyncio.to_thread(self._load_cookies)
-            if not cookies:
-                await self._regenerate_cookies()
-                cookies = await asyncio.to_thread(self._load_cookies)
-
-            try:
-                return await self._try_fetch(username, cookies)
-            except RobotSuspicion:
-                logger.info(f"429 при загрузке @{username}, ждём 60 сек...")
-                await asyncio.sleep(60)
-            except PlaywrightTimeoutError:
-                logger.info(f"Timeout при загрузке @{username}, ждём 60 сек...")
-                await asyncio.sleep(60)
+            # каждая попытка берёт наименее загруженный здоровый прокси
+            async with self._pw_manager.acquire() as egress:
+                await self._ensure_fresh_cookies(egress)
+                bucket = self._rate_limiter.bucket(egress.identity)
+
+                # паузу после 429 выдерживает сама корзина — для всех слотов сразу
+                await bucket.acquire()
+                html = await self._try_fetch_http(username, egress, bucket)
+                if html is not None:
+                    self._on_fetch_success(egress, bucket)
+                    return html
+
+                try:
+                    html = await self._try_fetch(username, egress)
+                    self._record_engine(username, "browser", html)
+                    self._on_fetch_success(egress, bucket)
+                    return html
+                except RobotSuspicion as e:
+                    logger.info(
+                        f"[@{username}] tgstat отказал через {egress.identity} "
+                        f"({e or '429'}), попытка {attempt + 1}"
+                    )
+                    self._on_fetch_throttled(egress, bucket)
+                except PlaywrightTimeoutError:
+                    logger.info(
+                        f"[@{username}] Timeout при загрузке через {egress.identity}, "
+                        f"попытка {attempt + 1}"
+                    )
+                    self._on_fetch_throttled(egress, bucket)
 
         raise ScrappingError(f"Не удалось загрузить канал @{username}")
 
-    async def _try_fetch(self, username: str, cookies: list[dict]) -> str:
-        """Одна попытка загрузки HTML."""
-        await self._context.add_cookies(cookies)
-        page = await self._context.new_page()
+    def _on_fetch_success(self, egress: Egress, bucket: AdaptiveTokenBucket) -> None:
+        egress.record_success()
+        bucket.on_success()
+
+    def _on_fetch_throttled(self, egress: Egress, bucket: AdaptiveTokenBucket) -> None:
+        bucket.on_throttle()
+        if egress.record_throttle():
+            logger.warning(f"Прокси {egress.identity} отправлен в карантин")
+
+    async def _ensure_fresh_cookies(self, egress: Egress) -> None:
+        """Обновляет куки выхода, если их нет или они скоро истекут."""
+        cookie_store = egress.cookie_store
+        await cookie_store.reload()
+        if not cookie_store.needs_refresh():
+            return
+
+        async with self._cookies_lock:
+            if not cookie_store.needs_refresh():
+                return
+
+            has_cookies = bool(cookie_store.get())
+            try:
+                await self._regenerate_cookies(egress)
+            except Exception as e:
+                if not has_cookies:
+                    raise
+                # старые куки ещё действуют — работаем с ними и повторим позже
+                logger.warning(f"Не удалось заранее обновить cookies для {egress.identity}: {e}")
+                cookie_store.refresh_failed()
+
+    async def _try_fetch_http(
+        self,
+        username: str,
+        egress: Egress,
+        bucket: AdaptiveTokenBucket,
+    ) -> str | None:
+        """Попытка загрузки без браузера. None — страницу нужно грузить через Playwright."""
+        if self._http_fetcher is None or not self._http_fetcher.available:
+            return None
 
         try:
-            url = f"https://tgstat.ru/channel/@{username}"
+            html = await self._http_fetcher.fetch(
+                channel_url(username), egress.cookie_store.get(), egress.proxy
+            )
+        except BrowserFallbackRequired as e:
+            logger.info(f"[@{username}] HTTP не подошёл ({e}), грузим через браузер")
+            if e.throttled:
+                self._on_fetch_throttled(egress, bucket)
+                await bucket.acquire()
+            return None
+
+        self._record_engine(username, "http", html)
+        return html
+
+    def _record_engine(self, username: str, engine: str, html: str) -> None:
+        self.fetch_stats.record(engine)
+        logger.info(
+            f"[@{username}] OK ({engine}), {len(html) // 1024} KB; "
+            f"доля http: {self.fetch_stats.hit_rate('http'):.0%} из {self.fetch_stats.total}"
+        )
+
+    async def _try_fetch(self, username: str, egress: Egress) -> str:
+        """Одна попытка загрузки HTML через браузер."""
+        await egress.cookie_store.apply(egress.context)
+        page = await egress.context.new_page()
+
+        try:
+            url = channel_url(username)
             response = await page.goto(url, wait_until="domcontentloaded", timeout=40_000)
 
             if response.status == 404:
                 raise ChannelNotFound()
 
-            if not response or response.status != 200:
-                logger.info(f"[@{username}] HTTP {response.status if response else 'None'}")
-                raise ScrappingError()
+            if response and response.status == 429:
+                raise RobotSuspicion("HTTP 429")
 
+            # challenge Cloudflare приходит и с 403/503, поэтому проверяем до статуса
             title = await page.title()
             if "just a moment" in title.lower() or "checking your browser" in title.lower():
-                logger.info(f"[@{username}] Cloudflare challenge")
-                raise ScrappingError()
+                raise RobotSuspicion("Cloudflare challenge")
 
             if "429" in title:
                 raise RobotSuspicion()
 
+            if not response or response.status != 200:
+                logger.info(f"[@{username}] HTTP {response.status if response else 'None'}")
+                raise ScrappingError()
+
             try:
                 await page.wait_for_selector(
                     "div.posts-list.lm-list-container",
@@ -104,56 +216,62 @@ class ScrapperService:
             except PlaywrightTimeoutError:
                 logger.info(f"[@{username}] Контейнер постов не появился за 15 сек")
 
-            html = await page.content()
-            logger.info(f"[@{username}] OK, {len(html) // 1024} KB")
-            return html
+            return await page.content()
 
         finally:
             await page.close()
-
-    async def _save_new_posts(self, uow: UnitOfWork, username: str, posts) -> None:
-        """Фильтрует и сохраняет только новые посты."""
-        last_post = await uow.channels.get_last_post(username)
-        last_id = last_post.id if last_post else 0
-
-        new_posts = [p for p in posts if p.id > last_id]
-        if not new_posts:
-            logger.info(f"[@{username}] Новых постов нет (всего на странице: {len(posts)}, last_id: {last_id})")
-            return
-
-        for post_dto in new_posts:
-            await uow.posts.add(
-                id=post_dto.id,
-                channel_username=post_dto.channel_username,
-                text=post_dto.text,
-                created_at=post_dto.created_at,
-            )
-            for media in post_dto.medias:
-                await uow.media.add(
-                    post_id=post_dto.id,
-                    post_channel_username=post_dto.channel_username,
-                    type=media.type,
-                    url=media.url,
+            blocked = self._pw_manager.pop_blocked(page)
+            if blocked.total:
+                logger.info(
+                    f"[@{username}] Заблокировано запросов: {blocked.total}, "
+                    f"сэкономлено ~{blocked.estimated_bytes // 1024} KB"
                 )
 
-        logger.info(f"[@{username}] Сохранено {len(new_posts)} новых постов")
-
-    def _load_cookies(self) -> list[dict]:
-        if not COOKIES_PATH.exists():
-            return []
-
-        with open(COOKIES_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _save_cookies(self, cookies: list[dict]) -> None:
-        with open(COOKIES_PATH, "w", encoding="utf-8") as f:
-            json.dump(cookies, f, indent=2, ensure_ascii=False)
-
-    async def _regenerate_cookies(self) -> None:
-        """Авторизация на tgstat.ru через Telegram бота."""
-        logger.info("Обновление cookies через Telegram...")
-
-        page = await self._context.new_page()
+    async def _save_new_posts(self, uow: UnitOfWork, username: str, new_posts) -> None:
+        """Сохраняет новые посты (уже отфильтрованные парсером по last_id)."""
+        inserted = await uow.posts.add_many([
+            {
+                "id": post_dto.id,
+                "channel_username": post_dto.channel_username,
+                "text": post_dto.text,
+                "created_at": post_dto.created_at,
+                "simhash": simhash(post_dto.text),
+            }
+            for post_dto in new_posts
+        ])
+
+        # медиа только у вставленных постов, чтобы при гонке не задвоить их
+        media_rows = [
+            {
+                "post_id": post_dto.id,
+                "post_channel_username": post_dto.channel_username,
+                "type": media.type,
+                "url": media.url,
+            }
+            for post_dto in new_posts
+            if (post_dto.id, post_dto.channel_username) in inserted
+            for media in post_dto.medias
+        ]
+        await uow.media.add_many(media_rows)
+
+        if media_rows and self._media_stager:
+            # загрузчик заберёт файлы сразу после commit, не дожидаясь своего интервала
+            uow.on_commit(self._media_stager.notify)
+
+        if inserted:
+            # last_post_id входит в ETag ответа /posts
+            await uow.channels.update(username, last_post_id=max(post_id for post_id, _ in inserted))
+            if self._response_cache:
+                uow.on_commit(lambda: self._response_cache.invalidate(username))
+
+        logger.info(f"[@{username}] Сохранено {len(inserted)} новых постов")
+
+    async def _regenerate_cookies(self, egress: Egress) -> None:
+        """Авторизация на tgstat.ru через Telegram бота с IP этого выхода."""
+        logger.info(f"Обновление cookies через Telegram для {egress.identity}...")
+
+        context = egress.context
+        page = await context.new_page()
         try:
             await page.goto("https://tgstat.ru", timeout=40_000, wait_until="domcontentloaded")
             await page.wait_for_selector("a:has-text('Вход на сайт')", timeout=30_000)
@@ -165,22 +283,24 @@ class ScrapperService:
             auth_code = await auth_btn.get_attribute("data-telegram-auth-button")
             logger.info(f"Код авторизации: {auth_code}")
 
+            pages_before = set(context.pages)
             await auth_btn.click()
             await asyncio.sleep(3)
 
-            # закрываем новую вкладку если открылась
-            if len(self._context.pages) > 1:
-                await self._context.pages[-1].close()
+            # закрываем новую вкладку если открылась (страницы других слотов не трогаем)
+            for new_page in set(context.pages) - pages_before:
+                await new_page.close()
 
             await self._authorize_via_telegram(auth_code)
             await asyncio.sleep(5)
 
-            cookies = await self._context.cookies()
-            await asyncio.to_thread(self._save_cookies, cookies)
+            cookies = await context.cookies()
+            await egress.cookie_store.save(cookies)  # type: ignore[arg-type]
             logger.info("Cookies успешно обновлены")
 
         finally:
             await page.close()
+            self._pw_manager.pop_blocked(page)
 
     async def _authorize_via_telegram(self, auth_code: str) -> None:
         """Отправляет код боту и нажимает кнопку авторизации."""
@@ -0,0 +1,45 @@
+import html
+import re
+from hashlib import blake2b
+
+
+TAG_REGEX = re.compile(r"<[^>]+>")
+URL_REGEX = re.compile(r"(?:https?://|www\.)\S+|@\w+|#\w+", re.IGNORECASE)
+WORD_REGEX = re.compile(r"[^\W_]{2,}")
+
+# короче этого подпись слишком случайна: «Видео», «Смотрите» совпадут у всех
+MIN_TOKENS = 5
+
+_BITS = 64
+
+
+def normalize_text(text: str) -> list[str]:
+    """Слова поста без разметки, ссылок, упоминаний, пунктуации и регистра."""
+    text = html.unescape(TAG_REGEX.sub(" ", text))
+    text = URL_REGEX.sub(" ", text).lower().replace("ё", "е")
+    return WORD_REGEX.findall(text)
+
+
+def simhash(text: str | None) -> int | None:
+    """64-битный SimHash по биграммам слов; знаковый, чтобы лечь в BIGINT.
+
+    Похожие тексты дают подписи с малым расстоянием Хэмминга. Для слишком
+    коротких текстов возвращает None — такие посты не сравниваются.
+    """
+    if not text:
+        return None
+
+    tokens = normalize_text(text)
+    if len(tokens) < MIN_TOKENS:
+        return None
+
+    weights = [0] * _BITS
+    for feature in zip(tokens, tokens[1:]):
+        digest = int.from_bytes(
+            blake2b(" ".join(feature).encode(), digest_size=8).digest(), "big"
+        )
+        for bit in range(_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+
+    value = sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+    return value - (1 << _BITS) if value >= 1 << (_BITS - 1) else value
@@ -6,8 +6,10 @@ import datetime as dt
 
 from dishka import AsyncContainer
 
+from core.config.settings import Settings
 from core.database.uow import UnitOfWork
 from core.exceptions import ChannelNotFound, ScrappingError
+from .cadence import PollingCadence
 from .service import ScrapperService
 
 
@@ -15,52 +17,109 @@ logger = logging.getLogger(__name__)
 
 
 class ScrapperWorker:
-    SCRAPPER_DELAY = 45.0  # in seconds
-    SCRAPPER_IDLE_DELAY = 60.0  # in seconds
-
-    def __init__(self, container: AsyncContainer):
+    def __init__(self, container: AsyncContainer, settings: Settings):
         self.container = container
+        self._concurrency = max(1, settings.SCRAPPER_CONCURRENCY)
+        self._delay = settings.SCRAPPER_DELAY
+        self._idle_delay = settings.SCRAPPER_IDLE_DELAY
+        self._lease = dt.timedelta(seconds=settings.SCRAPPER_CHECK_LEASE)
+        self._cadence = PollingCadence(settings)
 
     async def run(self):
-        logger.info(f"Воркер запущен (интервал {self.SCRAPPER_DELAY} сек)")
+        logger.info(
+            f"Воркер запущен (слотов: {self._concurrency}, "
+            f"интервал слота {self._delay} сек)"
+        )
+        slots = [
+            asyncio.create_task(self._run_slot(slot))
+            for slot in range(1, self._concurrency + 1)
+        ]
+        try:
+            await asyncio.gather(*slots)
+        finally:
+            for task in slots:
+                task.cancel()
+            await asyncio.gather(*slots, return_exceptions=True)
+
+    async def _run_slot(self, slot: int):
+        # разносим старт слотов, чтобы они не ходили на tgstat одновременно
+        await asyncio.sleep(self._delay * (slot - 1) / self._concurrency)
+
         while True:
             try:
                 async with self.container() as scope:
-                    await self._process_one(scope)
+                    await self._process_one(scope, slot)
             except Exception as e:
-                logger.error(f"[WORKER] Критическая ошибка в цикле: {e}", exc_info=True)
-            await asyncio.sleep(self.SCRAPPER_DELAY)
+                logger.error(f"[WORKER {slot}] Критическая ошибка в цикле: {e}", exc_info=True)
+            await asyncio.sleep(self._delay)
 
-    async def _process_one(self, scope: AsyncContainer):
+    async def _process_one(self, scope: AsyncContainer, slot: int = 1):
         uow = await scope.get(UnitOfWork)
 
-        channel = await uow.channels.get_next_channel_to_check()
+        # захват — короткая транзакция: next_check_at сдвигается на время аренды,
+        # и другие слоты не возьмут канал, хотя строка уже не заблокирована.
+        # Сама проверка идёт без блокировки и без открытой транзакции
+        now = dt.datetime.utcnow()
+        channel = await uow.channels.get_next_channel_to_check(now)
 
         if channel is None:
-            logger.info(f"Каналов для проверки нет. Ждём {self.SCRAPPER_IDLE_DELAY} сек.")
-            await asyncio.sleep(self.SCRAPPER_IDLE_DELAY)
+            logger.info(f"[WORKER {slot}] Каналов для проверки нет. Ждём {self._idle_delay} сек.")
+            await uow.rollback()
+            await asyncio.sleep(self._idle_delay)
             return
 
+        # после rollback атрибуты модели просрочены — нужное берём заранее
+        username, posts_per_day = channel.username, channel.posts_per_day
+        await uow.channels.update(username, next_check_at=now + self._lease)
+        await uow.commit()
+
         last_check = channel.last_update_check
         last_check_str = last_check.strftime("%Y-%m-%d %H:%M:%S") if last_check else "никогда"
-        logger.info(f"[CHECK] Начинаем проверку @{channel.username} (последняя: {last_check_str})")
+        logger.info(
+            f"[CHECK {slot}] Начинаем проверку @{username} (последняя: {last_check_str})"
+        )
 
         service = await scope.get(ScrapperService)
 
         started = time.monotonic()
+        next_check_at = None
         try:
-            await service.update_data(uow, channel.username)
+            await service.update_data(uow, username)
             elapsed = time.monotonic() - started
-            logger.info(f"[CHECK] @{channel.username} — проверка завершена за {elapsed:.1f} сек")
+            logger.info(f"[CHECK {slot}] @{username} — проверка завершена за {elapsed:.1f} сек")
         except ChannelNotFound:
             elapsed = time.monotonic() - started
-            logger.warning(f"[CHECK] @{channel.username} — канал не найден ({elapsed:.1f} сек)")
+            logger.warning(f"[CHECK {slot}] @{username} — канал не найден ({elapsed:.1f} сек)")
+            next_check_at = self._cadence.give_up_at(dt.datetime.utcnow())
         except ScrappingError as e:
             elapsed = time.monotonic() - started
-            logger.error(f"[CHECK] @{channel.username} — ошибка скраппинга ({elapsed:.1f} сек): {e}")
+            logger.error(f"[CHECK {slot}] @{username} — ошибка скраппинга ({elapsed:.1f} сек): {e}")
+            next_check_at = self._cadence.retry_at(dt.datetime.utcnow())
         except Exception as e:
             elapsed = time.monotonic() - started
-            logger.error(f"[CHECK] @{channel.username} — неожиданная ошибка ({elapsed:.1f} сек): {e}")
+            logger.error(f"[CHECK {slot}] @{username} — неожиданная ошибка ({elapsed:.1f} сек): {e}")
+            next_check_at = self._cadence.retry_at(dt.datetime.utcnow())
         finally:
-            await uow.channels.update(channel.username, last_update_check=dt.datetime.utcnow())
+            if next_check_at is not None:
+                # проверка не удалась — частично сохранённое не фиксируем
+                await uow.rollback()
+
+            # итог проверки — вторая короткая транзакция вместе с новыми постами
+            now = dt.datetime.utcnow()
+            if next_check_at is None:
+                posts_per_day = self._cadence.posts_per_day(
+                    await uow.channels.count_posts_since(username, now - self._cadence.window)
+                )
+                next_check_at = self._cadence.next_check_at(now, posts_per_day)
+                logger.info(
+                    f"[CHECK {slot}] @{username} — {posts_per_day:.1f} постов/сутки, "
+                    f"следующая проверка в {next_check_at:%Y-%m-%d %H:%M:%S}"
+                )
+
+            await uow.channels.update(
+                username,
+                last_update_check=now,
+                next_check_at=next_check_at,
+                posts_per_day=posts_per_day,
+            )
             await uow.commit()
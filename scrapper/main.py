@@ -9,9 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from core.api.run import run_api
 from core.runner import AppRunner
 from core.config.settings import Settings
-from core.database.models.base import Base
-import core.database.models  # noqa: F401 — регистрация моделей в Base.metadata
+from core.database.migrations import run_migrations
 from core.scrapper.worker import ScrapperWorker
+from core.scrapper.media_stager import MediaStager
 from core.event_consumer import EventConsumer
 
 from main_factory import get_all_dishka_providers
@@ -26,25 +26,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def init_database(engine: AsyncEngine) -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Таблицы базы данных созданы")
-
-
 async def main():
     runner = AppRunner()
 
     dishka = make_async_container(*get_all_dishka_providers())
     settings = await dishka.get(Settings)
 
-    # Создаём таблицы при старте
+    # Применяем миграции схемы при старте
     engine = await dishka.get(AsyncEngine)
-    await init_database(engine)
+    await run_migrations(engine)
 
     logger.info(
         f"Конфиг: loop={settings.ENABLE_SCRAPPER_LOOP}, "
-        f"api={settings.ENABLE_API}, consumer={settings.ENABLE_EVENT_CONSUMER}"
+        f"api={settings.ENABLE_API}, consumer={settings.ENABLE_EVENT_CONSUMER}, "
+        f"media_stager={settings.ENABLE_MEDIA_STAGER}"
     )
 
     corutines: List[Coroutine] = []
@@ -56,6 +51,10 @@ async def main():
     if settings.ENABLE_API:
         corutines.append(run_api(dishka))
 
+    if settings.ENABLE_MEDIA_STAGER:
+        stager = await dishka.get(MediaStager)
+        corutines.append(stager.run())
+
     if settings.ENABLE_EVENT_CONSUMER:
         consumer = await dishka.get(EventConsumer)
         corutines.append(consumer.run())
@@ -24,7 +24,14 @@ from core.scrapper.worker import ScrapperWorker
 from core.scrapper.service import ScrapperService
 from core.database.uow import UnitOfWork
 from core.scrapper.browser import PlaywrightManager
+from core.scrapper.http_fetcher import HttpFetcher
+from core.scrapper.ratelimit import RateLimiter
+from core.scrapper.proxies import proxies_from_settings
+from core.scrapper.resources import ResourcePolicy
 from core.event_consumer import EventConsumer
+from core.api.cache import ResponseCache
+from core.scrapper.media_store import MediaStore
+from core.scrapper.media_stager import MediaStager
 
 
 class ConfigProvider(Provider):
@@ -79,33 +86,105 @@ class WorkerProvider(Provider):
     scope = Scope.APP
 
     @provide
-    def get_scrapper_worker(self, container: AsyncContainer) -> ScrapperWorker:
-        return ScrapperWorker(container)
+    def get_scrapper_worker(self, container: AsyncContainer, settings: Settings) -> ScrapperWorker:
+        return ScrapperWorker(container, settings)
 
 
 class ScrapperServiceProvider(Provider):
-    scope = Scope.REQUEST
+    scope = Scope.APP
 
     @provide
-    def get_scrapper_service(self, pw_manager: PlaywrightManager) -> ScrapperService:
-        return ScrapperService(pw_manager)
+    def get_scrapper_service(
+        self,
+        pw_manager: PlaywrightManager,
+        http_fetcher: HttpFetcher,
+        rate_limiter: RateLimiter,
+        response_cache: ResponseCache,
+        media_stager: MediaStager,
+        settings: Settings,
+    ) -> ScrapperService:
+        return ScrapperService(
+            pw_manager,
+            http_fetcher if settings.SCRAPPER_HTTP_FETCH else None,
+            rate_limiter,
+            settings.SCRAPPER_PARSER,
+            response_cache,
+            media_stager if settings.ENABLE_MEDIA_STAGER else None,
+        )
+
+    @provide
+    def get_rate_limiter(self, settings: Settings) -> RateLimiter:
+        return RateLimiter.from_settings(settings)
 
 
 class PlaywrightProvider(Provider):
     scope = Scope.APP
 
     @provide
-    async def get_playwright_manager(self) -> AsyncIterable[PlaywrightManager]:
-        async with PlaywrightManager() as pm:
+    async def get_playwright_manager(self, settings: Settings) -> AsyncIterable[PlaywrightManager]:
+        resource_policy = ResourcePolicy(
+            allowed_types=frozenset(settings.SCRAPPER_ALLOWED_RESOURCE_TYPES),
+            allowed_hosts=tuple(settings.SCRAPPER_ALLOWED_HOSTS),
+        ) if settings.SCRAPPER_BLOCK_RESOURCES else None
+
+        async with PlaywrightManager(
+            proxies_from_settings(settings),
+            resource_policy,
+            settings.SCRAPPER_PROXY_QUARANTINE,
+        ) as pm:
             yield pm
 
 
+class HttpFetcherProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    async def get_http_fetcher(self, settings: Settings) -> AsyncIterable[HttpFetcher]:
+        async with HttpFetcher(settings) as fetcher:
+            yield fetcher
+
+
 class EventConsumerProvider(Provider):
     scope = Scope.APP
 
     @provide
-    def get_event_consumer(self, settings: Settings, container: AsyncContainer) -> EventConsumer:
-        return EventConsumer(settings, container)
+    def get_event_consumer(
+        self,
+        settings: Settings,
+        container: AsyncContainer,
+        response_cache: ResponseCache,
+    ) -> EventConsumer:
+        return EventConsumer(settings, container, response_cache)
+
+
+class ApiProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_response_cache(self, settings: Settings) -> ResponseCache:
+        return ResponseCache.from_settings(settings)
+
+
+class MediaStagerProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_media_store(self, settings: Settings) -> MediaStore:
+        return MediaStore(
+            settings.MEDIA_STORE_PATH,
+            settings.MEDIA_STORE_MAX_BYTES,
+            settings.MEDIA_STORE_MAX_AGE,
+        )
+
+    @provide
+    def get_media_stager(
+        self,
+        container: AsyncContainer,
+        store: MediaStore,
+        response_cache: ResponseCache,
+        settings: Settings,
+    ) -> MediaStager:
+        return MediaStager(container, store, settings, response_cache)
 
 
 def get_all_dishka_providers() -> List[Provider]:
@@ -117,7 +196,10 @@ def get_all_dishka_providers() -> List[Provider]:
         WorkerProvider(),
         ScrapperServiceProvider(),
         PlaywrightProvider(),
+        HttpFetcherProvider(),
         EventConsumerProvider(),
+        ApiProvider(),
+        MediaStagerProvider(),
     ]
 
 
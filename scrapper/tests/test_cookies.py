@@ -0,0 +1,115 @@
+# tests/test_cookies.py
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from core.scrapper.cookies import CookieStore, cookies_path_for
+
+
+def tgstat_cookie(name: str, expires: float) -> dict:
+    return {"name": name, "value": "1", "domain": ".tgstat.ru", "path": "/", "expires": expires}
+
+
+def write_cookies(path: Path, cookies: list[dict], mtime: float | None = None) -> None:
+    path.write_text(json.dumps(cookies), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+class FakeContext:
+    def __init__(self):
+        self.added: list[list[dict]] = []
+
+    async def add_cookies(self, cookies: list[dict]) -> None:
+        self.added.append(cookies)
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch) -> CookieStore:
+    monkeypatch.setattr(CookieStore, "CHECK_INTERVAL", 0.0)
+    return CookieStore(tmp_path / "cookies.json")
+
+
+def test_cookies_path_per_proxy():
+    base = Path("data/cookies.json")
+
+    assert cookies_path_for(base, "direct") == base
+    assert cookies_path_for(base, "http://10.0.0.1:8080") == Path("data/cookies.http_10.0.0.1_8080.json")
+
+
+async def test_get_and_checks_work_from_memory(store: CookieStore, tmp_path: Path):
+    """После reload файл не нужен: get() и проверки срока не обращаются к диску."""
+    path = tmp_path / "cookies.json"
+    write_cookies(path, [tgstat_cookie("auth", time.time() + 86400)])
+
+    await store.reload()
+    path.unlink()
+
+    assert [c["name"] for c in store.get()] == ["auth"]
+    assert not store.needs_refresh()
+
+
+async def test_reload_only_on_mtime_change(store: CookieStore, tmp_path: Path):
+    path = tmp_path / "cookies.json"
+    write_cookies(path, [tgstat_cookie("a", -1)], mtime=1000)
+    await store.reload()
+
+    # содержимое поменялось, mtime — нет: файл не перечитывается
+    write_cookies(path, [tgstat_cookie("b", -1)], mtime=1000)
+    await store.reload()
+    assert store.get()[0]["name"] == "a"
+
+    os.utime(path, (2000, 2000))
+    await store.reload()
+    assert store.get()[0]["name"] == "b"
+
+
+async def test_reload_rate_limited(tmp_path: Path):
+    path = tmp_path / "cookies.json"
+    store = CookieStore(path)
+    write_cookies(path, [tgstat_cookie("a", -1)], mtime=1000)
+    await store.reload()
+
+    write_cookies(path, [tgstat_cookie("b", -1)], mtime=2000)
+    await store.reload()
+
+    assert store.get()[0]["name"] == "a"
+
+
+async def test_save_writes_file_and_wins_over_pending_reload(store: CookieStore, tmp_path: Path):
+    path = tmp_path / "cookies.json"
+    write_cookies(path, [tgstat_cookie("old", -1)], mtime=1000)
+
+    await asyncio.gather(store.reload(), store.save([tgstat_cookie("new", -1)]))
+
+    assert [c["name"] for c in store.get()] == ["new"]
+    assert json.loads(path.read_text(encoding="utf-8"))[0]["name"] == "new"
+
+
+async def test_needs_refresh_before_expiry(store: CookieStore):
+    assert store.needs_refresh()
+
+    await store.save([tgstat_cookie("auth", time.time() + 600)])
+    assert store.needs_refresh()
+
+    store.refresh_failed()
+    assert not store.needs_refresh()
+
+    await store.save([tgstat_cookie("auth", time.time() + 86400)])
+    assert not store.needs_refresh()
+
+
+async def test_apply_only_when_changed(store: CookieStore):
+    context = FakeContext()
+    await store.save([tgstat_cookie("a", -1)])
+
+    await store.apply(context)
+    await store.apply(context)
+    await store.save([tgstat_cookie("b", -1)])
+    await store.apply(context)
+
+    assert [cookies[0]["name"] for cookies in context.added] == ["a", "b"]
@@ -0,0 +1,68 @@
+# tests/test_media_stager.py
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.enums import MediaTypeEnum
+from core.scrapper.media_stager import MediaStager
+
+
+SETTINGS = SimpleNamespace(
+    MEDIA_STAGE_CONCURRENCY=2,
+    MEDIA_STAGE_BATCH_SIZE=10,
+    MEDIA_STAGE_INTERVAL=1,
+    MEDIA_STAGE_ATTEMPTS=3,
+    MEDIA_MAX_IMAGE_SIZE=1_000_000,
+    MEDIA_MAX_VIDEO_SIZE=1_000_000,
+)
+
+
+class BrokenStore:
+    """Хранилище, на которое не удаётся записать файл."""
+
+    async def save(self, chunks, max_size):
+        async for _ in chunks:
+            raise OSError("No space left on device")
+
+
+async def image(request: web.Request) -> web.Response:
+    return web.Response(body=b"x" * 1000, content_type="image/jpeg")
+
+
+@pytest.fixture
+async def server():
+    app = web.Application()
+    app.router.add_get("/a.jpg", image)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.mark.parametrize(("attempts", "status"), [(0, None), (2, "unavailable")])
+async def test_unexpected_error_counts_attempt(server, attempts, status):
+    """Любая ошибка одного файла — засчитанная попытка, а не упавшая пачка."""
+    stager = MediaStager(None, BrokenStore(), SETTINGS)
+    media = SimpleNamespace(
+        id=1, url=str(server.make_url("/a.jpg")), type=MediaTypeEnum.IMAGE, attempts=attempts
+    )
+
+    async with aiohttp.ClientSession() as session:
+        row = await stager._stage_one(session, media)
+
+    assert row["attempts"] == attempts + 1
+    assert row["status"] == status
+    assert row["content_hash"] is None
+
+
+async def test_unknown_media_type_counts_attempt(server):
+    stager = MediaStager(None, BrokenStore(), SETTINGS)
+    media = SimpleNamespace(id=1, url=str(server.make_url("/a.jpg")), type="audio", attempts=2)
+
+    async with aiohttp.ClientSession() as session:
+        row = await stager._stage_one(session, media)
+
+    assert row["status"] == "unavailable"
@@ -0,0 +1,100 @@
+# tests/test_media_store.py
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from core.exceptions import MediaTooLarge
+from core.scrapper.media_store import MediaStore
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def set_age(path: Path, seconds: float) -> None:
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def tmp_files(root: Path) -> list[Path]:
+    tmp_dir = root / MediaStore.TMP_DIR
+    return list(tmp_dir.iterdir()) if tmp_dir.exists() else []
+
+
+async def test_save_stores_file_by_content_hash(tmp_path: Path):
+    store = MediaStore(tmp_path, max_bytes=10**6, max_age=3600)
+
+    content_hash, size = await store.save(chunks(b"abc", b"def"), max_size=100)
+
+    assert content_hash == hashlib.sha256(b"abcdef").hexdigest()
+    assert size == 6
+    assert store.path_for(content_hash).read_bytes() == b"abcdef"
+    assert tmp_files(tmp_path) == []
+
+
+async def test_save_too_large_aborts_and_cleans_up(tmp_path: Path):
+    store = MediaStore(tmp_path, max_bytes=10**6, max_age=3600)
+
+    with pytest.raises(MediaTooLarge) as error:
+        await store.save(chunks(b"x" * 60, b"x" * 60), max_size=100)
+
+    assert error.value.size == 120
+    assert tmp_files(tmp_path) == []
+    assert [p for p in tmp_path.iterdir() if p.name != MediaStore.TMP_DIR] == []
+
+
+async def test_save_same_content_once(tmp_path: Path):
+    """Повторное сохранение того же файла не копирует его, а отмечает использование."""
+    store = MediaStore(tmp_path, max_bytes=10**6, max_age=3600)
+    first, _ = await store.save(chunks(b"same"), max_size=100)
+    set_age(store.path_for(first), 1000)
+
+    second, _ = await store.save(chunks(b"sa", b"me"), max_size=100)
+
+    assert first == second
+    assert list(store.path_for(first).parent.iterdir()) == [store.path_for(first)]
+    assert time.time() - store.path_for(first).stat().st_mtime < 60
+    assert tmp_files(tmp_path) == []
+
+
+async def test_evict_removes_expired_files(tmp_path: Path):
+    store = MediaStore(tmp_path, max_bytes=10**6, max_age=3600)
+    old, _ = await store.save(chunks(b"old"), max_size=100)
+    fresh, _ = await store.save(chunks(b"fresh"), max_size=100)
+    set_age(store.path_for(old), 7200)
+
+    assert await store.evict() == (1, 3)
+    assert not store.path_for(old).exists()
+    assert store.path_for(fresh).exists()
+
+
+async def test_evict_least_recently_used_over_limit(tmp_path: Path):
+    store = MediaStore(tmp_path, max_bytes=250, max_age=3600)
+    hashes = []
+    for age, fill in ((300, b"a"), (200, b"b"), (100, b"c")):
+        content_hash, _ = await store.save(chunks(fill * 100), max_size=1000)
+        set_age(store.path_for(content_hash), age)
+        hashes.append(content_hash)
+
+    # самый старый файл ещё нужен боту — вытесняется следующий по давности
+    assert await store.touch([hashes[0], "0" * 64]) == 1
+    assert await store.evict() == (1, 100)
+    assert [store.path_for(h).exists() for h in hashes] == [True, False, True]
+
+
+async def test_evict_cleans_stale_tmp_files(tmp_path: Path):
+    store = MediaStore(tmp_path, max_bytes=10**6, max_age=7 * 86400)
+    tmp_dir = tmp_path / MediaStore.TMP_DIR
+    tmp_dir.mkdir()
+    stale, active = tmp_dir / "stale", tmp_dir / "active"
+    stale.write_bytes(b"x" * 10)
+    active.write_bytes(b"y" * 10)
+    set_age(stale, 2 * 3600)
+
+    assert await store.evict() == (1, 10)
+    assert not stale.exists()
+    assert active.exists()
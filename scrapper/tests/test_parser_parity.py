@@ -0,0 +1,47 @@
+# tests/test_parser_parity.py
+import pytest
+from pathlib import Path
+
+from core.scrapper.parser import parse_channel_posts
+from core.scrapper.lxml_parser import parse_channel_posts_lxml
+
+
+PAGES_DIR = Path(__file__).parent / "pages"
+PAGES = sorted(PAGES_DIR.glob("*.html"))
+
+
+@pytest.mark.parametrize("page", PAGES, ids=[p.stem for p in PAGES])
+def test_lxml_parser_matches_bs4(page: Path):
+    """Оба движка разбора дают одинаковый список постов на сохранённой странице."""
+    html = page.read_text(encoding="utf-8")
+
+    expected = parse_channel_posts(html, page.stem)
+    actual = parse_channel_posts_lxml(html, page.stem)
+
+    assert expected, "на странице должны быть посты"
+    assert [p.model_dump() for p in actual] == [p.model_dump() for p in expected]
+
+
+def test_lxml_parser_without_posts_list():
+    """Страница без списка постов — то же исключение, что и у bs4."""
+    html = "<html><body><div class='posts'></div></body></html>"
+
+    with pytest.raises(Exception) as bs4_error:
+        parse_channel_posts(html, "test")
+    with pytest.raises(Exception) as lxml_error:
+        parse_channel_posts_lxml(html, "test")
+
+    assert type(lxml_error.value) is type(bs4_error.value)
+
+
+@pytest.mark.parametrize("page", PAGES, ids=[p.stem for p in PAGES])
+def test_stop_at_id_skips_known_posts(page: Path):
+    """С водяным знаком оба движка отдают только посты новее него."""
+    html = page.read_text(encoding="utf-8")
+    all_posts = parse_channel_posts(html, page.stem)
+    stop_at_id = all_posts[len(all_posts) // 2].id
+    expected = [p.model_dump() for p in all_posts if p.id > stop_at_id]
+
+    for parse in (parse_channel_posts, parse_channel_posts_lxml):
+        posts = parse(html, page.stem, stop_at_id=stop_at_id)
+        assert [p.model_dump() for p in posts] == expected
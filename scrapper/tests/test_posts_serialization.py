@@ -0,0 +1,117 @@
+# tests/test_posts_serialization.py
+import datetime as dt
+from types import SimpleNamespace
+
+import orjson
+
+from core.api.cache import ResponseCache
+from core.api.endpoints import _dump_posts, get_posts
+from core.database.models import Media, Post
+from core.enums import MediaTypeEnum
+from core.schemas.post import ChannelPostsSchema, PostSchema
+
+
+def make_post(post_id: int = 1, medias: int = 2) -> Post:
+    """Пост из ORM-моделей в том виде, в каком его отдаёт репозиторий."""
+    post = Post(
+        id=post_id,
+        channel_username="donor",
+        mark=None,
+        text="Текст поста",
+        created_at=dt.datetime(2026, 1, 1, 12, 30),
+        simhash=-42,
+    )
+    post.medias = [
+        Media(
+            post_id=post_id,
+            post_channel_username="donor",
+            type=MediaTypeEnum.VIDEO if i % 2 else MediaTypeEnum.IMAGE,
+            url=f"https://cdn.example/{post_id}/{i}.jpg",
+            status="ready",
+            content_hash="ab" * 32,
+            size=1024,
+            mime_type="image/jpeg",
+        )
+        for i in range(medias)
+    ]
+    return post
+
+
+def test_post_with_media_validates_from_orm():
+    """Вложенные медиа читаются из атрибутов ORM, тип — строкой."""
+    schema = PostSchema.model_validate(make_post())
+
+    assert [m.type for m in schema.medias] == ["image", "video"]
+    assert schema.medias[0].url == "https://cdn.example/1/0.jpg"
+
+
+def test_batch_response_with_media_posts():
+    """Ответ /posts/batch собирается из постов с медиа без ValidationError."""
+    posts = [make_post(1), make_post(2, medias=0)]
+    response = ChannelPostsSchema(
+        etag="e",
+        posts=[PostSchema.model_validate(post) for post in posts],
+    )
+
+    assert [len(p.medias) for p in response.posts] == [2, 0]
+
+
+def test_dump_posts_matches_post_schema():
+    """orjson-сериализация постов совпадает с JSON PostSchema, включая медиа."""
+    posts = [make_post(1), make_post(2, medias=0), make_post(3, medias=1)]
+    expected = [
+        orjson.loads(PostSchema.model_validate(post).model_dump_json())
+        for post in posts
+    ]
+
+    assert orjson.loads(_dump_posts(posts)) == expected
+
+
+class FakePosts:
+    def __init__(self, posts: list[Post]):
+        self.posts = posts
+        self.calls = 0
+
+    async def get_many_with_params(self, **kwargs) -> list[Post]:
+        self.calls += 1
+        return self.posts
+
+
+class FakeChannels:
+    async def get_version(self, channel: str) -> tuple[int, int]:
+        return 1, 1
+
+
+async def request_posts(uow, cache: ResponseCache, if_none_match: str | None = None):
+    return await get_posts(
+        uow=uow,
+        cache=cache,
+        channel="donor",
+        limit=100,
+        order="desc",
+        marked=None,
+        days_ago=None,
+        cursor=None,
+        if_none_match=if_none_match,
+    )
+
+
+async def test_get_posts_with_media_and_cache():
+    """GET /posts отдаёт посты с медиа, повторный запрос — из кеша, тем же телом."""
+    repo = FakePosts([make_post(1), make_post(2, medias=1)])
+    uow = SimpleNamespace(posts=repo, channels=FakeChannels())
+    cache = ResponseCache()
+
+    first = await request_posts(uow, cache)
+    second = await request_posts(uow, cache)
+
+    assert first.status_code == second.status_code == 200
+    assert first.body == second.body
+    assert repo.calls == 1
+
+    posts = [PostSchema.model_validate(item) for item in orjson.loads(first.body)]
+    assert [len(post.medias) for post in posts] == [2, 1]
+    assert posts[0].medias[1].type == "video"
+
+    not_modified = await request_posts(uow, cache, if_none_match=first.headers["ETag"])
+    assert not_modified.status_code == 304
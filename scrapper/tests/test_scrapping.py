@@ -48,7 +48,8 @@ async def test_scrapper_parses_channels():
         print("\n" + "="*40)
         print("ГЕНЕРАЦИЯ COOKIES")
         print("="*40)
-        await service._regenerate_cookies()
+        for egress in pw_manager.egresses:
+            await service._regenerate_cookies(egress)
         print("Cookies успешно сгенерированы\n")
         
         for channel in CHANNELS:
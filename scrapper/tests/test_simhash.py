@@ -0,0 +1,64 @@
+# tests/test_simhash.py
+import pytest
+
+from core.scrapper.simhash import MIN_TOKENS, normalize_text, simhash
+
+
+TEXT = (
+    "В субботу в центре города открылась новая выставка современного искусства. "
+    "Посетители могут увидеть работы молодых художников из двенадцати регионов "
+    "страны, среди которых живопись, графика, скульптура и видеоинсталляции. "
+    "Организаторы рассказали, что отбор длился почти полгода, а в финальную "
+    "экспозицию вошли более ста работ. Вход на выставку свободный, она продлится "
+    "до конца месяца, по выходным проводятся бесплатные экскурсии с кураторами."
+)
+
+
+def distance(a: int, b: int) -> int:
+    return ((a ^ b) & (1 << 64) - 1).bit_count()
+
+
+def test_normalize_drops_markup_links_and_case():
+    text = '<b>Ёжик</b> в <a href="x">тумане</a> https://t.me/x @channel #тег, 2024!'
+
+    assert normalize_text(text) == ["ежик", "тумане", "2024"]
+
+
+@pytest.mark.parametrize("text", [None, "", "Смотрите видео", "раз два три четыре"])
+def test_short_texts_have_no_signature(text):
+    assert simhash(text) is None
+
+
+def test_min_tokens_boundary():
+    words = ["слово", "другое", "третье", "четвёртое", "пятое", "шестое"]
+
+    assert simhash(" ".join(words[:MIN_TOKENS - 1])) is None
+    assert simhash(" ".join(words[:MIN_TOKENS])) is not None
+
+
+def test_signature_fits_signed_bigint():
+    for i in range(200):
+        value = simhash(f"{TEXT} вариант номер {i}")
+        assert -(1 << 63) <= value < 1 << 63
+
+
+def test_same_text_after_normalization_same_signature():
+    variant = f"<p>{TEXT.upper()}</p>\n\n@donor https://t.me/donor #новости"
+
+    assert simhash(variant) == simhash(TEXT)
+
+
+@pytest.mark.parametrize(
+    ("old", "new"),
+    [("В субботу", "В воскресенье"), ("до конца месяца", "до конца следующего месяца")],
+)
+def test_near_duplicate_close_and_unrelated_far(old, new):
+    """Правка слова в посте обычной длины — в пределах порога DEDUP_MAX_DISTANCE."""
+    near = TEXT.replace(old, new)
+    unrelated = (
+        "Курс рубля к доллару снизился после заседания центрального банка, "
+        "аналитики ожидают дальнейших колебаний на валютном рынке"
+    )
+
+    assert distance(simhash(TEXT), simhash(near)) <= 6
+    assert distance(simhash(TEXT), simhash(unrelated)) > 12
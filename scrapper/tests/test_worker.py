@@ -0,0 +1,118 @@
+# tests/test_worker.py
+import datetime as dt
+from types import SimpleNamespace
+
+import pytest
+
+from core.database.uow import UnitOfWork
+from core.exceptions import ScrappingError
+from core.scrapper.service import ScrapperService
+from core.scrapper.worker import ScrapperWorker
+
+
+SETTINGS = SimpleNamespace(
+    SCRAPPER_CONCURRENCY=1,
+    SCRAPPER_DELAY=0,
+    SCRAPPER_IDLE_DELAY=0,
+    SCRAPPER_CHECK_LEASE=1800,
+    SCRAPPER_MIN_CHECK_INTERVAL=600,
+    SCRAPPER_MAX_CHECK_INTERVAL=21600,
+    SCRAPPER_RATE_WINDOW_DAYS=7,
+)
+
+
+class FakeChannels:
+    def __init__(self, log: list, channel):
+        self._log = log
+        self.channel = channel
+
+    async def get_next_channel_to_check(self, now: dt.datetime):
+        self._log.append("lock")
+        return self.channel
+
+    async def update(self, username: str, **kwargs) -> None:
+        self._log.append(("update", sorted(kwargs)))
+        for key, value in kwargs.items():
+            setattr(self.channel, key, value)
+
+    async def count_posts_since(self, username: str, since: dt.datetime) -> int:
+        self._log.append("count")
+        return 14
+
+
+class FakeUnitOfWork:
+    """Журнал обращений к базе; транзакция открыта от первого запроса до commit/rollback."""
+
+    def __init__(self, channel):
+        self.log: list = []
+        self.channels = FakeChannels(self.log, channel)
+
+    async def commit(self) -> None:
+        self.log.append("commit")
+
+    async def rollback(self) -> None:
+        self.log.append("rollback")
+
+
+class FakeService:
+    def __init__(self, uow: FakeUnitOfWork, error: Exception | None = None):
+        self._uow = uow
+        self._error = error
+
+    async def update_data(self, uow, username: str) -> None:
+        # во время загрузки страницы транзакция захвата уже должна быть закрыта
+        assert self._uow.log[-1] == "commit"
+        self._uow.log.append("scrape")
+        if self._error:
+            raise self._error
+
+
+class FakeScope:
+    def __init__(self, uow: FakeUnitOfWork, service: FakeService):
+        self._deps = {UnitOfWork: uow, ScrapperService: service}
+
+    async def get(self, dependency):
+        return self._deps[dependency]
+
+
+def make_channel():
+    return SimpleNamespace(
+        username="donor", last_update_check=None, next_check_at=None, posts_per_day=1.0
+    )
+
+
+async def test_claim_commits_before_scrape():
+    uow = FakeUnitOfWork(make_channel())
+    worker = ScrapperWorker(None, SETTINGS)
+
+    await worker._process_one(FakeScope(uow, FakeService(uow)))
+
+    assert uow.log == [
+        "lock",
+        ("update", ["next_check_at"]),
+        "commit",
+        "scrape",
+        "count",
+        ("update", ["last_update_check", "next_check_at", "posts_per_day"]),
+        "commit",
+    ]
+    assert uow.channels.channel.posts_per_day == 2.0
+
+
+@pytest.mark.parametrize("error", [ScrappingError("boom"), RuntimeError("boom")])
+async def test_failed_scrape_rolls_back_and_schedules_retry(error):
+    uow = FakeUnitOfWork(make_channel())
+    worker = ScrapperWorker(None, SETTINGS)
+
+    before = dt.datetime.utcnow()
+    await worker._process_one(FakeScope(uow, FakeService(uow, error)))
+
+    assert uow.log[3:] == [
+        "scrape",
+        "rollback",
+        ("update", ["last_update_check", "next_check_at", "posts_per_day"]),
+        "commit",
+    ]
+    channel = uow.channels.channel
+    assert channel.posts_per_day == 1.0
+    assert dt.timedelta(seconds=590) < channel.next_check_at - before < dt.timedelta(seconds=610)